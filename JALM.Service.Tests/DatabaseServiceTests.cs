@@ -40,6 +40,20 @@ public class DatabaseServiceTests : IDisposable
         Assert.True(File.Exists(Path.Combine(_tempDir, "jalm_apps.db")));
     }
 
+    [Fact]
+    public void GetSchemaVersion_ReadsUserVersion()
+    {
+        using var conn = new SqliteConnection(_dbService.GetConnectionString());
+        conn.Open();
+        Assert.Equal(0, DatabaseService.GetSchemaVersion(conn));
+
+        var cmd = conn.CreateCommand();
+        cmd.CommandText = $"PRAGMA user_version = {DatabaseService.ExpectedSchemaVersion}";
+        cmd.ExecuteNonQuery();
+
+        Assert.Equal(DatabaseService.ExpectedSchemaVersion, DatabaseService.GetSchemaVersion(conn));
+    }
+
     [Fact]
     public void UpsertApplication_InsertsAndUpdatesRow()
     {
@@ -49,7 +63,9 @@ public class DatabaseServiceTests : IDisposable
         {
             conn.Open();
             var cmd = conn.CreateCommand();
-            cmd.CommandText = "CREATE TABLE IF NOT EXISTS applications (id INTEGER PRIMARY KEY, company_name TEXT, role_name TEXT, folder_path TEXT, created_at TEXT, status TEXT)";
+            cmd.CommandText = @"
+                CREATE TABLE IF NOT EXISTS applications (id INTEGER PRIMARY KEY, company_name TEXT, role_name TEXT, folder_path TEXT, created_at TEXT, status TEXT);
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_apps_folder_path ON applications(folder_path);";
             cmd.ExecuteNonQuery();
         }
 
@@ -4,6 +4,10 @@ namespace JALM.Service;
 
 public class DatabaseService
 {
+    // The schema is owned by the Python app (app/core/migrations.py) and tracked
+    // through PRAGMA user_version. Keep this equal to migrations.SCHEMA_VERSION.
+    public const int ExpectedSchemaVersion = 9;
+
     private readonly ConfigService _configService;
     private readonly ILogger<DatabaseService> _logger;
 
@@ -40,6 +44,16 @@ public class DatabaseService
             command.ExecuteNonQuery();
 
             _logger.LogInformation("Database initialized with WAL mode.");
+
+            var version = GetSchemaVersion(connection);
+            if (version < ExpectedSchemaVersion)
+            {
+                _logger.LogWarning("Database schema version {Version} is older than expected ({Expected}). Start the JALM dashboard once to migrate it.", version, ExpectedSchemaVersion);
+            }
+            else if (version > ExpectedSchemaVersion)
+            {
+                _logger.LogWarning("Database schema version {Version} is newer than this service expects ({Expected}).", version, ExpectedSchemaVersion);
+            }
         }
         catch (Exception ex)
         {
@@ -47,6 +61,13 @@ public class DatabaseService
         }
     }
 
+    public static long GetSchemaVersion(SqliteConnection connection)
+    {
+        using var command = connection.CreateCommand();
+        command.CommandText = "PRAGMA user_version";
+        return (long)(command.ExecuteScalar() ?? 0L);
+    }
+
     public void UpsertApplication(string company, string role, string path, DateTime createdAt)
     {
         try
@@ -54,34 +75,24 @@ public class DatabaseService
             using var connection = new SqliteConnection(GetConnectionString());
             connection.Open();
 
-            // Check if application exists by company/role OR folder_path
-            using var checkCmd = connection.CreateCommand();
-            checkCmd.CommandText = "SELECT id FROM applications WHERE (company_name = @company AND role_name = @role) OR folder_path = @path";
-            checkCmd.Parameters.AddWithValue("@company", company);
-            checkCmd.Parameters.AddWithValue("@role", role);
-            checkCmd.Parameters.AddWithValue("@path", path);
-            var existingId = checkCmd.ExecuteScalar();
-
+            // folder_path is UNIQUE (schema v3), so a single INSERT ... ON CONFLICT
+            // either adds the folder or refreshes the record already stored for it.
+            // A record with the same company/role whose folder moved is adopted first
+            // (only one: moving several records to the same path would violate UNIQUE).
             using var command = connection.CreateCommand();
-            if (existingId == null)
-            {
-                command.CommandText = @"
-                    INSERT INTO applications (company_name, role_name, folder_path, created_at, status)
-                    VALUES (@company, @role, @path, @createdAt, 'Applied')
-                ";
-            }
-            else
-            {
-                command.CommandText = @"
-                    UPDATE applications SET 
-                        company_name = @company,
-                        role_name = @role,
-                        folder_path = @path,
-                        created_at = @createdAt
-                    WHERE id = @id
-                ";
-                command.Parameters.AddWithValue("@id", existingId);
-            }
+            command.CommandText = @"
+                UPDATE applications SET folder_path = @path
+                WHERE id = (SELECT MIN(id) FROM applications
+                            WHERE company_name = @company AND role_name = @role AND folder_path <> @path)
+                  AND NOT EXISTS (SELECT 1 FROM applications WHERE folder_path = @path);
+
+                INSERT INTO applications (company_name, role_name, folder_path, created_at, status)
+                VALUES (@company, @role, @path, @createdAt, 'Applied')
+                ON CONFLICT(folder_path) DO UPDATE SET
+                    company_name = excluded.company_name,
+                    role_name = excluded.role_name,
+                    created_at = excluded.created_at;
+            ";
 
             command.Parameters.AddWithValue("@company", company);
             command.Parameters.AddWithValue("@role", role);
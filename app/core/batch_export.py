@@ -1,23 +1,124 @@
+import csv
+import errno
+import hashlib
+import io
+import json
 import os
 import shutil
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
+from .doc_index import refresh_documents
+
+# File copies are I/O bound (often a network share or USB stick), so a few
+# threads overlap the waiting even with the GIL.
+DEFAULT_MAX_WORKERS = 8
+
+# Output modes
+OUTPUT_FOLDER = "folder"   # Loose files in the target folder
+OUTPUT_ZIP = "zip"         # One .zip archive, written in a single sequential pass
+
+# PDFs and Office files are already compressed: deflating them again costs CPU
+# and saves almost nothing, so they are stored as-is. Text compresses well.
+ZIP_COMPRESSION = {
+    ".pdf": zipfile.ZIP_STORED,
+    ".docx": zipfile.ZIP_STORED,
+    ".txt": zipfile.ZIP_DEFLATED,
+}
+ZIP_DEFAULT_COMPRESSION = zipfile.ZIP_DEFLATED
+ZIP_CHUNK_SIZE = 1024 * 1024
+MANIFEST_NAME = "manifest.csv"
+
+# How files are placed in the target folder (OUTPUT_FOLDER only)
+LINK_COPY = "copy"          # Always duplicate the bytes (default, always safe)
+LINK_HARDLINK = "hardlink"  # os.link: instant, no extra space, but the export shares the
+                            # file with the workspace (editing one edits the other)
+LINK_REFLINK = "reflink"    # Copy-on-write clone (Linux FICLONE: Btrfs, XFS, ...): instant and independent
+LINK_AUTO = "auto"          # Try hardlink, then reflink, then copy
+LINK_STRATEGIES = (LINK_COPY, LINK_HARDLINK, LINK_REFLINK, LINK_AUTO)
+
+# Incremental mode: the target folder keeps a manifest of what was exported
+# (source path, size, mtime, optional hash), so a re-export only copies new or
+# changed documents instead of starting a fresh Export_<timestamp> folder.
+EXPORT_MANIFEST_NAME = ".jalm_export_manifest.json"
+EXPORT_MANIFEST_VERSION = 1
+UNCHANGED = "unchanged"
+
+# From <linux/fs.h>: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# Errors meaning "this strategy can never work for this source/target pair"
+# (different volumes, unsupported filesystem), as opposed to a per-file problem.
+_UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EPERM, errno.ENOTSUP, errno.EOPNOTSUPP, errno.ENOSYS,
+                       errno.EINVAL, errno.ENOTTY}
+
+
+def reflink(source, target):
+    """Creates `target` as a copy-on-write clone of `source`. Raises OSError if unsupported."""
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError(errno.ENOTSUP, "Reflinks are not supported on this platform")
+
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.remove(target)
+            raise
+    shutil.copystat(source, target)  # Keep timestamps like copy2 does
+
+
+def file_sha256(path):
+    """SHA-256 of a file, read in ZIP_CHUNK_SIZE blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(ZIP_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 class BatchExporter:
     """
     Handles the bulk exportation of application documents (CVs and Job Descriptions).
     Integrates a 'best-guess' search logic to find files in application folders
     and renames them following a standardized sequence for professional organization.
+
+    The export runs as a small pipeline:
+        1. Discovery: look up the CV/JD of every application in the document index
+           (doc_index.py); only folders that changed are listed again (thread pool).
+        2. Planning: assign "cv 1, cv 2, ..." names in application order, so the
+           numbering is the same no matter which thread finishes first.
+        3. Copying: copy the planned files (thread pool), reporting per-file progress.
+    Every step checks `cancel_event`, so a long export can be stopped from the UI.
     """
-    def __init__(self):
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS):
+        self.max_workers = max_workers
         # Track counts and non-fatal errors during the operation
         self.stats = {
             "exported_cvs": 0,
             "exported_jds": 0,
-            "errors": []
+            "errors": [],
+            "cancelled": False,
+            # How many files were placed with each link strategy
+            "strategies": {LINK_HARDLINK: 0, LINK_REFLINK: 0, LINK_COPY: 0},
+            # Incremental mode only: files left alone / deleted from the target
+            "unchanged": 0,
+            "pruned": 0
         }
+        self.link_strategy = LINK_COPY
+        self.incremental = False
+        self.verify_hash = False
+        # Strategies that failed with an "unsupported" error during this export
+        self._disabled_strategies = set()
+        self._strategy_lock = threading.Lock()
 
-    def export(self, applications, target_dir, search_query="", export_cv=True, export_jd=True):
+    def export(self, applications, target_dir, search_query="", export_cv=True, export_jd=True,
+               progress_callback=None, cancel_event=None, output=OUTPUT_FOLDER, link_strategy=LINK_COPY,
+               incremental=False, prune=False, verify_hash=False):
         """
         Exports the selected document types for a list of applications to a target directory.
         
@@ -27,7 +128,79 @@ class BatchExporter:
             search_query (str): The role name used for naming the exported files.
             export_cv (bool): Enable/disable CV export.
             export_jd (bool): Enable/disable JD export.
+            progress_callback (callable, optional): Called with one event dict per
+                file (see _emit). Runs on the calling thread, never on a worker.
+            cancel_event (threading.Event, optional): Set it to stop the export;
+                files already copied are kept and stats["cancelled"] is True.
+            output (str): OUTPUT_FOLDER for loose files, or OUTPUT_ZIP for a single
+                archive (target_dir may then also be a path ending in '.zip').
+                The archive path is returned in stats["archive_path"].
+            link_strategy (str): LINK_COPY, LINK_HARDLINK, LINK_REFLINK or LINK_AUTO.
+                Anything other than copy falls back to copying when the volume or
+                filesystem does not support it. Used files are counted in stats["strategies"].
+            incremental (bool): Update a previous export in target_dir itself (no Export_
+                subfolder). Files whose source size and mtime match the manifest are left
+                alone and counted in stats["unchanged"]; file names stay the same across runs.
+            prune (bool): Incremental only. Delete exported CVs/JDs (of the selected types)
+                whose source is no longer part of the export (counted in stats["pruned"]).
+                Skipped if cancelled.
+            verify_hash (bool): Incremental only. Store a SHA-256 of each file, and when only
+                the mtime changed, compare hashes before deciding to copy again.
         """
+        if output not in (OUTPUT_FOLDER, OUTPUT_ZIP):
+            raise ValueError(f"Unknown export output: {output}")
+        if link_strategy not in LINK_STRATEGIES:
+            raise ValueError(f"Unknown link strategy: {link_strategy}")
+        if incremental and output == OUTPUT_ZIP:
+            raise ValueError("Incremental export only supports folder output")
+        self.link_strategy = link_strategy
+        self.incremental = incremental
+        self.verify_hash = verify_hash
+        cancel_event = cancel_event or threading.Event()
+
+        manifest = None
+        if output == OUTPUT_ZIP:
+            archive_path = self._archive_path(target_dir)
+            target_path = None
+        elif incremental:
+            # The target *is* the previous export, so it is reused as-is.
+            target_path = Path(target_dir)
+            target_path.mkdir(parents=True, exist_ok=True)
+            manifest = self._load_export_manifest(target_path)
+        else:
+            target_path = self._prepare_target_folder(target_dir)
+
+        # Use the search query as the file prefix for the entire batch.
+        # This aligns with the requirement to have a role-based naming pattern.
+        file_prefix = search_query.strip() if search_query else "Application"
+        
+        # Strip illegal characters from the prefix to ensure file system compatibility.
+        file_prefix = "".join(c for c in file_prefix if c.isalnum() or c in (' ', '_', '-')).strip()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="jalm-export") as pool:
+            # 1. Discovery: one index lookup for the whole batch
+            found = self._discover(applications, export_cv, export_jd, cancel_event, pool)
+
+            # 2. Planning: indices are handed out here, sequentially
+            plan = self._plan(found, file_prefix, target_path)
+            if manifest is not None:
+                self._reuse_manifest_names(plan, manifest, file_prefix, target_path)
+
+            # 3. Copying
+            if output == OUTPUT_ZIP:
+                self._write_zip(plan, archive_path, progress_callback, cancel_event)
+            else:
+                self._copy_all(pool, plan, progress_callback, cancel_event)
+
+        self.stats["cancelled"] = cancel_event.is_set()
+        if manifest is not None:
+            # Only prune the document types this run exported: unticking "JDs" must not delete them.
+            prune_kinds = {kind for kind, on in (("cv", export_cv), ("jd", export_jd)) if on}
+            self._finish_incremental(plan, manifest, target_path,
+                                     prune_kinds if prune and not self.stats["cancelled"] else set())
+        return self.stats
+
+    def _prepare_target_folder(self, target_dir):
         target_path = Path(target_dir)
         if not target_path.exists():
             target_path.mkdir(parents=True, exist_ok=True)
@@ -38,96 +211,321 @@ class BatchExporter:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             target_path = target_path / f"Export_{timestamp}"
             target_path.mkdir()
+        return target_path
 
-        # Sequential numbering starts at 1 for each document type
-        cv_index = 1
-        jd_index = 1
-        
-        # Use the search query as the file prefix for the entire batch.
-        # This aligns with the requirement to have a role-based naming pattern.
-        file_prefix = search_query.strip() if search_query else "Application"
-        
-        # Strip illegal characters from the prefix to ensure file system compatibility.
-        file_prefix = "".join(c for c in file_prefix if c.isalnum() or c in (' ', '_', '-')).strip()
+    def _archive_path(self, target_dir):
+        """Returns the .zip to create: target_dir itself if it ends in .zip, else a timestamped file inside it."""
+        target = Path(target_dir)
+        if target.suffix.lower() == ".zip":
+            target.parent.mkdir(parents=True, exist_ok=True)
+            return target
+        target.mkdir(parents=True, exist_ok=True)
+        # A new timestamped file never overwrites anything, so no Export_ subfolder is needed.
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return target / f"Export_{timestamp}.zip"
 
+    def _load_export_manifest(self, target_path):
+        """Returns {exported name: record} from a previous incremental export ({} if none)."""
+        try:
+            with open(target_path / EXPORT_MANIFEST_NAME, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.stats["errors"].append(f"Export manifest unreadable, exporting everything again: {e}")
+            return {}
+        if not isinstance(data, dict) or data.get("version") != EXPORT_MANIFEST_VERSION:
+            return {}
+        return data.get("files", {})
+
+    def _reuse_manifest_names(self, plan, manifest, file_prefix, target_path):
+        """
+        Gives documents that were exported before their previous name, so a re-export
+        updates files in place. New documents get the next free number of their type.
+        """
+        previous_names = {(record["kind"], record["source"]): name for name, record in manifest.items()}
+        taken = set(manifest)
+        new_jobs = []
+        for job in plan:
+            name = previous_names.get((job["kind"], str(job["source"])))
+            if name:
+                job["name"], job["target"], job["previous"] = name, target_path / name, manifest[name]
+            else:
+                new_jobs.append(job)
+
+        next_index = {"cv": 1, "jd": 1}
+        for job in new_jobs:
+            kind = job["kind"]
+            while True:
+                name = f"{file_prefix} {kind} {next_index[kind]}{job['source'].suffix}"
+                next_index[kind] += 1
+                # Never take over a file the manifest does not know about
+                if name not in taken and not (target_path / name).exists():
+                    break
+            taken.add(name)
+            job["name"], job["target"] = name, target_path / name
+
+    def _finish_incremental(self, plan, manifest, target_path, prune_kinds):
+        """Prunes removed documents of `prune_kinds` and saves the updated manifest."""
+        files = {}
+        for job in plan:
+            if job.get("status") in ("copied", UNCHANGED):
+                files[job["name"]] = job["record"]
+            elif job["name"] in manifest:
+                files[job["name"]] = manifest[job["name"]]  # Failed/skipped: keep the old entry
+
+        for name, record in manifest.items():
+            if name in files:
+                continue
+            if record.get("kind") in prune_kinds:
+                try:
+                    (target_path / name).unlink(missing_ok=True)
+                    self.stats["pruned"] += 1
+                    continue
+                except OSError as e:
+                    self.stats["errors"].append(f"Could not remove {name}: {e}")
+            files[name] = record
+
+        # Same write-then-rename as the ZIP archive, so a crash never leaves half a manifest.
+        manifest_path = target_path / EXPORT_MANIFEST_NAME
+        part_path = manifest_path.with_name(manifest_path.name + ".part")
+        with open(part_path, "w", encoding="utf-8") as f:
+            json.dump({"version": EXPORT_MANIFEST_VERSION, "files": files}, f, indent=1, ensure_ascii=False)
+        os.replace(part_path, manifest_path)
+
+    def _source_record(self, job):
+        """What the manifest stores about one exported file."""
+        st = os.stat(job["source"])
+        return {
+            "kind": job["kind"],
+            "source": str(job["source"]),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "company": job["app"]["company_name"],
+            "role": job["app"]["role_name"]
+        }
+
+    def _is_unchanged(self, job, record):
+        """True if the exported copy of this job is still up to date."""
+        previous = job.get("previous")
+        if not previous or not os.path.exists(job["target"]):
+            return False
+        if previous.get("size") != record["size"]:
+            return False
+        if previous.get("mtime_ns") == record["mtime_ns"]:
+            if previous.get("sha256"):
+                record["sha256"] = previous["sha256"]
+            return True
+        # Only the mtime moved (touched, re-saved, synced by a cloud client...):
+        # with hashes on, that is not a reason to copy again.
+        if self.verify_hash and previous.get("sha256"):
+            record["sha256"] = file_sha256(job["source"])
+            return record["sha256"] == previous["sha256"]
+        return False
+
+    def _discover(self, applications, export_cv, export_jd, cancel_event, pool):
+        """Finds the documents of every application, in application order."""
+        if cancel_event.is_set():
+            return []
+        documents = refresh_documents([app['folder_path'] for app in applications], executor=pool)
+
+        found = []
         for app in applications:
+            folder_docs = documents.get(app['folder_path'])
+            if folder_docs is None:
+                found.append({"app": app, "missing": True})
+                continue
             folder_path = Path(app['folder_path'])
-            if not folder_path.exists():
+            cv = folder_docs["cv"] if export_cv else None
+            jd = folder_docs["jd"] if export_jd else None
+            found.append({
+                "app": app,
+                "missing": False,
+                "cv": folder_path / cv["name"] if cv else None,
+                "jd": folder_path / jd["name"] if jd else None
+            })
+        return found
+
+    def _plan(self, found, file_prefix, target_path):
+        """Turns discovery results into an ordered list of copy jobs with final names."""
+        # Sequential numbering starts at 1 for each document type
+        cv_index = 1
+        jd_index = 1
+        plan = []
+        for entry in found:
+            if entry is None:
+                continue  # Cancelled before discovery
+            app = entry["app"]
+            if entry["missing"]:
                 self.stats["errors"].append(f"Missing folder: {app['company_name']} - {app['role_name']}")
                 continue
 
-            # 1. Process CV
-            if export_cv:
-                # Find the most relevant CV/Resume file in the application folder.
-                cv_file = self._find_best_cv(folder_path)
-                if cv_file:
-                    try:
-                        ext = cv_file.suffix
-                        # Format: [Role Name] cv [Index].[Extension]
-                        new_name = f"{file_prefix} cv {cv_index}{ext}"
-                        shutil.copy2(cv_file, target_path / new_name)
-                        cv_index += 1
-                        self.stats["exported_cvs"] += 1
-                    except Exception as e:
-                        self.stats["errors"].append(f"Failed to copy CV for {app['company_name']}: {str(e)}")
-
-            # 2. Process JD
-            if export_jd:
-                # Find the Job Description file (usually job_description.txt).
-                jd_file = self._find_jd(folder_path)
-                if jd_file:
-                    try:
-                        ext = jd_file.suffix
-                        # Format: [Role Name] jd [Index].[Extension]
-                        new_name = f"{file_prefix} jd {jd_index}{ext}"
-                        shutil.copy2(jd_file, target_path / new_name)
-                        jd_index += 1
-                        self.stats["exported_jds"] += 1
-                    except Exception as e:
-                        # Non-fatal error, skip if copying fail
-                        pass
-        
-        return self.stats
+            if entry["cv"]:
+                # Format: [Role Name] cv [Index].[Extension]
+                new_name = f"{file_prefix} cv {cv_index}{entry['cv'].suffix}"
+                plan.append({"kind": "cv", "app": app, "source": entry["cv"], "name": new_name,
+                             "target": target_path / new_name if target_path else None})
+                cv_index += 1
 
-    def _find_best_cv(self, folder_path):
+            if entry["jd"]:
+                # Format: [Role Name] jd [Index].[Extension]
+                new_name = f"{file_prefix} jd {jd_index}{entry['jd'].suffix}"
+                plan.append({"kind": "jd", "app": app, "source": entry["jd"], "name": new_name,
+                             "target": target_path / new_name if target_path else None})
+                jd_index += 1
+        return plan
+
+    def _copy_one(self, job, cancel_event):
         """
-        Utility to identify the 'main' CV file in a folder.
-        Prioritizes:
-        1. Files containing 'CV' or 'Resume' (with high-confidence extensions).
-        2. Files with a .pdf extension.
-        3. Most recently modified file in case of multiple candidates.
+        Places one planned file. Runs on a worker thread.
+        Returns the strategy used, UNCHANGED (incremental mode), or None if skipped
+        because of cancellation.
         """
-        candidates = []
-        for item in folder_path.iterdir():
-            # Skip hidden/temporary files created by Word or Windows
-            if item.is_file() and not item.name.startswith("~"):
-                name_lower = item.name.lower()
-                if "cv" in name_lower or "resume" in name_lower:
-                    if item.suffix.lower() in ['.pdf', '.docx', '.doc']:
-                        candidates.append((10, item)) # Highest priority
-                elif item.suffix.lower() == '.pdf':
-                    candidates.append((5, item))   # Medium priority
-        
-        if not candidates:
+        if cancel_event.is_set():
             return None
-            
-        # Return the best match based on priority score then modification time
-        candidates.sort(key=lambda x: (x[0], x[1].stat().st_mtime), reverse=True)
-        return candidates[0][1]
+        if self.incremental:
+            # Stat before copying: if the source changes mid-copy, the next run copies it again.
+            job["record"] = self._source_record(job)
+            if self._is_unchanged(job, job["record"]):
+                return UNCHANGED
+            if self.verify_hash and "sha256" not in job["record"]:
+                job["record"]["sha256"] = file_sha256(job["source"])
+            # Replace, never write through: the old file may be a hard link to a workspace file.
+            if os.path.lexists(job["target"]):
+                os.remove(job["target"])
+
+        if self.link_strategy == LINK_AUTO:
+            candidates = (LINK_HARDLINK, LINK_REFLINK)
+        elif self.link_strategy == LINK_COPY:
+            candidates = ()
+        else:
+            candidates = (self.link_strategy,)
+
+        for strategy in candidates:
+            if strategy in self._disabled_strategies:
+                continue
+            try:
+                if strategy == LINK_HARDLINK:
+                    os.link(job["source"], job["target"])
+                else:
+                    reflink(job["source"], job["target"])
+                return strategy
+            except OSError as e:
+                if e.errno in _UNSUPPORTED_ERRNOS:
+                    # Will fail for every file of this export: stop trying it.
+                    with self._strategy_lock:
+                        self._disabled_strategies.add(strategy)
+
+        shutil.copy2(job["source"], job["target"])
+        return LINK_COPY
+
+    def _copy_all(self, pool, plan, progress_callback, cancel_event):
+        futures = {pool.submit(self._copy_one, job, cancel_event): job for job in plan}
+        done = 0
+        for future in as_completed(futures):
+            job = futures[future]
+            done += 1
+            error = None
+            strategy = None
+            try:
+                strategy = future.result()
+                if strategy == UNCHANGED:
+                    status, strategy = UNCHANGED, None
+                else:
+                    status = "copied" if strategy else "skipped"
+            except Exception as e:
+                status, error = "failed", str(e)
+            job["status"] = status
+
+            if status == UNCHANGED:
+                self.stats["unchanged"] += 1
+            elif status == "copied":
+                self.stats["exported_cvs" if job["kind"] == "cv" else "exported_jds"] += 1
+                self.stats["strategies"][strategy] += 1
+            elif status == "failed" and job["kind"] == "cv":
+                # JD copy failures stay non-fatal and silent, as before.
+                self.stats["errors"].append(f"Failed to copy CV for {job['app']['company_name']}: {error}")
+
+            self._emit(progress_callback, job, status, done, len(plan), error, strategy)
 
-    def _find_jd(self, folder_path):
+    def _write_zip(self, plan, archive_path, progress_callback, cancel_event):
         """
-        Identifies the Job Description file.
-        Commonly 'job_description.txt' created by JALM, but falls back to 
-        searching for 'JD' or 'Description' in filenames.
+        Streams every planned file into one archive, in order, in fixed-size chunks
+        (no staging copies on disk), followed by manifest.csv.
+        The archive is written to a '.part' file and renamed when complete.
         """
-        jd_txt = folder_path / "job_description.txt"
-        if jd_txt.exists():
-            return jd_txt
-            
-        for item in folder_path.iterdir():
-            if item.is_file():
-                name_lower = item.name.lower()
-                if ("jd" in name_lower or "description" in name_lower) and "job" in name_lower:
-                     return item
-        return None
+        self.stats["archive_path"] = str(archive_path)
+        part_path = archive_path.with_name(archive_path.name + ".part")
+        manifest = []
+        done = 0
+        try:
+            with zipfile.ZipFile(part_path, "w", allowZip64=True) as zf:
+                for job in plan:
+                    done += 1
+                    error = None
+                    if cancel_event.is_set():
+                        status = "skipped"
+                    else:
+                        try:
+                            self._add_to_zip(zf, job)
+                            status = "copied"
+                            manifest.append(job)
+                        except Exception as e:
+                            status, error = "failed", str(e)
+
+                    if status == "copied":
+                        self.stats["exported_cvs" if job["kind"] == "cv" else "exported_jds"] += 1
+                    elif status == "failed" and job["kind"] == "cv":
+                        self.stats["errors"].append(f"Failed to copy CV for {job['app']['company_name']}: {error}")
+                    self._emit(progress_callback, job, status, done, len(plan), error)
+
+                self._write_manifest(zf, manifest)
+            os.replace(part_path, archive_path)
+        except BaseException:
+            if part_path.exists():
+                part_path.unlink()
+            raise
+
+    def _add_to_zip(self, zf, job):
+        source = Path(job["source"])
+        info = zipfile.ZipInfo.from_file(source, arcname=job["name"])
+        info.compress_type = ZIP_COMPRESSION.get(source.suffix.lower(), ZIP_DEFAULT_COMPRESSION)
+        with open(source, "rb") as src, zf.open(info, "w", force_zip64=True) as dst:
+            shutil.copyfileobj(src, dst, ZIP_CHUNK_SIZE)
+
+    def _write_manifest(self, zf, jobs):
+        """manifest.csv maps every exported name back to its company, role and source."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["File", "Type", "Company", "Role", "Source"])
+        for job in jobs:
+            writer.writerow([job["name"], job["kind"].upper(), job["app"]["company_name"],
+                             job["app"]["role_name"], str(job["source"])])
+        zf.writestr(MANIFEST_NAME, buffer.getvalue().encode("utf-8-sig"), compress_type=zipfile.ZIP_DEFLATED)
+
+    def _emit(self, progress_callback, job, status, done, total, error=None, strategy=None):
+        """
+        Sends one per-file progress event:
+            {"kind": "cv"|"jd", "status": "copied"|"unchanged"|"skipped"|"failed", "name": exported name,
+             "source": source path, "company": ..., "role": ..., "done": n, "total": N,
+             "error": str|None, "strategy": "hardlink"|"reflink"|"copy"|None}
+        """
+        if not progress_callback:
+            return
+        # Applications are dicts or sqlite3.Row (dashboard), so subscript access only
+        event = {
+            "kind": job["kind"],
+            "status": status,
+            "name": job["name"],
+            "source": str(job["source"]),
+            "company": job["app"]["company_name"],
+            "role": job["app"]["role_name"],
+            "done": done,
+            "total": total,
+            "error": error,
+            "strategy": strategy
+        }
+        try:
+            progress_callback(event)
+        except Exception:
+            pass  # A broken progress display must not abort the export
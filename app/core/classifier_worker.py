@@ -0,0 +1,216 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Background role classifier.
+#
+# Classifies new titles as soon as they are created (enqueue), so the first
+# report after a burst of new applications finds the cache already warm.
+# It also re-warms the role_mappings cache while the app is idle: titles whose LLM
+# answer came from another model or prompt version (see llm_service.get_prompt_hash)
+# are classified again, one at a time, with a pause between titles so Ollama is
+# never hogged. Reports keep using the cached (stale) answer meanwhile, so
+# switching models never blocks report generation. Manual corrections are
+# never touched (database.save_role_classification refuses to overwrite them).
+
+# Seconds without user activity before background work starts
+DEFAULT_IDLE_DELAY = 2.0
+# Pause between two titles
+DEFAULT_ITEM_PAUSE = 0.2
+# Pause after an unexpected error (e.g. "database is locked" while the .NET service writes)
+DEFAULT_ERROR_BACKOFF = 5.0
+
+
+class ClassifierWorker:
+    """
+    Low-priority background thread that keeps the role classification cache warm.
+
+    Call enqueue() with new titles and rewarm() to re-classify stale mappings
+    (new titles go first). Use hold() around foreground
+    work that needs Ollama (e.g. generating a report) and notify_activity()
+    on user input; the worker only runs when neither happened recently.
+    """
+    def __init__(self, idle_delay=DEFAULT_IDLE_DELAY, item_pause=DEFAULT_ITEM_PAUSE,
+                 error_backoff=DEFAULT_ERROR_BACKOFF):
+        self.idle_delay = idle_delay
+        self.item_pause = item_pause
+        self.error_backoff = error_backoff
+        self.last_error = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._holds = 0
+        self._last_activity = 0.0
+        self._rewarm_requested = False
+        self._rewarm_after = None  # Last title tried in the current re-warm pass
+        self._queue = deque()    # New titles, in the order they were created
+        self._queued = set()
+
+    # --- Lifecycle ---
+
+    def start(self):
+        """Starts the worker thread (no-op if it is already running)."""
+        with self._lock:
+            if self.is_running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="jalm-classifier", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """Stops the worker. A classification already in flight is finished first (up to `timeout`)."""
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self._thread = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    # --- Scheduling ---
+
+    def rewarm(self, start=True):
+        """Queues a re-classification of every stale mapping (and starts the worker unless start=False)."""
+        with self._lock:
+            self._rewarm_requested = True
+            self._rewarm_after = None
+        if start:
+            self.start()
+        self._wake.set()
+
+    def enqueue(self, roles):
+        """
+        Queues new titles for classification. Titles that are already cached are
+        skipped when their turn comes. Processed once the worker runs (see start()).
+        """
+        with self._lock:
+            for role in roles:
+                if role and role not in self._queued:
+                    self._queued.add(role)
+                    self._queue.append(role)
+        self._wake.set()
+
+    def notify_activity(self):
+        """Called on user input: background work waits until the app is idle again."""
+        self._last_activity = time.monotonic()
+
+    @contextmanager
+    def hold(self):
+        """Pauses background work for the duration of the block (nests)."""
+        with self._lock:
+            self._holds += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._holds -= 1
+            self._wake.set()
+
+    # --- Work ---
+
+    def run_pending(self):
+        """Processes all queued work on the calling thread (ignores idleness). Returns the number classified."""
+        done = 0
+        while True:
+            role = self._next_role()
+            if role is None:
+                return done
+            if self._classify(role):
+                done += 1
+
+    def _is_idle(self):
+        return self._holds == 0 and time.monotonic() - self._last_activity >= self.idle_delay
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            while not self._stop.is_set():
+                if not self._is_idle():
+                    self._stop.wait(0.5)
+                    continue
+                try:
+                    role = self._next_role()
+                    if role is None:
+                        break
+                    self._classify(role)
+                except Exception as e:
+                    # e.g. sqlite3.OperationalError: keep the thread alive, try again later.
+                    # The title is picked up again by the next report or re-warm pass.
+                    self.last_error = e
+                    self._stop.wait(self.error_backoff)
+                    continue
+                self._stop.wait(self.item_pause)
+
+    def _next_role(self):
+        """Next title to classify (queued new titles first), or None when there is nothing left."""
+        from .database import is_role_mapped
+        while True:
+            with self._lock:
+                if not self._queue:
+                    break
+                role = self._queue.popleft()
+                self._queued.discard(role)
+            if not is_role_mapped(role):  # A report may have classified it meanwhile
+                return role
+
+        with self._lock:
+            if not self._rewarm_requested:
+                return None
+            after = self._rewarm_after
+
+        from .database import get_stale_role_mappings
+        from .llm_service import get_classifier_identity
+        model_name, prompt_hash = get_classifier_identity()
+        stale = get_stale_role_mappings(model_name, prompt_hash, limit=1, after=after)
+
+        with self._lock:
+            if not stale:
+                self._rewarm_requested = False
+                self._rewarm_after = None
+                return None
+            self._rewarm_after = stale[0]
+            return stale[0]
+
+    def _classify(self, role):
+        """Classifies one title and caches it. Returns False if the model gave no answer."""
+        from .database import save_role_classification
+        from .llm_service import classify_role
+        try:
+            category, source, model_name, prompt_hash = classify_role(role)
+        except Exception as e:
+            # Keep the old answer; it stays stale and is retried on the next re-warm.
+            # (A new title stays uncached and is classified by the report as before.)
+            self.last_error = e
+            if self._is_connection_error(e):
+                # Ollama is down: stop this pass instead of failing on every title
+                with self._lock:
+                    self._rewarm_requested = False
+                    self._rewarm_after = None
+                    self._queue.clear()
+                    self._queued.clear()
+            return False
+        save_role_classification(role, category, source, model_name, prompt_hash)
+        return True
+
+    @staticmethod
+    def _is_connection_error(error):
+        import urllib.error
+        return isinstance(error, (urllib.error.URLError, ConnectionError, TimeoutError))
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+def get_classifier_worker():
+    """The shared worker used by the app (created on first use, not started)."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = ClassifierWorker()
+        return _worker
@@ -1,6 +1,8 @@
+import copy
 import json
 import os
 import sys
+import threading
 from pathlib import Path
 
 GLOBAL_CONFIG_FILE = "config.json"
@@ -14,6 +16,83 @@ DEFAULT_CONFIG = {
     "ollama_model": "llama3.2"
 }
 
+# In-memory cache of parsed config files: {path: (mtime_ns, size, data)}.
+# get_active_root() is called for every DB connection and load_config() for
+# every folder creation / LLM call, so re-parsing JSON each time is wasteful.
+# An entry is reused while the file's mtime and size are unchanged, and our
+# own writes (save_config / set_active_root) update it explicitly.
+_config_cache = {}
+_cache_lock = threading.Lock()
+
+# Callbacks notified with the new path whenever the active root changes.
+_root_listeners = []
+_UNSET = object()  # No root observed yet (None is a valid observation: no workspace)
+_last_seen_root = _UNSET
+
+def _read_json_cached(path):
+    """Returns the parsed JSON at `path` (cached), or None if the file does not exist."""
+    key = str(path)
+    try:
+        st = os.stat(key)
+    except FileNotFoundError:
+        with _cache_lock:
+            _config_cache.pop(key, None)
+        return None
+
+    with _cache_lock:
+        entry = _config_cache.get(key)
+    if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+        return entry[2]
+
+    with open(key, "r") as f:
+        data = json.load(f)
+    with _cache_lock:
+        _config_cache[key] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+def _write_json_cached(path, data):
+    """Writes `data` to `path` and refreshes the cache entry (write-through)."""
+    key = str(path)
+    with open(key, "w") as f:
+        json.dump(data, f, indent=4)
+    st = os.stat(key)
+    with _cache_lock:
+        _config_cache[key] = (st.st_mtime_ns, st.st_size, copy.deepcopy(data))
+
+def invalidate_config_cache(path=None):
+    """Drops one cached file (or all of them) so the next read goes to disk."""
+    with _cache_lock:
+        if path is None:
+            _config_cache.clear()
+        else:
+            _config_cache.pop(str(path), None)
+
+def add_root_listener(callback):
+    """Registers callback(new_root) to be called whenever the active root changes."""
+    if callback not in _root_listeners:
+        _root_listeners.append(callback)
+
+def remove_root_listener(callback):
+    if callback in _root_listeners:
+        _root_listeners.remove(callback)
+
+def _notify_if_root_changed(root):
+    """Calls the root listeners once per actual change of the active root."""
+    global _last_seen_root
+    if root == _last_seen_root:
+        return
+    previous = _last_seen_root
+    _last_seen_root = root
+    # The first observation is the initial state, not a change.
+    # None -> root (first-run setup) is a change.
+    if previous is _UNSET:
+        return
+    for callback in list(_root_listeners):
+        try:
+            callback(root)
+        except Exception as e:
+            print(f"Root change listener failed: {e}")
+
 def get_global_config_path():
     if hasattr(sys, '_MEIPASS'):
         # Bundled (PyInstaller): Place config next to the .exe
@@ -25,34 +104,38 @@ def get_global_config_path():
 def get_active_root():
     """Returns the current active root directory from global config."""
     global_path = get_global_config_path()
-    if not global_path.exists():
-        return None
     try:
-        with open(global_path, "r") as f:
-            data = json.load(f)
+        data = _read_json_cached(global_path)
+        if data is None:
+            active_root = None  # No global config yet (first run)
+        elif "root_directory" in data and "active_root" not in data:
             # Migration check: handle old config format
-            if "root_directory" in data and "active_root" not in data:
-                active_root = data["root_directory"]
-                set_active_root(active_root)
-                return active_root
-            return data.get("active_root")
+            active_root = data["root_directory"]
+            set_active_root(active_root)
+            return active_root
+        else:
+            active_root = data.get("active_root")
     except Exception as e:
         print(f"Error reading global config (get_active_root): {e}")
         return None
 
+    # Picks up edits made outside this process (e.g. by hand or another instance).
+    _notify_if_root_changed(active_root)
+    return active_root
+
 def set_active_root(root_path):
     """Sets the active root directory in global config (preserves other keys)."""
     global_path = get_global_config_path()
     data = {}
-    if global_path.exists():
-        try:
-            with open(global_path, "r") as f:
-                data = json.load(f)
-        except Exception as e:
-            print(f"Error reading global config (set_active_root): {e}")
+    try:
+        cached = _read_json_cached(global_path)
+        if cached is not None:
+            data = dict(cached)
+    except Exception as e:
+        print(f"Error reading global config (set_active_root): {e}")
     data["active_root"] = str(root_path)
-    with open(global_path, "w") as f:
-        json.dump(data, f, indent=4)
+    _write_json_cached(global_path, data)
+    _notify_if_root_changed(data["active_root"])
 
 def get_workspace_config_path():
     """Returns path to the config file inside the active root."""
@@ -62,21 +145,40 @@ def get_workspace_config_path():
     return Path(root) / WORKSPACE_CONFIG_NAME
 
 def load_config():
-    """Loads workspace config. Returns default if not found."""
+    """
+    Loads workspace config. Returns default if not found.
+    The result is a copy, so callers are free to modify it before save_config().
+    """
     path = get_workspace_config_path()
-    if not path or not path.exists():
-        return DEFAULT_CONFIG
+    if not path:
+        return copy.deepcopy(DEFAULT_CONFIG)
     
     try:
-        with open(path, "r") as f:
-            data = json.load(f)
-            # Migration: check for old "cl_template_path"
-            if "cl_template_path" in data and "cover_letter_template_path" not in data:
-                data["cover_letter_template_path"] = data["cl_template_path"]
-            return data
+        cached = _read_json_cached(path)
+        if cached is None:
+            return copy.deepcopy(DEFAULT_CONFIG)
+        data = copy.deepcopy(cached)  # Never hand out (nested) parts of the shared cache
+        # Migration: check for old "cl_template_path"
+        if "cl_template_path" in data and "cover_letter_template_path" not in data:
+            data["cover_letter_template_path"] = data["cl_template_path"]
+        return data
     except Exception as e:
         print(f"Error loading workspace config: {e}")
-        return DEFAULT_CONFIG
+        return copy.deepcopy(DEFAULT_CONFIG)
+
+def get_config_value(key, default=None):
+    """
+    Reads a single workspace setting without copying the whole config.
+    Meant for hot paths such as the current Ollama model.
+    """
+    path = get_workspace_config_path()
+    try:
+        data = _read_json_cached(path) if path else None
+    except Exception:
+        data = None
+    if data is None:
+        return DEFAULT_CONFIG.get(key, default)
+    return data.get(key, default)
 
 def save_config(config_data):
     """Saves config to the workspace-specific file."""
@@ -87,8 +189,7 @@ def save_config(config_data):
     # Ensure root exists
     path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(path, "w") as f:
-        json.dump(config_data, f, indent=4)
+    _write_json_cached(path, config_data)
 
 def is_config_complete():
     """Checks if root is set AND workspace config is complete."""
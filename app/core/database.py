@@ -1,8 +1,10 @@
 import sqlite3
 import os
+import re
 from datetime import datetime
 
 from .config_mgr import get_active_root
+from .migrations import migrate, SCHEMA_VERSION, DEDUPE_APPLICATIONS_SQL
 import threading
 
 DB_NAME = "jalm_apps.db"
@@ -31,62 +33,16 @@ def get_db_connection():
     
     return conn
 
-# This "Initializes" the database by creating tables if they don't exist.
+# This "Initializes" the database by bringing its schema up to date.
 def init_db():
-    """Initializes the database with the required tables."""
+    """
+    Initializes the database with the required tables.
+    The actual schema lives in migrations.py; when the database is already on
+    the latest version this is a single PRAGMA read and no DDL runs.
+    """
     conn = get_db_connection()
     try:
-        cursor = conn.cursor()
-
-        # 1. table for all your job applications.
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS applications (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                company_name TEXT NOT NULL,
-                role_name TEXT NOT NULL,
-                folder_path TEXT NOT NULL,
-                status TEXT DEFAULT 'Applied',
-                job_description TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Migration: Add job_description column if it doesn't exist (for existing users)
-        cursor.execute("PRAGMA table_info(applications)")
-        columns = [row[1] for row in cursor.fetchall()]
-        if "job_description" not in columns:
-            cursor.execute("ALTER TABLE applications ADD COLUMN job_description TEXT")
-
-        # 2. table for tracking interview notes.
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS interviews (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                app_id INTEGER NOT NULL,
-                sequence INTEGER NOT NULL,
-                notes TEXT,
-                date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (app_id) REFERENCES applications (id) ON DELETE CASCADE
-            )
-        ''')
-
-        # 3. Create "Indexes" to make searching for companies super fast.
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_apps_company ON applications(company_name)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_apps_role ON applications(role_name)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_apps_created ON applications(created_at)')
-
-        # Migration: Rename 'Interviewing' to 'Interviewed'
-        cursor.execute("UPDATE applications SET status = 'Interviewed' WHERE status = 'Interviewing'")
-
-        # 4. table for caching role categorizations (LLM)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS role_mappings (
-                original_role TEXT PRIMARY KEY,
-                mapped_category TEXT NOT NULL
-            )
-        ''')
-
-
-        conn.commit()
+        migrate(conn)
     finally:
         conn.close()
 
@@ -100,26 +56,106 @@ def get_mapped_role(role_name):
         cursor = conn.cursor()
         cursor.execute('SELECT mapped_category FROM role_mappings WHERE original_role = ?', (role_name,))
         row = cursor.fetchone()
+    finally:
+        conn.close()
         
-        if row:
-            return row[0]
-            
-        # If not found, call LLM
-        try:
-            from .llm_service import classify_job_title
-            category = classify_job_title(role_name)
-        except Exception as e:
-            print(f"LLM Classification failed for '{role_name}': {e}")
-            category = role_name.title() # fallback
-
-        # Cache the result
-        try:
-            cursor.execute("INSERT OR IGNORE INTO role_mappings (original_role, mapped_category) VALUES (?, ?)", (role_name, category))
-            conn.commit()
-        except Exception as e:
-            print(f"Failed to cache role mapping: {e}")
-            
-        return category
+    if row:
+        # Answers from another model/prompt are still served as they are: the
+        # background classifier re-warms them, so a model switch never blocks a report.
+        return row[0]
+        
+    # If not found, call LLM (or a rule, if the title already is a category)
+    from .llm_service import classify_role, get_classifier_identity, SOURCE_LLM
+    try:
+        category, source, model_name, prompt_hash = classify_role(role_name)
+    except Exception as e:
+        print(f"LLM Classification failed for '{role_name}': {e}")
+        # fallback, cached without a prompt hash so the re-warm job retries it later
+        category, source, model_name, prompt_hash = role_name.title(), SOURCE_LLM, get_classifier_identity()[0], None
+
+    try:
+        save_role_classification(role_name, category, source, model_name, prompt_hash)
+    except Exception as e:
+        print(f"Failed to cache role mapping: {e}")
+        
+    return category
+
+def save_role_classification(original_role, category, source, model_name=None, prompt_hash=None):
+    """
+    Caches an automatic classification (source 'llm' or 'rule').
+    A manual correction is never overwritten. Returns True if the row was written.
+    """
+    return save_role_classifications([(original_role, category, source, model_name, prompt_hash)]) > 0
+
+def save_role_classifications(rows):
+    """
+    Batch version of save_role_classification, in one transaction.
+    `rows` are (original_role, category, source, model_name, prompt_hash). Returns the rows written.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    conn = get_db_connection()
+    try:
+        cursor = conn.executemany('''
+            INSERT INTO role_mappings (original_role, mapped_category, source, model_name, prompt_hash, classified_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(original_role) DO UPDATE SET
+                mapped_category = excluded.mapped_category, model_name = excluded.model_name,
+                prompt_hash = excluded.prompt_hash, classified_at = excluded.classified_at, source = excluded.source
+            WHERE role_mappings.source IS NOT 'manual'
+        ''', rows)
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        conn.close()
+
+def get_stale_role_mappings(model_name, prompt_hash, limit=50, after=None):
+    """
+    Titles whose LLM answer came from another model or prompt (or no answer at
+    all), oldest first. Manual and rule mappings are never stale.
+    Pass the last title of the previous call as `after` to continue from there
+    (keyset on rowid, which re-classifying a title does not change), so a title
+    that failed is not returned again within the same pass.
+    """
+    after_clause = " AND rowid > (SELECT rowid FROM role_mappings WHERE original_role = ?)" if after is not None else ""
+    params = [model_name, prompt_hash] + ([after] if after is not None else []) + [limit]
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute(f'''
+            SELECT original_role FROM role_mappings
+            WHERE source = 'llm' AND (model_name IS NOT ? OR prompt_hash IS NOT ?){after_clause}
+            ORDER BY rowid ASC LIMIT ?
+        ''', params)
+        return [row[0] for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+def is_role_mapped(role_name):
+    """True if the title already has a cached category (of any source)."""
+    return not get_unmapped_roles([role_name])
+
+def get_unmapped_roles(role_names):
+    """The titles (in the given order) that have no cached category yet."""
+    role_names = list(dict.fromkeys(role_names))
+    mapped = set()
+    conn = get_db_connection()
+    try:
+        for i in range(0, len(role_names), 500):  # SQLite limits the number of '?' parameters
+            chunk = role_names[i:i + 500]
+            cursor = conn.execute(
+                f"SELECT original_role FROM role_mappings WHERE original_role IN ({','.join('?' * len(chunk))})", chunk)
+            mapped.update(row[0] for row in cursor)
+    finally:
+        conn.close()
+    return [r for r in role_names if r not in mapped]
+
+def count_stale_role_mappings(model_name, prompt_hash):
+    conn = get_db_connection()
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) FROM role_mappings WHERE source = 'llm' AND (model_name IS NOT ? OR prompt_hash IS NOT ?)",
+            (model_name, prompt_hash)).fetchone()[0]
     finally:
         conn.close()
 
@@ -144,51 +180,108 @@ def add_application(company, role, folder_path, created_at=None, job_description
     finally:
         conn.close()
 
-def get_applications(search_query=None, sort_by="created_at", sort_order="DESC"):
+def upsert_application(company, role, folder_path, created_at=None, job_description=None):
+    """
+    Inserts an application, or updates the record already stored for folder_path
+    (folder_path is UNIQUE). Status and interview notes of an existing record
+    are kept. Returns the application id.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO applications (company_name, role_name, folder_path, created_at, job_description)
+            VALUES (?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?)
+            ON CONFLICT(folder_path) DO UPDATE SET
+                company_name = excluded.company_name,
+                role_name = excluded.role_name,
+                created_at = COALESCE(?, applications.created_at),
+                job_description = COALESCE(excluded.job_description, applications.job_description)
+        ''', (company, role, folder_path, created_at, job_description, created_at))
+        cursor.execute('SELECT id FROM applications WHERE folder_path = ?', (folder_path,))
+        app_id = cursor.fetchone()[0]
+        conn.commit()
+        return app_id
+    finally:
+        conn.close()
+
+def _like_pattern(text):
+    """Substring LIKE pattern with %, _ and the escape character escaped (use ESCAPE '\\')."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def build_applications_query(search_query=None, sort_by="created_at", sort_order="DESC", columns=None,
+                             created_after=None):
+    """
+    Builds the SELECT used by the dashboard list (search + sort).
+    Shared with table_export so an export matches exactly what the dashboard shows.
+
+    Returns:
+        tuple: (sql, params)
+    """
+    # Validate sort_order against whitelist to prevent SQL injection
+    sort_order = sort_order.upper()
+    if sort_order not in ("ASC", "DESC"):
+        sort_order = "DESC"
+    
+    # Map friendly sort names to column names
+    sort_map = {
+        "Date": "created_at",
+        "Company": "company_name",
+        "Role": "role_name",
+        "Status": "status"
+    }
+    column = sort_map.get(sort_by, "created_at")
+    
+    # Column names are never user input, but check them anyway since they are formatted in.
+    select_list = "*"
+    if columns:
+        for name in columns:
+            if not name.isidentifier():
+                raise ValueError(f"Invalid column name: {name!r}")
+        select_list = ", ".join(columns)
+
+    query_str = f'SELECT {select_list} FROM applications'
+    conditions = []
+    params = []
+    
+    if search_query:
+        conditions.append("(company_name LIKE ? ESCAPE '\\' OR role_name LIKE ? ESCAPE '\\')")
+        search_val = _like_pattern(search_query)
+        params.extend([search_val, search_val])
+
+    # Dashboard time filter ("Last N Days"), 'YYYY-MM-DD HH:MM:SS' string comparison
+    if created_after:
+        conditions.append("created_at >= ?")
+        params.append(created_after)
+
+    if conditions:
+        query_str += " WHERE " + " AND ".join(conditions)
+    
+    if column == "status":
+        query_str += f""" ORDER BY 
+            CASE status
+                WHEN 'Applied' THEN 1
+                WHEN 'OA' THEN 2
+                WHEN 'HR Call' THEN 3
+                WHEN 'Interviewed' THEN 4
+                WHEN 'Offer' THEN 5
+                WHEN 'Rejected' THEN 6
+                WHEN 'Ghosted' THEN 7
+                ELSE 8
+            END {sort_order}
+        """
+    else:
+        query_str += f' ORDER BY {column} {sort_order}'
+    
+    return query_str, params
+
+def get_applications(search_query=None, sort_by="created_at", sort_order="DESC", created_after=None):
     """Fetches all applications, optionally filtered and sorted."""
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
-        
-        # Validate sort_order against whitelist to prevent SQL injection
-        sort_order = sort_order.upper()
-        if sort_order not in ("ASC", "DESC"):
-            sort_order = "DESC"
-        
-        # Map friendly sort names to column names
-        sort_map = {
-            "Date": "created_at",
-            "Company": "company_name",
-            "Role": "role_name",
-            "Status": "status"
-        }
-        column = sort_map.get(sort_by, "created_at")
-        
-        query_str = 'SELECT * FROM applications'
-        params = []
-        
-        if search_query:
-            query_str += " WHERE company_name LIKE ? ESCAPE '\\' OR role_name LIKE ? ESCAPE '\\'"
-            escaped_search = search_query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
-            search_val = f"%{escaped_search}%"
-            params.extend([search_val, search_val])
-        
-        if column == "status":
-            query_str += f""" ORDER BY 
-                CASE status
-                    WHEN 'Applied' THEN 1
-                    WHEN 'OA' THEN 2
-                    WHEN 'HR Call' THEN 3
-                    WHEN 'Interviewed' THEN 4
-                    WHEN 'Offer' THEN 5
-                    WHEN 'Rejected' THEN 6
-                    WHEN 'Ghosted' THEN 7
-                    ELSE 8
-                END {sort_order}
-            """
-        else:
-            query_str += f' ORDER BY {column} {sort_order}'
-        
+        query_str, params = build_applications_query(search_query, sort_by, sort_order, created_after=created_after)
         cursor.execute(query_str, params)
         apps = cursor.fetchall()
         return apps
@@ -220,11 +313,24 @@ def update_application_status(app_id, status):
     finally:
         conn.close()
 
+def _merge_application(cursor, keep_id, drop_id):
+    """Moves the interview notes of `drop_id` to `keep_id` and deletes `drop_id`."""
+    cursor.execute('UPDATE interviews SET app_id = ? WHERE app_id = ?', (keep_id, drop_id))
+    cursor.execute('DELETE FROM applications WHERE id = ?', (drop_id,))
+
 def update_application_paths(app_id, company_name, role_name, folder_path):
-    """Updates the company, role, and folder path for an existing application."""
+    """
+    Updates the company, role, and folder path for an existing application.
+    folder_path is UNIQUE: a record already stored for the new path (e.g.
+    inserted by the folder watcher or the .NET service before the rename was
+    seen) is merged into this one, interview notes included.
+    """
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
+        cursor.execute('SELECT id FROM applications WHERE folder_path = ? AND id <> ?', (folder_path, app_id))
+        for (other_id,) in cursor.fetchall():
+            _merge_application(cursor, app_id, other_id)
         cursor.execute('''
             UPDATE applications 
             SET company_name = ?, role_name = ?, folder_path = ? 
@@ -246,6 +352,77 @@ def get_application_by_id(app_id):
     finally:
         conn.close()
 
+def get_application_by_path(folder_path):
+    """Fetches the application stored for an exact folder path (or None)."""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM applications WHERE folder_path = ? ORDER BY id LIMIT 1', (folder_path,))
+        return cursor.fetchone()
+    finally:
+        conn.close()
+
+def get_application_by_name(company, role):
+    """Fetches the application for a company/role pair (or None)."""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM applications WHERE company_name = ? AND role_name = ? ORDER BY id LIMIT 1',
+                       (company, role))
+        return cursor.fetchone()
+    finally:
+        conn.close()
+
+def _subtree_bounds(folder_path):
+    # Every path below `folder_path` sorts in [folder_path + sep, folder_path + next_char(sep)).
+    # A range comparison (unlike LIKE) needs no escaping and can use an index on folder_path.
+    lower = folder_path.rstrip("\\/") + os.sep
+    upper = lower[:-1] + chr(ord(os.sep) + 1)
+    return lower, upper
+
+def get_applications_under_path(folder_path):
+    """Fetches the applications stored for `folder_path` itself or any folder below it."""
+    lower, upper = _subtree_bounds(folder_path)
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT * FROM applications
+            WHERE folder_path = ? OR (folder_path >= ? AND folder_path < ?)
+        ''', (folder_path, lower, upper))
+        return cursor.fetchall()
+    finally:
+        conn.close()
+
+def replace_path_prefix(old_path, new_path):
+    """
+    Rewrites folder_path for every application at or below `old_path` so it
+    points below `new_path` instead (a folder was renamed or moved).
+    Returns the number of records updated.
+    """
+    lower, upper = _subtree_bounds(old_path)
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        # Records already stored at a destination path are merged into the moved ones
+        cursor.execute('''
+            SELECT moved.id, existing.id FROM applications moved
+            JOIN applications existing ON existing.folder_path = ? || substr(moved.folder_path, ?)
+            WHERE (moved.folder_path = ? OR (moved.folder_path >= ? AND moved.folder_path < ?))
+              AND existing.id <> moved.id
+        ''', (new_path, len(old_path) + 1, old_path, lower, upper))
+        for moved_id, existing_id in cursor.fetchall():
+            _merge_application(cursor, moved_id, existing_id)
+        cursor.execute('''
+            UPDATE applications
+            SET folder_path = ? || substr(folder_path, ?)
+            WHERE folder_path = ? OR (folder_path >= ? AND folder_path < ?)
+        ''', (new_path, len(old_path) + 1, old_path, lower, upper))
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        conn.close()
+
 def update_application_date(app_id, created_at):
     """Updates the creation date of an application."""
     conn = get_db_connection()
@@ -299,20 +476,64 @@ def application_exists(company, role):
     finally:
         conn.close()
 
+def _prefix_bounds(prefix):
+    # All strings starting with `prefix` sort in [prefix, prefix with its last character incremented).
+    # Unlike LIKE (case-insensitive by default), this range can use the (company_name, role_name) index.
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
 def count_applications_with_name(company, role):
     """Counts how many applications exist for a company where the role name starts with 'role'."""
+    if not role:
+        return 0
+    lower, upper = _prefix_bounds(role)
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
-        # Escape SQL LIKE wildcards in the role name to avoid false matches
-        escaped_role = role.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
-        pattern = f"{escaped_role}%"
-        cursor.execute("SELECT COUNT(*) FROM applications WHERE company_name = ? AND role_name LIKE ? ESCAPE '\\'", (company, pattern))
+        cursor.execute('''
+            SELECT COUNT(*) FROM applications
+            WHERE company_name = ? AND role_name >= ? AND role_name < ?
+        ''', (company, lower, upper))
         count = cursor.fetchone()[0]
         return count
     finally:
         conn.close()
 
+def next_index_for(company, role):
+    """
+    Works out the "(n)" suffix for a new application in one indexed query.
+
+    Returns:
+        None if no application for this company/role exists yet (no suffix needed),
+        otherwise the next free n for "role (n)".
+    """
+    if not role:
+        return None
+    lower, upper = _prefix_bounds(role)
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        # Covered by idx_apps_company_role: no table rows are read.
+        cursor.execute('''
+            SELECT role_name FROM applications
+            WHERE company_name = ? AND role_name >= ? AND role_name < ?
+        ''', (company, lower, upper))
+        names = [row[0] for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+    if role not in names:
+        return None
+
+    # The plain role counts as (1); take the highest existing "role (n)" + 1,
+    # so deleted entries in the middle never cause a clash.
+    highest = 1
+    suffix = re.compile(re.escape(role) + r" \((\d+)\)")
+    for name in names:
+        match = suffix.fullmatch(name)
+        if match:
+            highest = max(highest, int(match.group(1)))
+    return highest + 1
+
 def delete_application(app_id):
     """Deletes an application record from the database."""
     conn = get_db_connection()
@@ -324,32 +545,16 @@ def delete_application(app_id):
         conn.close()
 
 def remove_duplicates():
-    """Removes duplicate records based on folder_path, keeping the one with the lowest ID."""
+    """
+    Removes duplicate records based on folder_path, keeping the one with the lowest ID.
+    Since schema v3 folder_path is UNIQUE, so this only matters for databases
+    written by older builds; it is a single set-based DELETE either way.
+    """
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
-        
-        # Find all folder_paths that appear more than once
-        cursor.execute('''
-            SELECT folder_path, COUNT(*) 
-            FROM applications 
-            GROUP BY folder_path 
-            HAVING COUNT(*) > 1
-        ''')
-        duplicates = cursor.fetchall()
-        
-        removed_count = 0
-        for row in duplicates:
-            path = row['folder_path']
-            # Keep the record with the smallest ID, delete others
-            cursor.execute('''
-                DELETE FROM applications 
-                WHERE folder_path = ? AND id NOT IN (
-                    SELECT MIN(id) FROM applications WHERE folder_path = ?
-                )
-            ''', (path, path))
-            removed_count += cursor.rowcount
-                
+        cursor.execute(DEDUPE_APPLICATIONS_SQL)
+        removed_count = cursor.rowcount
         conn.commit()
         return removed_count
     finally:
@@ -425,25 +630,141 @@ def get_daily_status_counts(start_date=None, end_date=None):
     finally:
         conn.close()
 
-def get_detailed_analytics(start_date=None, end_date=None, progress_callback=None):
+# --- Report breakdowns ---
+# Company/role/status breakdowns can have thousands of rows. With `top_n`, only
+# the N largest rows are returned plus one aggregated "Other (k items)" row;
+# the tail can be fetched on demand with get_analytics_breakdown(offset=N).
+
+BREAKDOWNS = ("by_company", "by_role", "by_status")
+
+# GROUP BY column of the breakdowns counted in SQL (by_role is grouped by
+# category in Python, after the LLM role mapping)
+_BREAKDOWN_COLUMNS = {"by_company": "company_name", "by_status": "status"}
+
+def other_bucket_label(items):
+    """Label of the aggregated tail row, e.g. 'Other (12 items)'."""
+    return f"Other ({items} {'item' if items == 1 else 'items'})"
+
+def _date_filter(start_date, end_date):
+    if start_date and end_date:
+        return " WHERE date(created_at) BETWEEN ? AND ?", [start_date, end_date]
+    return "", []
+
+def _ranked_breakdown_sql(column, base_where):
+    # Ties are broken by name so the top-N cut (and the drill-down offset) is stable.
+    return f"""
+        WITH ranked AS (
+            SELECT name, c, ROW_NUMBER() OVER (ORDER BY c DESC, name) AS rn
+            FROM (SELECT {column} AS name, COUNT(*) AS c FROM applications{base_where} GROUP BY {column})
+        )
+    """
+
+def _sql_breakdown(cursor, breakdown, base_where, params, top_n=None):
+    """Returns (rows, other) where other is {"items", "count"} or None."""
+    ranked = _ranked_breakdown_sql(_BREAKDOWN_COLUMNS[breakdown], base_where)
+    if top_n is None:
+        cursor.execute(f"{ranked} SELECT name, c FROM ranked ORDER BY rn", params)
+        return [tuple(row) for row in cursor.fetchall()], None
+
+    # One round trip: the top rows, plus (NULL, total, item count) for the tail.
+    # The tail is marked by is_tail, not by its NULL name: a real group can be NULL too.
+    # (No HAVING without GROUP BY: SQLite before 3.39 rejects it.)
+    cursor.execute(f"""
+        {ranked}
+        SELECT name, c, rn, 0 AS is_tail FROM ranked WHERE rn <= ?
+        UNION ALL
+        SELECT * FROM (SELECT NULL, SUM(c), COUNT(*) AS items, 1 FROM ranked WHERE rn > ?) WHERE items > 0
+    """, params + [top_n, top_n])
+    rows, other = [], None
+    for name, count, rn, is_tail in sorted(cursor.fetchall(), key=lambda r: (r[3], r[2])):
+        if is_tail:
+            other = {"items": rn, "count": count}
+        else:
+            rows.append((name, count))
+    return rows, other
+
+def _role_category_counts(cursor, base_where, params, progress_callback=None):
+    """Role breakdown by mapped category, largest first (ties by name)."""
+    cursor.execute(f"SELECT role_name, COUNT(*) as c FROM applications{base_where} GROUP BY role_name", params)
+    raw_roles = cursor.fetchall()
+
+    # The embedding engine classifies every uncached title in one batch up front;
+    # the loop below then only reads the cache.
+    from .llm_service import is_embedding_engine
+    if is_embedding_engine():
+        _prefill_role_mappings([role_name for role_name, _ in raw_roles if role_name])
+
+    role_counts = {}
+    total_roles = len(raw_roles)
+    for i, (role_name, count) in enumerate(raw_roles):
+        category = get_mapped_role(role_name)
+        role_counts[category] = role_counts.get(category, 0) + count
+        if progress_callback:
+            progress_callback(i + 1, total_roles, role_name)
+
+    return sorted(role_counts.items(), key=lambda x: (-x[1], x[0]))
+
+def _prefill_role_mappings(role_names):
+    """Classifies and caches all uncached titles with one batched call (see llm_service.classify_roles)."""
+    from .llm_service import classify_roles
+    unmapped = get_unmapped_roles(role_names)
+    if not unmapped:
+        return
+    try:
+        results = classify_roles(unmapped)
+    except Exception as e:
+        print(f"Batch classification failed: {e}")
+        return  # get_mapped_role classifies (or falls back) one by one
+    save_role_classifications((role, *result) for role, result in zip(unmapped, results))
+
+def _bucket_tail(rows, top_n):
+    """Python-side equivalent of the SQL top-N for already sorted rows."""
+    if top_n is None or len(rows) <= top_n:
+        return list(rows), None
+    tail = rows[top_n:]
+    return list(rows[:top_n]), {"items": len(tail), "count": sum(count for _, count in tail)}
+
+def get_analytics_breakdown(breakdown, start_date=None, end_date=None, offset=0, limit=None):
+    """
+    Drill-down for one breakdown ('by_company', 'by_role' or 'by_status'):
+    returns its (name, count) rows ranked like get_detailed_analytics, skipping
+    the first `offset` (pass the top_n used for the report to expand "Other").
+    """
+    if breakdown not in BREAKDOWNS:
+        raise ValueError(f"Unknown breakdown: {breakdown}")
+    base_where, params = _date_filter(start_date, end_date)
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        if breakdown == "by_role":
+            rows = _role_category_counts(cursor, base_where, params)
+            return rows[offset:offset + limit] if limit is not None else rows[offset:]
+        ranked = _ranked_breakdown_sql(_BREAKDOWN_COLUMNS[breakdown], base_where)
+        cursor.execute(f"{ranked} SELECT name, c FROM ranked WHERE rn > ? ORDER BY rn LIMIT ?",
+                       params + [offset, -1 if limit is None else limit])
+        return [tuple(row) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+def get_detailed_analytics(start_date=None, end_date=None, progress_callback=None, top_n=None):
     """
     Returns a detailed drill-down of application stats for the reporting view.
     Includes:
     - Total Count
     - Interviews Secured (Count of apps that have ANY interview logs)
-    - By Company (Top 10)
-    - By Role (Top 10)
+    - By Company
+    - By Role
     - By Status
+
+    top_n (int or dict, optional): Keep only the N largest rows of each breakdown
+    (or {"by_company": N, ...} per breakdown) and append an "Other (k items)" row.
+    metrics["other"][breakdown] then holds {"items", "count", "offset"}.
     """
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
         
-        params = []
-        base_where = ""
-        if start_date and end_date:
-            base_where = " WHERE date(created_at) BETWEEN ? AND ?"
-            params.extend([start_date, end_date])
+        base_where, params = _date_filter(start_date, end_date)
 
         metrics = {
             "total_apps": 0,
@@ -457,7 +778,8 @@ def get_detailed_analytics(start_date=None, end_date=None, progress_callback=Non
             "interview_roles_list": [],
             "by_company": [],
             "by_role": [],
-            "by_status": []
+            "by_status": [],
+            "other": {}  # breakdown -> {"items", "count", "offset"} when truncated by top_n
         }
 
         # 1. Total Applications Count
@@ -486,11 +808,11 @@ def get_detailed_analytics(start_date=None, end_date=None, progress_callback=Non
         
         # 4a. List of OA Roles
         cursor.execute(f"SELECT company_name, role_name FROM applications{base_where} {' AND ' if base_where else ' WHERE '} status = 'OA' ORDER BY company_name ASC", params)
-        metrics["oa_roles_list"] = cursor.fetchall()
+        metrics["oa_roles_list"] = [tuple(row) for row in cursor.fetchall()]
 
         # 4b. List of HR Call Roles
         cursor.execute(f"SELECT company_name, role_name FROM applications{base_where} {' AND ' if base_where else ' WHERE '} status = 'HR Call' ORDER BY company_name ASC", params)
-        metrics["hr_call_roles_list"] = cursor.fetchall()
+        metrics["hr_call_roles_list"] = [tuple(row) for row in cursor.fetchall()]
 
         # 4c. List of specific roles that had interviews
         query_roles_list = f"""
@@ -502,33 +824,27 @@ def get_detailed_analytics(start_date=None, end_date=None, progress_callback=Non
             ORDER BY a.company_name ASC
         """
         cursor.execute(query_roles_list, params)
-        metrics["interview_roles_list"] = cursor.fetchall()
+        metrics["interview_roles_list"] = [tuple(row) for row in cursor.fetchall()]
+
+        if not isinstance(top_n, dict):
+            top_n = {breakdown: top_n for breakdown in BREAKDOWNS}
+
+        def add_breakdown(breakdown, rows, other):
+            if other:
+                other["offset"] = len(rows)
+                rows.append((other_bucket_label(other["items"]), other["count"]))
+                metrics["other"][breakdown] = other
+            metrics[breakdown] = rows
 
         # 5. Frequency Breakdown by Company
-        query_company = f"SELECT company_name, COUNT(*) as c FROM applications{base_where} GROUP BY company_name ORDER BY c DESC"
-        cursor.execute(query_company, params)
-        metrics["by_company"] = cursor.fetchall()
-
-        # 6. Frequency Breakdown by Role Name
-        query_role = f"SELECT role_name, COUNT(*) as c FROM applications{base_where} GROUP BY role_name"
-        cursor.execute(query_role, params)
-        raw_roles = cursor.fetchall()
-        
-        role_counts = {}
-        total_roles = len(raw_roles)
-        for i, (role_name, count) in enumerate(raw_roles):
-            category = get_mapped_role(role_name)
-            role_counts[category] = role_counts.get(category, 0) + count
-            if progress_callback:
-                progress_callback(i + 1, total_roles, role_name)
-            
-        # Convert and sort descending
-        metrics["by_role"] = sorted(role_counts.items(), key=lambda x: x[1], reverse=True)
+        add_breakdown("by_company", *_sql_breakdown(cursor, "by_company", base_where, params, top_n.get("by_company")))
+
+        # 6. Frequency Breakdown by Role Category (mapped in Python, so bucketed here too)
+        roles = _role_category_counts(cursor, base_where, params, progress_callback)
+        add_breakdown("by_role", *_bucket_tail(roles, top_n.get("by_role")))
 
         # 7. Application Status Distribution
-        query_status = f"SELECT status, COUNT(*) as c FROM applications{base_where} GROUP BY status ORDER BY c DESC"
-        cursor.execute(query_status, params)
-        metrics["by_status"] = cursor.fetchall()
+        add_breakdown("by_status", *_sql_breakdown(cursor, "by_status", base_where, params, top_n.get("by_status")))
 
         return metrics
     finally:
@@ -545,20 +861,187 @@ def get_all_role_mappings():
     finally:
         conn.close()
 
+def _role_mapping_filter(search):
+    if not search:
+        return "", []
+    pattern = _like_pattern(search.strip())
+    # LIKE is case-insensitive for ASCII, which is what a search box wants
+    return " WHERE original_role LIKE ? ESCAPE '\\' OR mapped_category LIKE ? ESCAPE '\\'", [pattern, pattern]
+
+def get_role_mappings_page(search=None, offset=0, limit=200, after=None):
+    """
+    One page of role_mappings (ordered by role), optionally filtered by a role/category substring.
+    With `after` (the last role already shown) the page starts after that key instead of
+    at `offset`, so rows inserted meanwhile (e.g. by the classifier) never shift a page.
+    """
+    where, params = _role_mapping_filter(search)
+    if after is not None:
+        where = f" WHERE ({where[len(' WHERE '):]}) AND original_role > ?" if where else " WHERE original_role > ?"
+        params = params + [after]
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT original_role, mapped_category FROM role_mappings{where} "
+                       "ORDER BY original_role ASC LIMIT ? OFFSET ?", params + [limit, offset])
+        return cursor.fetchall()
+    finally:
+        conn.close()
+
+def count_role_mappings(search=None):
+    """Number of role_mappings rows matching `search` (all rows if empty)."""
+    where, params = _role_mapping_filter(search)
+    conn = get_db_connection()
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM role_mappings{where}", params).fetchone()[0]
+    finally:
+        conn.close()
+
 def update_role_mapping(original_role, new_category):
     """Manually updates the category for a specific role."""
+    update_role_mappings({original_role: new_category})
+
+def update_role_mappings(changes):
+    """
+    Writes several manual corrections ({original_role: category}) in one transaction.
+    Manual rows have no model_name, so model invalidation never removes them.
+    Returns the number of rows written.
+    """
+    if not changes:
+        return 0
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO role_mappings (original_role, mapped_category) 
-            VALUES (?, ?) 
-            ON CONFLICT(original_role) DO UPDATE SET mapped_category=excluded.mapped_category
-        ''', (original_role, new_category))
+        cursor.executemany('''
+            INSERT INTO role_mappings (original_role, mapped_category, model_name, prompt_hash, classified_at, source) 
+            VALUES (?, ?, NULL, NULL, CURRENT_TIMESTAMP, 'manual') 
+            ON CONFLICT(original_role) DO UPDATE SET mapped_category=excluded.mapped_category, model_name=NULL,
+                prompt_hash=NULL, classified_at=excluded.classified_at, source='manual'
+        ''', list(changes.items()))
         conn.commit()
+        return len(changes)
     finally:
         conn.close()
     
+# --- Bulk role mapping operations ---
+# Each one is a single set-based statement (executemany for CSV import), so
+# changing thousands of mappings is one transaction and one round trip.
+
+ROLE_MAPPING_CSV_COLUMNS = ["original_role", "mapped_category", "model_name", "source"]
+ROLE_MAPPING_SOURCES = ("llm", "rule", "manual")
+
+def _wildcard_to_like(pattern):
+    """'*' / '?' wildcard pattern (whole title, case-insensitive) -> LIKE pattern."""
+    escaped = pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped.replace("*", "%").replace("?", "_")
+
+def remap_role_mappings(new_category, pattern=None, category=None):
+    """
+    Moves every mapping whose title matches `pattern` ('*' and '?' wildcards,
+    e.g. '*data engineer*') and/or whose current group is `category` to
+    `new_category`. Remapped rows count as manual corrections.
+    Returns the number of rows changed.
+    """
+    if pattern is None and category is None:
+        raise ValueError("remap_role_mappings needs a pattern or a category")
+    conditions, params = [], [new_category]
+    if pattern is not None:
+        conditions.append("original_role LIKE ? ESCAPE '\\'")
+        params.append(_wildcard_to_like(pattern))
+    if category is not None:
+        conditions.append("mapped_category = ?")
+        params.append(category)
+
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute(
+            f"UPDATE role_mappings SET mapped_category = ?, model_name = NULL, prompt_hash = NULL, "
+            f"classified_at = CURRENT_TIMESTAMP, source = 'manual' WHERE {' AND '.join(conditions)}",
+            params)
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        conn.close()
+
+def count_role_mappings_by_model(model_name):
+    """Number of cached mappings produced by `model_name`."""
+    conn = get_db_connection()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM role_mappings WHERE model_name = ?", (model_name,)).fetchone()[0]
+    finally:
+        conn.close()
+
+def invalidate_role_mappings(model_name):
+    """
+    Deletes only the mappings produced by `model_name`, so they are classified
+    again (by the current model) the next time the report runs. Manual
+    corrections and other models' answers are kept. Returns the number deleted.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute("DELETE FROM role_mappings WHERE model_name = ? AND source = 'llm'", (model_name,))
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        conn.close()
+
+def export_role_mappings_csv(path):
+    """Writes every mapping to a CSV file (ROLE_MAPPING_CSV_COLUMNS). Returns the row count."""
+    import csv
+    conn = get_db_connection()
+    try:
+        count = 0
+        # utf-8-sig like the other CSV exports, so Excel reads accents correctly
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f)
+            writer.writerow(ROLE_MAPPING_CSV_COLUMNS)
+            for row in conn.execute(f"SELECT {', '.join(ROLE_MAPPING_CSV_COLUMNS)} FROM role_mappings ORDER BY original_role"):
+                writer.writerow(["" if value is None else value for value in row])
+                count += 1
+        return count
+    finally:
+        conn.close()
+
+def import_role_mappings_csv(path):
+    """
+    Upserts mappings from a CSV file with 'original_role' and 'mapped_category'
+    columns ('model_name' and 'source' optional; rows without a model are
+    manual). Existing titles are overwritten. Everything is written in one
+    transaction. Imported LLM rows carry no prompt hash, so the background
+    classifier re-checks them. Returns the row count.
+    Raises ValueError if a required column is missing.
+    """
+    import csv
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        missing = {"original_role", "mapped_category"} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"CSV is missing column(s): {', '.join(sorted(missing))}")
+        rows = []
+        for row in reader:
+            role = (row.get("original_role") or "").strip()
+            category = (row.get("mapped_category") or "").strip()
+            if not role or not category:
+                continue
+            model = (row.get("model_name") or "").strip() or None
+            source = (row.get("source") or "").strip().lower()
+            if source not in ROLE_MAPPING_SOURCES:
+                source = "llm" if model else "manual"
+            rows.append((role, category, model, source))
+
+    conn = get_db_connection()
+    try:
+        conn.executemany('''
+            INSERT INTO role_mappings (original_role, mapped_category, model_name, prompt_hash, classified_at, source)
+            VALUES (?, ?, ?, NULL, CURRENT_TIMESTAMP, ?)
+            ON CONFLICT(original_role) DO UPDATE SET mapped_category=excluded.mapped_category,
+                model_name=excluded.model_name, prompt_hash=NULL, classified_at=excluded.classified_at,
+                source=excluded.source
+        ''', rows)
+        conn.commit()
+        return len(rows)
+    finally:
+        conn.close()
+
 def clear_all_role_mappings():
     """Clears the mapping cache so the LLM will re-classify all roles next time."""
     conn = get_db_connection()
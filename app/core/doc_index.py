@@ -0,0 +1,199 @@
+import os
+import sqlite3
+
+from .database import get_db_connection
+
+# Cached per-folder document index (table 'document_index', schema v5).
+#
+# For every application folder it remembers which file is the CV, the cover
+# letter and the job description (name, size, mtime), together with the mtime
+# of the folder itself. Creating, deleting or renaming a file inside a folder
+# changes the folder's mtime, so an unchanged folder mtime means the cached
+# entry is still valid and the folder does not have to be listed again.
+# (Editing a file in place does not touch the folder mtime; size/mtime of that
+# file may then be stale, but which file is the CV/JD is still right.)
+#
+# The index is refreshed for every folder during sync_workspace and on demand
+# by refresh_documents(); the batch exporter reads from it instead of walking
+# each folder itself.
+
+DOCUMENT_KINDS = ("cv", "cover_letter", "jd")
+CV_EXTENSIONS = ('.pdf', '.docx', '.doc')
+JD_FILE_NAME = "job_description.txt"
+
+# SQLite limits the number of '?' parameters per statement
+_QUERY_CHUNK = 500
+
+_COLUMNS = ["folder_path", "folder_mtime_ns"] + [
+    f"{kind}_{field}" for kind in DOCUMENT_KINDS for field in ("name", "size", "mtime_ns")]
+
+
+def _file_info(entry):
+    st = entry.stat()  # DirEntry caches it: one stat per candidate, not one per sort comparison
+    return {"name": entry.name, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def classify_folder(folder_path):
+    """
+    Lists an application folder once and picks its documents.
+
+    CV: files containing 'CV' or 'Resume' (.pdf/.docx/.doc) first, then any
+    other PDF; the most recently modified wins a tie. Cover letter: files with
+    'cover' in the name. JD: 'job_description.txt' (created by JALM), else a
+    file with 'job' and 'jd'/'description' in its name. Word/Windows temp files
+    (starting with '~') are skipped, and a file is never picked for two kinds.
+
+    Returns:
+        dict: {"folder_mtime_ns": int, "cv": info|None, "cover_letter": info|None,
+               "jd": info|None} where info is {"name", "size", "mtime_ns"};
+               None if the folder does not exist.
+    """
+    try:
+        folder_mtime_ns = os.stat(folder_path).st_mtime_ns
+        entries = sorted(os.scandir(folder_path), key=lambda e: e.name)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+    cv_candidates = []
+    cover_candidates = []
+    jd = None
+    for entry in entries:
+        if entry.name.startswith("~") or not entry.is_file():
+            continue
+        name_lower = entry.name.lower()
+        suffix = os.path.splitext(name_lower)[1]
+
+        if name_lower == JD_FILE_NAME:
+            jd = entry
+        elif ("jd" in name_lower or "description" in name_lower) and "job" in name_lower:
+            if jd is None:
+                jd = entry
+        elif "cover" in name_lower:
+            cover_candidates.append(entry)
+        elif "cv" in name_lower or "resume" in name_lower:
+            if suffix in CV_EXTENSIONS:
+                cv_candidates.append((10, entry))  # Highest priority
+        elif suffix == '.pdf':
+            cv_candidates.append((5, entry))       # Medium priority
+
+    documents = {"folder_mtime_ns": folder_mtime_ns, "cv": None, "cover_letter": None, "jd": None}
+    if cv_candidates:
+        best = max(cv_candidates, key=lambda c: (c[0], c[1].stat().st_mtime_ns))
+        documents["cv"] = _file_info(best[1])
+    if cover_candidates:
+        documents["cover_letter"] = _file_info(max(cover_candidates, key=lambda e: e.stat().st_mtime_ns))
+    if jd is not None:
+        documents["jd"] = _file_info(jd)
+    return documents
+
+
+def _row_to_documents(row):
+    documents = {"folder_mtime_ns": row["folder_mtime_ns"]}
+    for kind in DOCUMENT_KINDS:
+        name = row[f"{kind}_name"]
+        documents[kind] = None if name is None else {
+            "name": name, "size": row[f"{kind}_size"], "mtime_ns": row[f"{kind}_mtime_ns"]}
+    return documents
+
+
+def _documents_to_row(folder_path, documents):
+    row = [folder_path, documents["folder_mtime_ns"]]
+    for kind in DOCUMENT_KINDS:
+        info = documents[kind] or {}
+        row += [info.get("name"), info.get("size"), info.get("mtime_ns")]
+    return row
+
+
+def _load_cached(conn, folder_paths):
+    cached = {}
+    for i in range(0, len(folder_paths), _QUERY_CHUNK):
+        chunk = folder_paths[i:i + _QUERY_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        for row in conn.execute(f"SELECT * FROM document_index WHERE folder_path IN ({placeholders})", chunk):
+            cached[row["folder_path"]] = row
+    return cached
+
+
+def _save(conn, folders):
+    if not folders:
+        return
+    updates = ", ".join(f"{c} = excluded.{c}" for c in _COLUMNS[1:])
+    conn.executemany(
+        f"INSERT INTO document_index ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))}) "
+        f"ON CONFLICT(folder_path) DO UPDATE SET {updates}, indexed_at = CURRENT_TIMESTAMP",
+        [_documents_to_row(path, documents) for path, documents in folders.items()])
+    conn.commit()
+
+
+def refresh_documents(folder_paths, executor=None):
+    """
+    Returns the documents of every given folder, re-listing only the folders
+    whose mtime differs from the index (or that are not indexed yet).
+
+    Args:
+        folder_paths (iterable): Application folders.
+        executor (Executor, optional): Stale folders are listed through executor.map
+            (useful for a cold index on a slow drive).
+
+    Returns:
+        dict: {folder_path: documents (see classify_folder)}. Folders that do not
+              exist are left out.
+    """
+    folder_paths = list(dict.fromkeys(folder_paths))
+    try:
+        conn = get_db_connection()
+    except sqlite3.Error:
+        conn = None  # No usable database: still works, just without the cache
+
+    try:
+        cached = {}
+        if conn is not None:
+            try:
+                cached = _load_cached(conn, folder_paths)
+            except sqlite3.Error:
+                conn.close()
+                conn = None
+
+        result = {}
+        stale = []
+        for path in folder_paths:
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue  # Missing folder
+            row = cached.get(path)
+            if row is not None and row["folder_mtime_ns"] == mtime_ns:
+                result[path] = _row_to_documents(row)
+            else:
+                stale.append(path)
+
+        scanned = executor.map(classify_folder, stale) if executor else map(classify_folder, stale)
+        fresh = {path: documents for path, documents in zip(stale, scanned) if documents is not None}
+        result.update(fresh)
+
+        if conn is not None:
+            try:
+                _save(conn, fresh)
+            except sqlite3.Error:
+                pass  # e.g. database busy: the index is only a cache
+        return result
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+def get_documents(folder_path):
+    """Documents of a single folder (see classify_folder), or None if it does not exist."""
+    return refresh_documents([folder_path]).get(folder_path)
+
+
+def forget_orphaned_documents():
+    """Drops index entries of folders that no longer belong to an application. Returns the count."""
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute(
+            "DELETE FROM document_index WHERE folder_path NOT IN (SELECT folder_path FROM applications)")
+        conn.commit()
+        return cursor.rowcount
+    finally:
+        conn.close()
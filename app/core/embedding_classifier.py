@@ -0,0 +1,234 @@
+import hashlib
+import json
+import re
+import sqlite3
+import time
+import urllib.error
+import urllib.request
+import zlib
+
+import numpy as np
+
+from .config_mgr import get_config_value
+from .constants import CATEGORIES
+from .database import get_db_connection
+
+# Embedding-based role classifier (alternative to zero-shot generation).
+#
+# Every title is embedded once and the vector is cached in SQLite (table
+# 'role_embeddings', schema v8) as a float32 blob. Each category has a
+# prototype vector (its name plus a few typical words); a title gets the
+# category with the highest cosine similarity. Scoring a whole batch of
+# titles is a single matrix multiply: (titles x dim) @ (dim x categories).
+#
+# Vectors come from Ollama's /api/embed endpoint (setting 'ollama_embed_model',
+# e.g. nomic-embed-text). Set it to 'local', or run without Ollama, to use the
+# built-in hashed word / character-trigram vectorizer instead. Vectors of
+# different models are cached separately and never compared with each other.
+
+# Settings (workspace config; the engine switch itself is llm_service.ENGINE_KEY)
+EMBED_MODEL_KEY = "ollama_embed_model"
+DEFAULT_EMBED_MODEL = "nomic-embed-text"
+LOCAL_MODEL = "local"                 # Setting value forcing the built-in vectorizer
+
+# Cache key of the built-in vectorizer (bump if its features change)
+LOCAL_VECTORIZER = "local-hash-v1"
+LOCAL_DIM = 1024
+
+EMBED_BATCH_SIZE = 64   # Titles per /api/embed request
+EMBED_TIMEOUT = 60
+# Built-in vectorizer: titles sharing (almost) nothing with any prototype are
+# 'Other'. Model embeddings have no common scale, so they always take the best match.
+LOCAL_MIN_SIMILARITY = 0.25
+_QUERY_CHUNK = 500      # SQLite limits the number of '?' parameters per statement
+# After Ollama failed to embed, the built-in vectorizer is used (and reported by
+# get_identity) for this long before Ollama is tried again.
+FALLBACK_RETRY_SECONDS = 300
+
+_unavailable = {}       # Ollama embedding model -> time.monotonic() of its last failure
+
+# Typical words per category; they make the prototypes more than a bare name.
+CATEGORY_DESCRIPTIONS = {
+    "Software Engineer": "developer programmer backend frontend full stack web mobile qa java python",
+    "Data Engineer": "etl pipeline spark big data warehouse",
+    "Data Scientist": "statistics modelling research",
+    "Data Analyst": "bi business intelligence reporting dashboards sql",
+    "Analyst - other": "business financial risk operations",
+    "Graduate Program": "grad intern internship trainee entry level",
+    "Machine Learning Engineer": "ml ai deep learning mlops",
+    "DevOps / Infrastructure": "devops cloud site reliability sre platform kubernetes systems",
+    "Product Manager": "product owner pm roadmap",
+    "UI/UX Designer": "user experience interface product design",
+    "Cybersecurity": "security penetration tester soc",
+    "IT Support": "helpdesk technician service desk administrator specialist",
+    "Sales / Marketing": "account executive business development growth",
+    "Other": "",
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def configured_backend():
+    """Model whose vectors are wanted: an Ollama embedding model or LOCAL_VECTORIZER."""
+    model = get_config_value(EMBED_MODEL_KEY, DEFAULT_EMBED_MODEL) or DEFAULT_EMBED_MODEL
+    return LOCAL_VECTORIZER if model == LOCAL_MODEL else model
+
+
+def active_backend():
+    """
+    Backend that currently answers: the configured one, or LOCAL_VECTORIZER
+    while a recent Ollama failure is within FALLBACK_RETRY_SECONDS.
+    """
+    backend = configured_backend()
+    failed_at = _unavailable.get(backend)
+    if failed_at is not None and time.monotonic() - failed_at < FALLBACK_RETRY_SECONDS:
+        return LOCAL_VECTORIZER
+    return backend
+
+
+def prototype_texts():
+    return [f"{c} {CATEGORY_DESCRIPTIONS.get(c, '')}".strip() for c in CATEGORIES]
+
+
+def get_prototype_hash():
+    """Fingerprint of the prototypes; recorded as the prompt_hash of embedding answers."""
+    text = "embedding\n" + "\n".join(prototype_texts())
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def get_identity():
+    """
+    (model_name, prompt_hash) recorded for answers of the backend that currently
+    answers. During an Ollama outage that is the built-in vectorizer, so its
+    fallback answers are not stale (and re-embedded) on every re-warm pass.
+    """
+    return f"embed:{active_backend()}", get_prototype_hash()
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def local_vectors(texts, dim=LOCAL_DIM):
+    """
+    Built-in vectorizer: hashed words plus character trigrams ("engineer" ~ "engineering"),
+    L2-normalized. Deterministic across runs (crc32, not Python's salted hash).
+    """
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in _WORD.findall(text.lower()):
+            matrix[row, zlib.crc32(word.encode()) % dim] += 1.0
+            padded = f"#{word}#"
+            for i in range(len(padded) - 2):
+                matrix[row, zlib.crc32(padded[i:i + 3].encode()) % dim] += 0.5
+    return _normalize(matrix)
+
+
+def ollama_vectors(texts, model):
+    """Embeds `texts` with an Ollama model (one request per EMBED_BATCH_SIZE texts)."""
+    from .llm_service import ollama_url
+    rows = []
+    for i in range(0, len(texts), EMBED_BATCH_SIZE):
+        data = json.dumps({"model": model, "input": texts[i:i + EMBED_BATCH_SIZE]}).encode("utf-8")
+        req = urllib.request.Request(ollama_url("/api/embed"), data=data,
+                                     headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=EMBED_TIMEOUT) as response:
+            embeddings = json.loads(response.read().decode("utf-8")).get("embeddings") or []
+        if len(embeddings) != len(texts[i:i + EMBED_BATCH_SIZE]):
+            raise ValueError(f"{model} returned {len(embeddings)} embeddings for {len(texts[i:i + EMBED_BATCH_SIZE])} texts")
+        rows.extend(embeddings)
+    return _normalize(np.asarray(rows, dtype=np.float32))
+
+
+def _compute(texts, backend):
+    return local_vectors(texts) if backend == LOCAL_VECTORIZER else ollama_vectors(texts, backend)
+
+
+def embed(texts, backend):
+    """
+    Vectors (rows, float32, unit length) of `texts` for `backend`, computing
+    and caching only the ones not in role_embeddings yet.
+    """
+    texts = list(texts)
+    unique = list(dict.fromkeys(texts))
+    vectors = {}
+    try:
+        conn = get_db_connection()
+    except sqlite3.Error:
+        conn = None  # No usable database: still works, just without the cache
+
+    try:
+        if conn is not None:
+            for i in range(0, len(unique), _QUERY_CHUNK):
+                chunk = unique[i:i + _QUERY_CHUNK]
+                cursor = conn.execute(
+                    f"SELECT text, dim, vector FROM role_embeddings WHERE model = ? "
+                    f"AND text IN ({','.join('?' * len(chunk))})", [backend] + chunk)
+                for text, dim, blob in cursor:
+                    vectors[text] = np.frombuffer(blob, dtype="<f4", count=dim)
+
+        missing = [t for t in unique if t not in vectors]
+        if missing:
+            computed = _compute(missing, backend)
+            vectors.update(zip(missing, computed))
+            if conn is not None:
+                try:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO role_embeddings (model, text, dim, vector) VALUES (?, ?, ?, ?)",
+                        [(backend, t, v.shape[0], v.astype("<f4").tobytes()) for t, v in zip(missing, computed)])
+                    conn.commit()
+                except sqlite3.Error:
+                    pass  # e.g. database busy: the vectors are only a cache
+    finally:
+        if conn is not None:
+            conn.close()
+
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.vstack([vectors[t] for t in texts])
+
+
+def score(title_vectors, prototype_vectors):
+    """Category index and cosine similarity of the best prototype for every title (one matmul)."""
+    similarities = title_vectors @ prototype_vectors.T
+    best = similarities.argmax(axis=1)
+    return best, similarities[np.arange(len(best)), best]
+
+
+def classify_titles(titles, backend=None):
+    """
+    Classifies many titles at once.
+
+    Falls back to the built-in vectorizer if Ollama cannot embed (not running,
+    model not pulled, ...).
+
+    Returns:
+        tuple: ({title: category}, model_name, prompt_hash) where model_name is
+               'embed:<backend actually used>'.
+    """
+    titles = list(dict.fromkeys(titles))
+    backend = backend or active_backend()
+    if not titles:
+        return {}, f"embed:{backend}", get_prototype_hash()
+
+    try:
+        prototypes = embed(prototype_texts(), backend)
+        vectors = embed(titles, backend)
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        if backend == LOCAL_VECTORIZER:
+            raise
+        print(f"[Embeddings] {backend} unavailable ({e}); using the built-in vectorizer")
+        _unavailable[backend] = time.monotonic()
+        backend = LOCAL_VECTORIZER
+        prototypes = embed(prototype_texts(), backend)
+        vectors = embed(titles, backend)
+
+    best, similarity = score(vectors, prototypes)
+    threshold = LOCAL_MIN_SIMILARITY if backend == LOCAL_VECTORIZER else -1.0
+    result = {
+        title: CATEGORIES[index] if sim >= threshold else "Other"
+        for title, index, sim in zip(titles, best.tolist(), similarity.tolist())
+    }
+    return result, f"embed:{backend}", get_prototype_hash()
@@ -111,10 +111,43 @@ def open_folder(path):
     else:
         subprocess.run(["xdg-open", path])
 
+def read_application_folder(role_dir, company_name=None):
+    """
+    Reads the metadata of a single 'Company/Role' folder.
+    Performs 'Status Discovery' by checking for key files (like interviews.txt).
+    Returns None if the folder no longer exists.
+    """
+    role_dir = Path(role_dir)
+    if not role_dir.is_dir():
+        return None
+
+    # Check for indicators of application status on disk
+    has_interviews = (role_dir / "interviews.txt").exists()
+
+    # Read .jalm_id if it exists
+    jalm_id = None
+    id_file = role_dir / ".jalm_id"
+    if id_file.exists():
+        try:
+            with open(id_file, "r", encoding="utf-8") as f:
+                content = f.read().strip()
+                if content.isdigit():
+                    jalm_id = int(content)
+        except Exception:
+            pass
+
+    return {
+        'company': company_name if company_name is not None else role_dir.parent.name,
+        'role': role_dir.name,
+        'path': str(role_dir.absolute()),
+        'created_at': get_folder_creation_time(role_dir),
+        'has_interviews': has_interviews,
+        'jalm_id': jalm_id
+    }
+
 def scan_for_existing_applications(root_path):
     """
     Scans the root path for existing Company/Role folder structures.
-    Performs 'Status Discovery' by checking for key files (like interviews.txt).
     Returns a list of application metadata including a 'has_interviews' flag.
     """
     root = Path(root_path)
@@ -127,29 +160,9 @@ def scan_for_existing_applications(root_path):
         if company_dir.is_dir():
             for role_dir in company_dir.iterdir():
                 if role_dir.is_dir():
-                    # Check for indicators of application status on disk
-                    has_interviews = (role_dir / "interviews.txt").exists()
-                    
-                    # Read .jalm_id if it exists
-                    jalm_id = None
-                    id_file = role_dir / ".jalm_id"
-                    if id_file.exists():
-                        try:
-                            with open(id_file, "r", encoding="utf-8") as f:
-                                content = f.read().strip()
-                                if content.isdigit():
-                                    jalm_id = int(content)
-                        except Exception:
-                            pass
-
-                    found_apps.append({
-                        'company': company_dir.name,
-                        'role': role_dir.name,
-                        'path': str(role_dir.absolute()),
-                        'created_at': get_folder_creation_time(role_dir),
-                        'has_interviews': has_interviews,
-                        'jalm_id': jalm_id
-                    })
+                    app = read_application_folder(role_dir, company_dir.name)
+                    if app:
+                        found_apps.append(app)
     return found_apps
 
 def append_interview_note(folder_path, sequence, note):
@@ -0,0 +1,441 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from . import sync_mgr
+
+# Real-time folder watcher (pure Python).
+# This is the in-process counterpart of the .NET SmartWatcher. It is used when
+# JALM.Service.exe is not available (e.g. on Linux/macOS), so that a new
+# 'Company/Role' folder shows up in the database without a full rescan.
+#
+#   Backend (inotify or polling)  ->  raw events ('created' / 'deleted' / 'moved')
+#   FolderWatcher                 ->  debounces them per path (500ms, like SmartWatcher)
+#   sync_mgr                      ->  single-folder upsert / rename / delete in the DB
+
+CREATED = "created"
+DELETED = "deleted"
+MOVED = "moved"
+RESCAN = "rescan"
+
+# Same coalescing window as the .NET SmartWatcher (_debounceMs).
+DEFAULT_DEBOUNCE = 0.5
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+class PollingBackend:
+    """
+    Portable fallback: snapshots the Company and Role folders every
+    `interval` seconds and diffs the snapshots. Folders that disappear and
+    reappear with the same inode are reported as moves (renames).
+    """
+    def __init__(self, root, emit, interval=DEFAULT_POLL_INTERVAL):
+        self.root = root
+        self.emit = emit
+        self.interval = interval
+        self._snapshot = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def snapshot(self):
+        """Returns {path: (device, inode)} for every Company and Role folder."""
+        result = {}
+        try:
+            companies = list(os.scandir(self.root))
+        except OSError:
+            return result
+        for company in companies:
+            if not company.is_dir(follow_symlinks=False):
+                continue
+            result[company.path] = self._identity(company)
+            try:
+                roles = list(os.scandir(company.path))
+            except OSError:
+                continue
+            for role in roles:
+                if role.is_dir(follow_symlinks=False):
+                    result[role.path] = self._identity(role)
+        return result
+
+    @staticmethod
+    def _identity(entry):
+        try:
+            st = entry.stat(follow_symlinks=False)
+            return (st.st_dev, st.st_ino)
+        except OSError:
+            return None
+
+    def poll_once(self):
+        """Takes a new snapshot and emits the differences to the previous one."""
+        new = self.snapshot()
+        old = self._snapshot
+        self._snapshot = new
+        if old is None:
+            return
+
+        added = set(new) - set(old)
+        removed = set(old) - set(new)
+
+        # Rename detection: same (device, inode) under a different path.
+        added_by_id = {new[p]: p for p in added if new[p] is not None}
+        moves = {}
+        for path in removed:
+            target = added_by_id.get(old[path])
+            if target is not None:
+                moves[path] = target
+        created = added - set(moves.values())
+        deleted = removed - set(moves)
+
+        # Only report the top-most folder: a renamed company also "moves"
+        # all of its roles, and a deleted company also "deletes" them.
+        for old_path, new_path in sorted(moves.items()):
+            parent = os.path.dirname(old_path)
+            if moves.get(parent) == os.path.dirname(new_path):
+                continue
+            self.emit(MOVED, new_path, old_path)
+        for path in sorted(created):
+            if os.path.dirname(path) not in created:
+                self.emit(CREATED, path)
+        for path in sorted(deleted):
+            if os.path.dirname(path) not in deleted:
+                self.emit(DELETED, path)
+
+    def start(self):
+        self._snapshot = self.snapshot()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="jalm-watch-poll", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll_once()
+            except Exception as e:
+                print(f"Folder watcher poll failed: {e}")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._thread = None
+
+
+class InotifyBackend:
+    """
+    Linux backend using inotify through ctypes (no extra dependency).
+    Watches the root and every Company folder, which is enough to see Company
+    and Role folders being created, deleted and renamed.
+    """
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR
+    EVENT_HEADER = struct.Struct("iIII")
+
+    # A MOVED_FROM without a matching MOVED_TO after this long means the
+    # folder left the watched tree.
+    MOVE_PAIR_WINDOW = 0.1
+
+    def __init__(self, root, emit):
+        self.root = root
+        self.emit = emit
+        self._libc = self._load_libc()
+        self._fd = None
+        self._wd_paths = {}
+        self._pending_moves = {}  # cookie -> (old_path, time)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _load_libc():
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        # Raises AttributeError on platforms without inotify.
+        libc.inotify_init1
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+
+    @staticmethod
+    def is_available():
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            InotifyBackend._load_libc()
+            return True
+        except (OSError, AttributeError):
+            return False
+
+    def _add_watch(self, path):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self.WATCH_MASK)
+        if wd < 0:
+            return None
+        # Re-adding a watch for a renamed folder returns the same wd, so this
+        # also keeps the wd -> path map current after renames.
+        self._wd_paths[wd] = path
+        return wd
+
+    def _remove_watch_for(self, path):
+        for wd, watched in list(self._wd_paths.items()):
+            if watched == path:
+                self._libc.inotify_rm_watch(self._fd, wd)
+                self._wd_paths.pop(wd, None)
+
+    def start(self):
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._root_wd = self._add_watch(self.root)
+        if self._root_wd is None:
+            os.close(self._fd)
+            raise OSError(ctypes.get_errno(), f"Cannot watch {self.root}")
+        for entry in os.scandir(self.root):
+            if entry.is_dir(follow_symlinks=False):
+                self._add_watch(entry.path)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="jalm-watch-inotify", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([self._fd], [], [], self.MOVE_PAIR_WINDOW)
+                if ready:
+                    try:
+                        data = os.read(self._fd, 64 * 1024)
+                    except BlockingIOError:
+                        data = b""
+                    self._handle_buffer(data)
+                self._flush_unpaired_moves()
+        except Exception as e:
+            print(f"Folder watcher (inotify) stopped: {e}")
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def _handle_buffer(self, data):
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            self._handle_event(wd, mask, cookie, os.fsdecode(name))
+
+    def _handle_event(self, wd, mask, cookie, name):
+        if mask & self.IN_Q_OVERFLOW:
+            # The kernel dropped events; only a full rescan is reliable now.
+            self.emit(RESCAN, self.root)
+            return
+        if mask & self.IN_IGNORED:
+            self._wd_paths.pop(wd, None)
+            return
+        if not mask & self.IN_ISDIR:
+            return  # Files (CVs, notes, .jalm_id) are not tracked here
+
+        parent = self._wd_paths.get(wd)
+        if parent is None:
+            return
+        path = os.path.join(parent, name)
+        at_root = wd == self._root_wd
+
+        if mask & self.IN_CREATE:
+            if at_root:
+                self._add_watch(path)
+            self.emit(CREATED, path)
+        elif mask & self.IN_DELETE:
+            self.emit(DELETED, path)
+        elif mask & self.IN_MOVED_FROM:
+            self._pending_moves[cookie] = (path, time.monotonic())
+        elif mask & self.IN_MOVED_TO:
+            if at_root:
+                self._add_watch(path)
+            old = self._pending_moves.pop(cookie, None)
+            if old is not None:
+                self.emit(MOVED, path, old[0])
+            else:
+                # Moved in from outside the workspace.
+                self.emit(CREATED, path)
+
+    def _flush_unpaired_moves(self):
+        now = time.monotonic()
+        for cookie, (path, when) in list(self._pending_moves.items()):
+            if now - when >= self.MOVE_PAIR_WINDOW:
+                # Moved out of the workspace: same as a delete.
+                del self._pending_moves[cookie]
+                self._remove_watch_for(path)
+                self.emit(DELETED, path)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._thread = None
+
+
+class FolderWatcher:
+    """
+    Watches the workspace root and keeps the database in sync one folder at a time.
+
+    Events are coalesced per path: a new event for the same folder within
+    `debounce` seconds replaces the pending one, mirroring SmartWatcher.DebounceEvent.
+    Changes are applied one at a time on timer threads.
+    """
+    def __init__(self, root, on_change=None, debounce=DEFAULT_DEBOUNCE,
+                 backend="auto", poll_interval=DEFAULT_POLL_INTERVAL):
+        # on_change(kind, path) is called from a worker thread after the DB was updated.
+        # root may be None (no workspace yet): start() then does nothing until restart(root).
+        self.root = os.path.abspath(root) if root else None
+        self.on_change = on_change
+        self.debounce = debounce
+        self.backend_name = backend
+        self.poll_interval = poll_interval
+        self.backend = None
+        self._pending = {}  # path -> (timer, event)
+        self._pending_lock = threading.Lock()
+        self._process_lock = threading.Lock()
+
+    def _create_backend(self):
+        if self.backend_name == "inotify" or (self.backend_name == "auto" and InotifyBackend.is_available()):
+            return InotifyBackend(self.root, self._queue_event)
+        return PollingBackend(self.root, self._queue_event, self.poll_interval)
+
+    def start(self):
+        """Starts watching. Returns False if there is no root or it does not exist."""
+        self.stop()
+        if not self.root:
+            return False
+        if not os.path.isdir(self.root):
+            print(f"Cannot start folder watcher: '{self.root}' does not exist.")
+            return False
+        self.backend = self._create_backend()
+        try:
+            self.backend.start()
+        except OSError as e:
+            # e.g. inotify watch limit reached: fall back to polling.
+            print(f"Folder watcher falling back to polling: {e}")
+            self.backend = PollingBackend(self.root, self._queue_event, self.poll_interval)
+            self.backend.start()
+        return True
+
+    def stop(self):
+        """Stops the backend and drops any pending (not yet applied) events."""
+        if self.backend is not None:
+            self.backend.stop()
+            self.backend = None
+        with self._pending_lock:
+            for timer, _ in self._pending.values():
+                timer.cancel()
+            self._pending.clear()
+
+    def restart(self, root):
+        """Switches to a new root (used when the active root changes)."""
+        self.stop()
+        self.root = os.path.abspath(root)
+        return self.start()
+
+    @property
+    def is_running(self):
+        return self.backend is not None
+
+    # --- Debouncing ---
+
+    def _queue_event(self, kind, path, old_path=None):
+        event = (kind, path, old_path)
+        with self._pending_lock:
+            previous = self._pending.pop(path, None)
+            if previous is not None:
+                previous[0].cancel()  # Stop the previous timer
+                # Keep the rename information if a 'moved' is followed by more
+                # events for the same folder, otherwise the old record would be orphaned.
+                if previous[1][0] == MOVED and kind == CREATED:
+                    event = previous[1]
+            timer = threading.Timer(self.debounce, self._fire, args=(path, event))
+            timer.daemon = True
+            self._pending[path] = (timer, event)
+        timer.start()
+
+    def _fire(self, path, event):
+        with self._pending_lock:
+            current = self._pending.get(path)
+            if current is None or current[1] is not event:
+                return  # Superseded by a newer event
+            del self._pending[path]
+        self._process(event)
+
+    def flush(self):
+        """Applies every pending event immediately (used by tests and on shutdown)."""
+        with self._pending_lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for timer, event in pending:
+            timer.cancel()
+            self._process(event)
+
+    # --- Applying events ---
+
+    def _process(self, event):
+        kind, path, old_path = event
+        with self._process_lock:
+            try:
+                if kind == RESCAN:
+                    sync_mgr.sync_workspace(self.root)
+                elif kind == MOVED:
+                    if os.path.relpath(old_path, self.root).startswith(os.pardir):
+                        sync_mgr.sync_paths([path], self.root)  # Moved in from outside
+                    else:
+                        # Re-point the records first so ids and notes survive,
+                        # then refresh company/role names from the new location.
+                        sync_mgr.rename_folder(old_path, path)
+                        sync_mgr.sync_paths([path], self.root)
+                else:
+                    # Created or deleted: sync_paths upserts what exists and
+                    # removes what is gone.
+                    sync_mgr.sync_paths([path], self.root)
+            except Exception as e:
+                print(f"Folder watcher failed to apply {kind} for '{path}': {e}")
+                return
+
+        if self.on_change:
+            try:
+                self.on_change(kind, path)
+            except Exception:
+                pass
+
+
+def watch_active_root(on_change=None, **kwargs):
+    """
+    Creates and starts a FolderWatcher for the active root, and restarts it
+    whenever the active root changes (like SmartWatcher's OnConfigChanged).
+    Without an active root (e.g. while the setup wizard is open) nothing is
+    watched until one is set.
+    """
+    from .config_mgr import get_active_root, add_root_listener
+
+    watcher = FolderWatcher(get_active_root(), on_change=on_change, **kwargs)
+
+    def on_root_changed(new_root):
+        # Listeners can fire on a watcher thread, which cannot join itself.
+        if new_root:
+            threading.Thread(target=watcher.restart, args=(new_root,), daemon=True).start()
+        else:
+            threading.Thread(target=watcher.stop, daemon=True).start()
+
+    add_root_listener(on_root_changed)
+    if watcher.root:
+        watcher.start()
+    return watcher
@@ -1,18 +1,67 @@
+import hashlib
+import os
+import re
 import urllib.request
 import urllib.error
 import json
-from .config_mgr import load_config, save_config
+from .config_mgr import load_config, save_config, get_config_value
 from .constants import CATEGORIES
 
-OLLAMA_API_URL = "http://localhost:11434/api/generate"
+# Same variable the Ollama CLI uses ("host:port" or a full URL)
+OLLAMA_HOST_ENV = "OLLAMA_HOST"
+DEFAULT_OLLAMA_HOST = "http://localhost:11434"
+
+# Seconds to wait for Ollama (connect + each read) before giving up on a title
+OLLAMA_TIMEOUT = 60
+
+# Upper bound on generated tokens per title. The longest category is well
+# under this; a model that starts explaining itself is cut off here.
+CLASSIFY_NUM_PREDICT = 16
+
+# Config key: classification engine
+ENGINE_KEY = "classifier_engine"
+ENGINE_GENERATE = "generate"    # Zero-shot prompt per title (default)
+ENGINE_EMBEDDING = "embedding"  # Nearest category prototype by embedding (numpy, batched)
+
+# Config key: ask Ollama for {"category": <one of CATEGORIES>} (JSON-schema
+# constrained output, Ollama 0.5+) instead of free text.
+STRUCTURED_OUTPUT_KEY = "ollama_structured_output"
+_STRUCTURED_ANSWER = re.compile(r'"category"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# Where a cached role mapping came from (role_mappings.source)
+SOURCE_LLM = "llm"        # Answered by an Ollama model (model_name + prompt_hash recorded)
+SOURCE_RULE = "rule"      # Title is itself a category: no model needed
+SOURCE_MANUAL = "manual"  # Set by the user; never overwritten automatically
+
+PROMPT_TEMPLATE = """You are an expert technical recruiter matching job titles to standardized broad reporting categories.
+You MUST map the given job title to EXACTLY ONE of the following predefined categories. Do not invent new categories.
+
+Allowed Categories: 
+{categories_text}
+
+Reply with ONLY the exact string from the Allowed Categories list. Do not include any explanation, punctuation, or extra words.
+
+Title: {role_name}
+Category:"""
+
+def ollama_url(path):
+    """Full URL of an Ollama API endpoint, honouring the OLLAMA_HOST environment variable."""
+    host = os.environ.get(OLLAMA_HOST_ENV, "").strip() or DEFAULT_OLLAMA_HOST
+    if "://" not in host:
+        host = f"http://{host}"
+    return host.rstrip("/") + path
+
+def is_embedding_engine():
+    """True if roles are classified by embedding similarity (embedding_classifier.py) instead of a prompt."""
+    return get_config_value(ENGINE_KEY, ENGINE_GENERATE) == ENGINE_EMBEDDING
 
 def get_current_model():
-    return load_config().get("ollama_model", "llama3.2")
+    return get_config_value("ollama_model", "llama3.2")
 
 def get_available_models():
     """Fetches a list of available models from the local Ollama instance."""
     try:
-        req = urllib.request.Request("http://localhost:11434/api/tags")
+        req = urllib.request.Request(ollama_url("/api/tags"))
         with urllib.request.urlopen(req, timeout=5) as response:
             result = json.loads(response.read().decode('utf-8'))
             models = [model.get('name') for model in result.get('models', [])]
@@ -22,59 +71,175 @@ def get_available_models():
         return ["llama3.2", "mistral", "phi3"]
 
 
+def get_prompt_hash() -> str:
+    """
+    Short fingerprint of the prompt and category list. Cached mappings made with
+    a different prompt (or categories) are stale and get re-classified.
+    """
+    text = PROMPT_TEMPLATE + "\n" + "\n".join(CATEGORIES)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+def match_category_rule(role_name: str):
+    """Returns the category if the title already is one (case-insensitive), else None."""
+    wanted = role_name.strip().casefold()
+    return next((c for c in CATEGORIES if c.casefold() == wanted), None)
+
+def get_classifier_identity():
+    """
+    (model_name, prompt_hash) that fresh answers of the configured engine are
+    recorded with. Cached LLM answers with another identity are stale.
+    """
+    if is_embedding_engine():
+        from .embedding_classifier import get_identity
+        return get_identity()
+    return get_current_model(), get_prompt_hash()
+
+def classify_role(role_name: str, model_name: str = None):
+    """
+    Classifies one title for the cache. Raises (URLError, ValueError, ...) if the model gave no answer.
+    Uses the embedding engine instead of generation if it is configured (and no model is given).
+
+    Returns:
+        tuple: (category, source, model_name, prompt_hash); model/hash are None for rule matches.
+    """
+    return classify_roles([role_name], model_name)[0]
+
+def classify_roles(role_names, model_name: str = None):
+    """
+    Batch version of classify_role (same order). With the embedding engine all
+    titles are scored together in one matrix multiply.
+    """
+    results = [None] * len(role_names)
+    pending = []
+    for i, role_name in enumerate(role_names):
+        category = match_category_rule(role_name)
+        if category:
+            results[i] = (category, SOURCE_RULE, None, None)
+        else:
+            pending.append(i)
+    if not pending:
+        return results
+
+    if model_name is None and is_embedding_engine():
+        from .embedding_classifier import classify_titles
+        categories, embed_model, prototype_hash = classify_titles([role_names[i] for i in pending])
+        for i in pending:
+            results[i] = (categories[role_names[i]], SOURCE_LLM, embed_model, prototype_hash)
+        return results
+
+    model_name = model_name or get_current_model()
+    for i in pending:
+        results[i] = (request_category(role_names[i], model_name), SOURCE_LLM, model_name, get_prompt_hash())
+    return results
+
 def classify_job_title(role_name: str, model_name: str = None) -> str:
     """
     Sends a zero-shot prompt to the local Ollama instance to categorize the job title.
+    Falls back to the title-cased role name if Ollama gives no answer.
     """
-    if not model_name:
-        model_name = get_current_model()
+    try:
+        return request_category(role_name, model_name)
+    except urllib.error.URLError as e:
+        print(f"\n[LLM Error] Ollama is not running or unreachable: {e}")
+        return role_name.title()
+    except Exception as e:
+        print(f"\n[LLM Error] Error calling Ollama: {e}")
+        return role_name.title()
 
-    categories_text = "\n".join([f"- {c}" for c in CATEGORIES])
-    
-    prompt = f"""You are an expert technical recruiter matching job titles to standardized broad reporting categories.
-You MUST map the given job title to EXACTLY ONE of the following predefined categories. Do not invent new categories.
+def category_schema():
+    """JSON schema for Ollama's `format` option: an object whose 'category' is one of CATEGORIES."""
+    return {
+        "type": "object",
+        "properties": {"category": {"type": "string", "enum": list(CATEGORIES)}},
+        "required": ["category"],
+    }
 
-Allowed Categories: 
-{categories_text}
+def _clean_answer(text):
+    # Additional safety cleanup in case the LLM ignored instructions
+    return text.strip().splitlines()[0].strip(" \t\"'.`") if text.strip() else ""
 
-Reply with ONLY the exact string from the Allowed Categories list. Do not include any explanation, punctuation, or extra words.
+def match_streamed_category(text, structured=False):
+    """
+    Returns the category once the partial answer `text` names one unambiguously, else None.
+    (In free-text mode "Data" is not enough: it could still become "Data Engineer".)
+    """
+    if structured:
+        match = _STRUCTURED_ANSWER.search(text)
+        if not match:
+            return None
+        wanted = json.loads(f'"{match.group(1)}"').casefold()
+        return next((c for c in CATEGORIES if c.casefold() == wanted), match.group(1))
 
-Title: {role_name}
-Category:"""
+    answer = _clean_answer(text).casefold()
+    category = next((c for c in CATEGORIES if c.casefold() == answer), None)
+    if category is None:
+        return None
+    if "\n" not in text.strip() and any(
+            c.casefold().startswith(answer) and c.casefold() != answer for c in CATEGORIES):
+        return None  # A longer category could still follow
+    return category
+
+def request_category(role_name: str, model_name: str = None, structured: bool = None) -> str:
+    """
+    Asks Ollama for the category of one title. Raises on any failure (no fallback).
+
+    The answer is streamed and the connection is closed as soon as it names a
+    category, so the model stops generating (at most CLASSIFY_NUM_PREDICT tokens anyway).
+    With `structured` (default: the 'ollama_structured_output' setting) the
+    answer is constrained to CATEGORIES by a JSON schema.
+    """
+    if not model_name:
+        model_name = get_current_model()
+    if structured is None:
+        structured = bool(get_config_value(STRUCTURED_OUTPUT_KEY, False))
+
+    categories_text = "\n".join([f"- {c}" for c in CATEGORIES])
+    prompt = PROMPT_TEMPLATE.format(categories_text=categories_text, role_name=role_name)
 
     payload = {
         "model": model_name,
         "prompt": prompt,
-        "stream": False,
+        "stream": True,
         "options": {
-            "temperature": 0.0 # Strict answers only
+            "temperature": 0.0, # Strict answers only
+            "num_predict": CLASSIFY_NUM_PREDICT * (4 if structured else 1)  # JSON needs a few more tokens
         }
     }
+    if structured:
+        payload["format"] = category_schema()
     
     data = json.dumps(payload).encode('utf-8')
-    req = urllib.request.Request(OLLAMA_API_URL, data=data, headers={"Content-Type": "application/json"})
+    req = urllib.request.Request(ollama_url("/api/generate"), data=data, headers={"Content-Type": "application/json"})
     
     print(f"[LLM] Asking Ollama ({model_name}) to classify: '{role_name}' ... ", end="", flush=True)
     
-    try:
-        with urllib.request.urlopen(req, timeout=60) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            category = result.get('response', '').strip()
-            
-            # Additional safety cleanup in case the LLM ignored instructions
-            category = category.strip('"').strip("'").strip('.')
-            if not category:
-                print("Failed (fallback to title case)")
-                return role_name.title()
-                
-            print(f"Result: {category}")
-            return category
-    except urllib.error.URLError as e:
-        print(f"\n[LLM Error] Ollama is not running or unreachable: {e}")
-        return role_name.title()
-    except Exception as e:
-        print(f"\n[LLM Error] Error calling Ollama: {e}")
-        return role_name.title()
+    text = ""
+    category = None
+    with urllib.request.urlopen(req, timeout=OLLAMA_TIMEOUT) as response:
+        # One JSON object per line: {"response": "<token(s)>", "done": false}, ...
+        # Leaving the 'with' block early closes the connection, which makes Ollama stop generating.
+        for line in response:
+            if not line.strip():
+                continue
+            chunk = json.loads(line.decode('utf-8'))
+            if chunk.get("error"):
+                raise ValueError(f"Ollama error: {chunk['error']}")
+            text += chunk.get("response", "")
+            category = match_streamed_category(text, structured)
+            if category or chunk.get("done"):
+                break
+
+    if not category:
+        # No exact category: keep whatever the model said (as before streaming)
+        category = _clean_answer(text)
+        if structured and text.strip().startswith("{"):
+            category = ""  # Cut-off JSON is not a usable answer
+    if not category:
+        print("Failed (empty answer)")
+        raise ValueError(f"Empty answer from {model_name}")
+        
+    print(f"Result: {category}")
+    return category
 
 def set_ollama_model(model_name: str):
     """Updates the default model used for classification in the config."""
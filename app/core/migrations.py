@@ -0,0 +1,268 @@
+# Versioned schema migrations for the workspace database.
+#
+# Every step in MIGRATIONS upgrades the schema by exactly one version. The
+# version reached is stored in the database header (PRAGMA user_version), so
+# migrate() is a single PRAGMA read when the schema is already current.
+#
+# The .NET service opens the same jalm_apps.db but never changes the schema.
+# DatabaseService.ExpectedSchemaVersion (C#) must be kept equal to
+# SCHEMA_VERSION whenever a step is added here.
+#
+# Adding a migration:
+#   1. Write a function that takes a cursor and performs the change.
+#   2. Append it to MIGRATIONS with the next version number.
+#   3. Bump ExpectedSchemaVersion in JALM.Service/DatabaseService.cs.
+
+
+def _v1_initial_schema(cursor):
+    """Base tables and indexes (also upgrades databases created before versioning)."""
+    # 1. table for all your job applications.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS applications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_name TEXT NOT NULL,
+            role_name TEXT NOT NULL,
+            folder_path TEXT NOT NULL,
+            status TEXT DEFAULT 'Applied',
+            job_description TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Legacy databases predate the job_description column.
+    cursor.execute("PRAGMA table_info(applications)")
+    columns = [row[1] for row in cursor.fetchall()]
+    if "job_description" not in columns:
+        cursor.execute("ALTER TABLE applications ADD COLUMN job_description TEXT")
+
+    # 2. table for tracking interview notes.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS interviews (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            app_id INTEGER NOT NULL,
+            sequence INTEGER NOT NULL,
+            notes TEXT,
+            date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (app_id) REFERENCES applications (id) ON DELETE CASCADE
+        )
+    ''')
+
+    # 3. Create "Indexes" to make searching for companies super fast.
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_apps_company ON applications(company_name)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_apps_role ON applications(role_name)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_apps_created ON applications(created_at)')
+
+    # Status rename: 'Interviewing' became 'Interviewed'.
+    cursor.execute("UPDATE applications SET status = 'Interviewed' WHERE status = 'Interviewing'")
+
+    # 4. table for caching role categorizations (LLM)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS role_mappings (
+            original_role TEXT PRIMARY KEY,
+            mapped_category TEXT NOT NULL
+        )
+    ''')
+
+
+def _v2_folder_path_index(cursor):
+    """Index folder_path so single-folder syncs and watcher events are indexed lookups."""
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_apps_folder_path ON applications(folder_path)')
+
+
+# Keeps the lowest id for every folder_path and deletes the rest in one statement.
+DEDUPE_APPLICATIONS_SQL = '''
+    DELETE FROM applications WHERE id IN (
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (PARTITION BY folder_path ORDER BY id) AS rn
+            FROM applications
+        ) WHERE rn > 1
+    )
+'''
+
+
+def _v3_unique_folder_path(cursor):
+    """Makes folder_path UNIQUE so duplicate records are impossible by construction."""
+    # Existing duplicates must go first or the unique index cannot be built.
+    cursor.execute(DEDUPE_APPLICATIONS_SQL)
+    cursor.execute('DROP INDEX IF EXISTS idx_apps_folder_path')
+    cursor.execute('CREATE UNIQUE INDEX idx_apps_folder_path ON applications(folder_path)')
+
+
+def _v4_company_role_index(cursor):
+    """Composite index for the duplicate checks done on every 'Add Application'."""
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_apps_company_role ON applications(company_name, role_name)')
+    # company_name alone is a prefix of the new index, so the old one is redundant.
+    cursor.execute('DROP INDEX IF EXISTS idx_apps_company')
+
+
+def _v5_document_index(cursor):
+    """Per-folder cache of each application's CV, cover letter and JD (see doc_index.py)."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS document_index (
+            folder_path TEXT PRIMARY KEY,
+            folder_mtime_ns INTEGER NOT NULL,
+            cv_name TEXT,
+            cv_size INTEGER,
+            cv_mtime_ns INTEGER,
+            cover_letter_name TEXT,
+            cover_letter_size INTEGER,
+            cover_letter_mtime_ns INTEGER,
+            jd_name TEXT,
+            jd_size INTEGER,
+            jd_mtime_ns INTEGER,
+            indexed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def _v6_role_mapping_model(cursor):
+    """Records which LLM model produced each cached role mapping (NULL: manual or unknown)."""
+    cursor.execute("PRAGMA table_info(role_mappings)")
+    if "model_name" not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE role_mappings ADD COLUMN model_name TEXT")
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_role_mappings_model ON role_mappings(model_name)')
+
+
+def _v7_role_mapping_provenance(cursor):
+    """Prompt hash, timestamp and source ('llm', 'rule' or 'manual') for every cached mapping."""
+    cursor.execute("PRAGMA table_info(role_mappings)")
+    columns = [row[1] for row in cursor.fetchall()]
+    for name, sql_type in (("prompt_hash", "TEXT"), ("classified_at", "DATETIME"), ("source", "TEXT")):
+        if name not in columns:
+            cursor.execute(f"ALTER TABLE role_mappings ADD COLUMN {name} {sql_type}")
+    # Since v6 only LLM answers have a model. Older rows cannot be told apart
+    # from manual corrections, so they are treated as manual (never overwritten).
+    cursor.execute('''
+        UPDATE role_mappings
+        SET source = CASE WHEN model_name IS NULL THEN 'manual' ELSE 'llm' END,
+            classified_at = COALESCE(classified_at, CURRENT_TIMESTAMP)
+        WHERE source IS NULL
+    ''')
+
+
+def _v8_role_embeddings(cursor):
+    """On-disk vector cache of the embedding classifier (see embedding_classifier.py)."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS role_embeddings (
+            model TEXT NOT NULL,
+            text TEXT NOT NULL,
+            dim INTEGER NOT NULL,
+            vector BLOB NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (model, text)
+        )
+    ''')
+
+
+def _v9_change_log(cursor):
+    """
+    Append-only log of data changes, written by triggers (so writes of the .NET
+    service are logged too). `day` is the creation date of the affected
+    application (NULL: unknown or affects every date, e.g. a role mapping).
+    The report cache (report_cache.py) uses it to invalidate only the date
+    ranges that changed.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS change_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            day TEXT
+        )
+    ''')
+    app_day = "(SELECT date(created_at) FROM applications WHERE id = {}.app_id)"
+    triggers = {
+        "applications_insert": ("AFTER INSERT ON applications",
+                                "INSERT INTO change_log (table_name, day) VALUES ('applications', date(NEW.created_at));"),
+        "applications_update": ("AFTER UPDATE ON applications",
+                                "INSERT INTO change_log (table_name, day) VALUES ('applications', date(OLD.created_at));"
+                                "INSERT INTO change_log (table_name, day) SELECT 'applications', date(NEW.created_at) "
+                                "WHERE date(NEW.created_at) IS NOT date(OLD.created_at);"),
+        "applications_delete": ("AFTER DELETE ON applications",
+                                "INSERT INTO change_log (table_name, day) VALUES ('applications', date(OLD.created_at));"),
+        "interviews_insert": ("AFTER INSERT ON interviews",
+                              f"INSERT INTO change_log (table_name, day) VALUES ('interviews', {app_day.format('NEW')});"),
+        "interviews_update": ("AFTER UPDATE ON interviews",
+                              f"INSERT INTO change_log (table_name, day) VALUES ('interviews', {app_day.format('OLD')});"
+                              f"INSERT INTO change_log (table_name, day) VALUES ('interviews', {app_day.format('NEW')});"),
+        "interviews_delete": ("AFTER DELETE ON interviews",
+                              f"INSERT INTO change_log (table_name, day) VALUES ('interviews', {app_day.format('OLD')});"),
+    }
+    # A new mapping changes no existing report (whoever inserts it is the first
+    # to classify that role), but moving a role to another category does.
+    triggers["role_mappings_update"] = (
+        "AFTER UPDATE OF mapped_category ON role_mappings WHEN OLD.mapped_category IS NOT NEW.mapped_category",
+        "INSERT INTO change_log (table_name, day) VALUES ('role_mappings', NULL);")
+    triggers["role_mappings_delete"] = (
+        "AFTER DELETE ON role_mappings", "INSERT INTO change_log (table_name, day) VALUES ('role_mappings', NULL);")
+    for name, (when, body) in triggers.items():
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_log_{name} {when} BEGIN {body} END")
+
+
+# Ordered list of (version, description, step). Versions must be consecutive.
+MIGRATIONS = [
+    (1, "Initial schema", _v1_initial_schema),
+    (2, "Index applications.folder_path", _v2_folder_path_index),
+    (3, "Unique applications.folder_path", _v3_unique_folder_path),
+    (4, "Composite (company_name, role_name) index", _v4_company_role_index),
+    (5, "Document index table", _v5_document_index),
+    (6, "role_mappings.model_name", _v6_role_mapping_model),
+    (7, "role_mappings prompt_hash / classified_at / source", _v7_role_mapping_provenance),
+    (8, "role_embeddings vector cache", _v8_role_embeddings),
+    (9, "change_log table and triggers", _v9_change_log),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    """Returns the schema version stored in the database header."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn, target_version=None):
+    """
+    Brings the database up to `target_version` (default: latest) in one transaction.
+
+    Returns:
+        int: The schema version after the call.
+
+    Raises:
+        RuntimeError: If the database was created by a newer version of JALM.
+        sqlite3.Error: If a step fails. The transaction is rolled back and the
+            database stays on its previous version.
+    """
+    target = SCHEMA_VERSION if target_version is None else target_version
+
+    current = get_schema_version(conn)
+    if current > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema version {current} is newer than this JALM build supports ({SCHEMA_VERSION}).")
+    if current >= target:
+        return current
+
+    # Manage the transaction ourselves so DDL and DML commit (or roll back) together.
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None
+    cursor = conn.cursor()
+    try:
+        # IMMEDIATE takes the write lock up-front, so two processes starting at
+        # the same time cannot both run the same steps.
+        cursor.execute("BEGIN IMMEDIATE")
+        # Re-read under the lock in case another process migrated meanwhile.
+        current = get_schema_version(conn)
+
+        for version, description, step in MIGRATIONS:
+            if current < version <= target:
+                step(cursor)
+
+        if target > current:
+            cursor.execute(f"PRAGMA user_version = {int(target)}")
+            current = target
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        conn.isolation_level = previous_isolation
+
+    return current
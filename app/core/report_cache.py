@@ -0,0 +1,174 @@
+import copy
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from . import database
+from .database import get_db_connection
+
+# In-memory cache of Summary Report results (get_detailed_analytics).
+#
+# Entries are keyed by (workspace, start, end, top_n) and remember the change_log
+# revision (schema v9) they were computed at. change_log is filled by
+# triggers on applications, interviews and role_mappings, each row carrying
+# the creation date of the application it touched. A cached report is still
+# valid if no change since its revision falls inside its date range (and no
+# role was moved to another category, which can affect any range), so adding
+# an application today does not throw away last year's report.
+#
+# PRAGMA data_version is not enough here: it only reports commits made by
+# *other* connections to the one asking, and every query opens a new one.
+
+DEFAULT_MAX_ENTRIES = 16
+
+
+def _normalize_range(start_date, end_date):
+    # get_detailed_analytics only filters when both dates are given
+    return (start_date, end_date) if start_date and end_date else (None, None)
+
+
+def _key(start_date, end_date, top_n):
+    # Every workspace has its own database (and its own change_log ids)
+    return (database.get_active_root(), start_date, end_date, repr(top_n))
+
+
+def current_revision(conn):
+    return conn.execute("SELECT COALESCE(MAX(id), 0) FROM change_log").fetchone()[0]
+
+
+def _changed_since(conn, revision, start_date, end_date):
+    """True if a change after `revision` may affect the report for this range."""
+    if start_date is None:
+        row = conn.execute("SELECT 1 FROM change_log WHERE id > ? LIMIT 1", (revision,)).fetchone()
+    else:
+        row = conn.execute(
+            "SELECT 1 FROM change_log WHERE id > ? AND (day IS NULL OR day BETWEEN ? AND ?) LIMIT 1",
+            (revision, start_date, end_date)).fetchone()
+    return row is not None
+
+
+class ReportCache:
+    """
+    LRU cache of report metrics, validated against change_log on every lookup
+    (one indexed query). Thread-safe; the report itself is computed outside the lock.
+    """
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (revision, metrics)
+        self._computing = []           # (workspace, revision) of reports being computed
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, start_date=None, end_date=None, top_n=None):
+        """Cached metrics for this range if still valid, else None."""
+        start_date, end_date = _normalize_range(start_date, end_date)
+        key = _key(start_date, end_date, top_n)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        revision, metrics = entry
+        conn = get_db_connection()
+        try:
+            if _changed_since(conn, revision, start_date, end_date):
+                with self._lock:
+                    self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            latest = current_revision(conn)
+        finally:
+            conn.close()
+
+        with self._lock:
+            if key in self._entries:
+                # Still valid at the latest revision: later checks scan fewer rows
+                self._entries[key] = (latest, metrics)
+                self._entries.move_to_end(key)
+        self.hits += 1
+        self.prune()
+        return copy.deepcopy(metrics)  # Callers may modify their copy
+
+    def put(self, start_date, end_date, top_n, revision, metrics):
+        start_date, end_date = _normalize_range(start_date, end_date)
+        key = _key(start_date, end_date, top_n)
+        with self._lock:
+            self._entries[key] = (revision, copy.deepcopy(metrics))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self.prune()
+
+    def prune(self):
+        """
+        Deletes the change_log rows no cached (or currently computed) report
+        needs any more: all of them if nothing is cached, e.g. at startup.
+        The .NET service keeps logging while JALM is closed, so this also
+        keeps the table small between sessions. Returns the number of rows deleted.
+        """
+        root = database.get_active_root()
+        try:
+            conn = get_db_connection()
+            try:
+                with self._lock:
+                    # Under the lock, so a compute() starting now reads a later revision
+                    revisions = [rev for k, (rev, _) in self._entries.items() if k[0] == root]
+                    revisions += [rev for r, rev in self._computing if r == root]
+                    floor = min(revisions) if revisions else current_revision(conn)
+                # Rows at or before the oldest revision still in use are never read again
+                deleted = conn.execute("DELETE FROM change_log WHERE id <= ?", (floor,)).rowcount
+                conn.commit()
+                return deleted
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return 0  # e.g. database busy: pruning can wait for the next report
+
+    def get_or_compute(self, start_date=None, end_date=None, top_n=None, progress_callback=None):
+        """Returns the report for this range, computing (and caching) it only if needed."""
+        metrics = self.get(start_date, end_date, top_n)
+        if metrics is not None:
+            return metrics
+        return self.compute(start_date, end_date, top_n, progress_callback)
+
+    def compute(self, start_date=None, end_date=None, top_n=None, progress_callback=None):
+        """Runs get_detailed_analytics and caches the result (use after a get() miss)."""
+        from .database import get_detailed_analytics
+        conn = get_db_connection()
+        try:
+            # Read before computing: a change made meanwhile invalidates the entry next time.
+            # Registered so prune() keeps the rows after it until the entry is stored.
+            with self._lock:
+                computing = (database.get_active_root(), current_revision(conn))
+                self._computing.append(computing)
+        finally:
+            conn.close()
+        try:
+            metrics = get_detailed_analytics(start_date or None, end_date or None,
+                                             progress_callback=progress_callback, top_n=top_n)
+            self.put(start_date, end_date, top_n, computing[1], metrics)
+        finally:
+            with self._lock:
+                self._computing.remove(computing)
+        return copy.deepcopy(metrics)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_report_cache():
+    """The shared cache used by the analytics view."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ReportCache()
+        return _cache
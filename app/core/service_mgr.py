@@ -11,6 +11,9 @@ from pathlib import Path
 class ServiceManager:
     _instance = None
     _process = None
+    # start_service now runs on the startup worker thread while stop_service
+    # can be called from atexit on the main thread, so both take this lock.
+    _lock = threading.Lock()
 
     def __new__(cls):
         # This part ensures that only one instance of ServiceManager exists.
@@ -46,7 +49,12 @@ class ServiceManager:
         """
         Launches the JALM.Service.exe in the background.
         It won't show a console window, so it stays hidden from the user.
+        Safe to call from a worker thread.
         """
+        with self._lock:
+            self._start_service_locked()
+
+    def _start_service_locked(self):
         # If the service is already running, don't start it again.
         if self._process and self._process.poll() is None:
             return
@@ -57,6 +65,13 @@ class ServiceManager:
             return
 
         print(f"Starting Background Service: {service_path}")
+        # Debug lines are collected and written once at the end (dev mode only)
+        # instead of reopening the log file for every message.
+        debug_lines = [
+            f"\n[{time.strftime('%Y-%m-%d %H:%M:%S')}] Attempting to launch service.",
+            f"Service Path: {service_path}",
+        ]
+        executable_dir = None
         try:
             # When running as an EXE, we need to tell the .NET service where the 
             # main application folder is, so it can find 'config.json'.
@@ -68,13 +83,6 @@ class ServiceManager:
                 # Bug Fix: If running in developer mode, use the project root instead of the Python executable 
                 # folder (e.g. C:\Python314\) to avoid Windows [Errno 13] Permission denied errors.
                 executable_dir = str(Path(__file__).parent.parent.parent)
-            # Debug logging (only in dev mode, not in production bundles)
-            if not hasattr(sys, '_MEIPASS'):
-                log_path = os.path.join(executable_dir, "jalm_service_debug.txt")
-                with open(log_path, "a") as f:
-                    f.write(f"\n[{time.strftime('%Y-%m-%d %H:%M:%S')}] Attempting to launch service.\n")
-                    f.write(f"Service Path: {service_path}\n")
-                    f.write(f"Exists: {service_path.exists()}\n")
 
             # Create a copy of the current environment and add our custom variable.
             env = os.environ.copy()
@@ -92,25 +100,38 @@ class ServiceManager:
                 stdout=self._stdout_handle,
                 stderr=self._stderr_handle
             )
-            if not hasattr(sys, '_MEIPASS'):
-                log_path = os.path.join(executable_dir, "jalm_service_debug.txt")
-                with open(log_path, "a") as f:
-                    f.write(f"Process started with PID: {self._process.pid}\n")
+            debug_lines.append(f"Process started with PID: {self._process.pid}")
 
         except Exception as e:
             print(f"Failed to start background service: {e}")
-            if not hasattr(sys, '_MEIPASS'):
-                try:
-                    with open(os.path.join(executable_dir, "jalm_service_debug.txt"), "a") as f:
-                        f.write(f"EXCEPTION: {e}\n")
-                except Exception:
-                    pass
+            debug_lines.append(f"EXCEPTION: {e}")
+        finally:
+            self._write_debug_log(executable_dir, debug_lines)
+
+    def _write_debug_log(self, executable_dir, lines):
+        """Appends launch diagnostics to jalm_service_debug.txt (dev mode only)."""
+        if hasattr(sys, '_MEIPASS') or not executable_dir:
+            return
+        try:
+            with open(os.path.join(executable_dir, "jalm_service_debug.txt"), "a") as f:
+                f.write("\n".join(lines) + "\n")
+        except Exception:
+            pass
+
+    def is_running(self):
+        """Readiness probe: True while the service process is alive."""
+        process = self._process
+        return process is not None and process.poll() is None
 
     def stop_service(self):
         """
         Safely shuts down the background service.
         This is called automatically when the Python GUI is closed.
         """
+        with self._lock:
+            self._stop_service_locked()
+
+    def _stop_service_locked(self):
         if self._process:
             print("Stopping Background Service...")
             # 'terminate' asks the service to close nicely.
@@ -0,0 +1,113 @@
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+from .llm_service import ollama_url
+
+# Stage states reported by the StartupPipeline.
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def start_ollama():
+    """Attempts to start the local Ollama server silently in the background."""
+    try:
+        # Hide the console window on Windows
+        startupinfo = None
+        if sys.platform == "win32":
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+
+        # Launch ollama serve in the background, suppressing output.
+        # If it's already running, this will just fail quietly.
+        subprocess.Popen(['ollama', 'serve'],
+                         startupinfo=startupinfo,
+                         stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL)
+        print("Auto-started Ollama background service.")
+    except Exception as e:
+        print(f"Could not auto-start Ollama: {e}")
+
+
+def probe_ollama(timeout=1.0):
+    """Returns True if the Ollama HTTP API answers, False otherwise."""
+    try:
+        with urllib.request.urlopen(ollama_url("/api/tags"), timeout=timeout) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
+
+def wait_until(probe, timeout=15.0, interval=0.5):
+    """Polls `probe` until it returns True or `timeout` seconds have passed."""
+    deadline = time.monotonic() + timeout
+    while True:
+        if probe():
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+
+class StartupPipeline:
+    """
+    Runs slow startup work (sidecar processes, readiness probes) on a background
+    thread so the main window can paint from the database immediately.
+
+    Stages run in the order they were added. A failing stage is recorded and
+    the pipeline moves on, because none of the sidecars are required to browse
+    applications.
+    """
+    def __init__(self, on_stage_complete=None):
+        # on_stage_complete(name, state) is called from the worker thread.
+        self.on_stage_complete = on_stage_complete
+        self._stages = []
+        self._states = {}
+        self._thread = None
+        self._finished = threading.Event()
+
+    def add_stage(self, name, func):
+        """Registers a stage. `func` may return False to mark the stage as failed."""
+        self._stages.append((name, func))
+        self._states[name] = PENDING
+        return self
+
+    def start(self):
+        """Starts the worker thread (only once)."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="jalm-startup", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            for name, func in self._stages:
+                self._states[name] = RUNNING
+                try:
+                    result = func()
+                    self._states[name] = FAILED if result is False else DONE
+                except Exception as e:
+                    print(f"Startup stage '{name}' failed: {e}")
+                    self._states[name] = FAILED
+
+                if self.on_stage_complete:
+                    try:
+                        self.on_stage_complete(name, self._states[name])
+                    except Exception:
+                        pass
+        finally:
+            self._finished.set()
+
+    def state(self, name):
+        return self._states.get(name)
+
+    def is_ready(self, name):
+        return self._states.get(name) == DONE
+
+    def wait(self, timeout=None):
+        """Blocks until every stage has run. Returns True if the pipeline finished."""
+        return self._finished.wait(timeout)
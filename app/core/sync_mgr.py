@@ -1,10 +1,13 @@
 import os
 from .config_mgr import get_active_root
-from .file_ops import scan_for_existing_applications, write_jalm_id
+from .file_ops import scan_for_existing_applications, read_application_folder, write_jalm_id
+from .doc_index import refresh_documents, forget_orphaned_documents
+from .classifier_worker import get_classifier_worker
 from .database import (
-    add_application, get_applications, delete_application, remove_duplicates, 
+    upsert_application, get_applications, delete_application, 
     update_application_date, get_application_by_id, update_application_status,
-    update_application_paths, application_exists
+    update_application_paths, get_application_by_path,
+    get_application_by_name, get_applications_under_path, replace_path_prefix
 )
 
 def sync_workspace(root_path):
@@ -25,6 +28,7 @@ def sync_workspace(root_path):
     
     added_count = 0
     updated_count = 0
+    new_roles = []  # Role names of the applications added by this sync
     
     # We will keep track of app IDs that exist on disk so we can delete missing ones later.
     active_ids = set()
@@ -82,10 +86,13 @@ def sync_workspace(root_path):
         # 4. New Application
         else:
             is_new = True
-            new_id = add_application(company, role, path, created_at)
+            # Upsert so a record written concurrently (e.g. by the .NET
+            # service) for the same folder is reused instead of failing.
+            new_id = upsert_application(company, role, path, created_at)
             write_jalm_id(path, new_id)
             target_app_id = new_id
             added_count += 1
+            new_roles.append(role)
             if is_interviewed:
                 update_application_status(target_app_id, 'Interviewed')
             
@@ -113,18 +120,188 @@ def sync_workspace(root_path):
             update_application_status(target_app_id, 'Interviewed')
             updated_count += 1
 
-    # Remove duplicates in DB (if any snuck in due to other bugs)
-    duplicates_removed = remove_duplicates()
+    # folder_path is UNIQUE (schema v3), so duplicate records cannot exist and
+    # there is nothing to clean up here any more.
+    duplicates_removed = 0
 
-    # Check for missing folders and remove from DB
+    # Check for missing folders and remove from DB.
+    # Only records that were in the DB before the scan and were not matched can
+    # be missing; no need to load the whole table a second time.
     removed_count = 0
-    # Refetch since duplicates might be gone
-    db_apps = get_applications()
-    for app in db_apps:
+    for app in current_db_apps:
         app_id = app['id']
         if app_id not in active_ids:
             if not os.path.exists(app['folder_path']):
                 delete_application(app_id)
                 removed_count += 1
 
+    # Keep the document index current while the folders are warm in the OS cache.
+    # Only folders whose mtime changed since the last sync are listed again.
+    refresh_documents(app['path'] for app in found_apps)
+    forget_orphaned_documents()
+
+    # Classify the imported roles in the background before a report needs them.
+    get_classifier_worker().enqueue(new_roles)
+
     return added_count, updated_count, removed_count, duplicates_removed
+
+
+# --- Single-folder operations ---
+# These are used by the real-time folder watcher. Each one touches only the
+# folder it is given (indexed lookups), so picking up one new folder does not
+# need a full sync_workspace rescan.
+
+def _is_same_folder(record, path):
+    # A record can be adopted by `path` if it already points there, or if the
+    # folder it points to is gone (the folder was renamed/moved while we were not looking).
+    return record['folder_path'] == path or not os.path.exists(record['folder_path'])
+
+def sync_folder(role_path, previous_path=None):
+    """
+    Reconciles a single 'Company/Role' folder with the database.
+    Uses the same matching rules as sync_workspace (jalm_id, path, company/role).
+
+    Args:
+        role_path (str): The role folder on disk.
+        previous_path (str, optional): Where the folder was before a rename/move.
+
+    Returns:
+        str: 'added', 'updated' or 'unchanged'; None if the folder does not exist.
+    """
+    app = read_application_folder(role_path)
+    if app is None:
+        return None
+
+    company, role, path = app['company'], app['role'], app['path']
+    created_at = app.get('created_at')
+    is_interviewed = app.get('has_interviews', False)
+    jalm_id = app.get('jalm_id')
+
+    # 1. Known rename: the record still points at the old location
+    record = get_application_by_path(previous_path) if previous_path else None
+
+    # 2. Match by jalm_id (ignored if the id belongs to a folder that still
+    #    exists elsewhere, i.e. this folder is a copy)
+    if record is None and jalm_id is not None:
+        candidate = get_application_by_id(jalm_id)
+        if candidate and _is_same_folder(candidate, path):
+            record = candidate
+
+    # 3. Match by folder_path
+    if record is None:
+        record = get_application_by_path(path)
+
+    # 4. Match by company/role
+    if record is None:
+        candidate = get_application_by_name(company, role)
+        if candidate and _is_same_folder(candidate, path):
+            record = candidate
+
+    # 5. New Application
+    if record is None:
+        new_id = upsert_application(company, role, path, created_at)
+        write_jalm_id(path, new_id)
+        if is_interviewed:
+            update_application_status(new_id, 'Interviewed')
+        get_classifier_worker().enqueue([role])
+        return 'added'
+
+    app_id = record['id']
+    changed = False
+    if jalm_id != app_id:
+        write_jalm_id(path, app_id)
+
+    if record['folder_path'] != path or record['company_name'] != company or record['role_name'] != role:
+        update_application_paths(app_id, company, role, path)
+        changed = True
+
+    if record['created_at'] != created_at:
+        update_application_date(app_id, created_at)
+        changed = True
+
+    if is_interviewed and record['status'] == 'Applied':
+        update_application_status(app_id, 'Interviewed')
+        changed = True
+
+    return 'updated' if changed else 'unchanged'
+
+def rename_folder(old_path, new_path):
+    """
+    Points every record at or below `old_path` to `new_path` instead, keeping
+    their ids, statuses and interview notes. Returns the number of records moved.
+    Company/role names are refreshed by calling sync_folder on the new folders.
+    """
+    return replace_path_prefix(os.path.abspath(old_path), os.path.abspath(new_path))
+
+def remove_folder(path):
+    """
+    Deletes the records of `path` (a Role folder) or of every role below it
+    (a Company folder) whose folders no longer exist. Returns the number removed.
+    """
+    removed = 0
+    for app in get_applications_under_path(os.path.abspath(path)):
+        if not os.path.exists(app['folder_path']):
+            delete_application(app['id'])
+            removed += 1
+    return removed
+
+def sync_company(company_dir):
+    """
+    Reconciles one Company folder: upserts every Role folder inside it and
+    removes records whose role folders are gone.
+
+    Returns:
+        tuple: (added, updated, removed)
+    """
+    added = updated = 0
+    if os.path.isdir(company_dir):
+        for entry in os.scandir(company_dir):
+            if entry.is_dir():
+                result = sync_folder(entry.path)
+                if result == 'added':
+                    added += 1
+                elif result == 'updated':
+                    updated += 1
+    removed = remove_folder(company_dir)
+    return added, updated, removed
+
+def sync_paths(paths, root_path=None):
+    """
+    Reconciles only the given folders with the database (O(changed) instead of
+    a full sync_workspace). Each path may be a Role folder, a Company folder or
+    the root itself (which falls back to a full sync). Paths that no longer
+    exist remove their records.
+
+    Returns:
+        tuple: (added, updated, removed)
+    """
+    root_path = root_path or get_active_root()
+    if not root_path:
+        return 0, 0, 0  # No workspace: never sync relative to the working directory
+    root_path = os.path.abspath(root_path)
+    added = updated = removed = 0
+
+    for path in paths:
+        path = os.path.abspath(path)
+        rel = os.path.relpath(path, root_path)
+        if rel.startswith(os.pardir):
+            continue  # Outside the workspace
+        depth = 0 if rel == os.curdir else len(rel.split(os.sep))
+
+        if depth == 0:
+            a, u, r, d = sync_workspace(root_path)
+            added, updated, removed = added + a, updated + u, removed + r + d
+        elif depth == 1:
+            a, u, r = sync_company(path)
+            added, updated, removed = added + a, updated + u, removed + r
+        elif depth == 2:
+            result = sync_folder(path)
+            if result is None:
+                removed += remove_folder(path)
+            elif result == 'added':
+                added += 1
+            elif result == 'updated':
+                updated += 1
+        # Deeper paths are files/folders inside an application; nothing to sync.
+
+    return added, updated, removed
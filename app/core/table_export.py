@@ -0,0 +1,151 @@
+import csv
+import importlib.util
+import json
+import os
+
+from .database import get_db_connection, build_applications_query
+
+# Streaming export of the applications table (CSV / JSON Lines / Parquet).
+# Rows are pulled from the cursor in fetchmany() batches and written straight
+# to disk, so memory use stays the same whether there are 10 or 100,000 rows.
+# The query is the one the dashboard list uses, so an export contains exactly
+# what the user is looking at (same search filter and sort order).
+
+# Column -> heading. The default CSV layout matches the .NET AnalyticsService
+# export (applications_export.csv), so both files open the same way in Excel.
+COLUMN_HEADINGS = {
+    "id": "ID",
+    "company_name": "Company",
+    "role_name": "Role",
+    "status": "Status",
+    "created_at": "Date Applied",
+    "folder_path": "Path",
+    "job_description": "Job Description",
+}
+DEFAULT_COLUMNS = ["company_name", "role_name", "status", "created_at", "folder_path"]
+
+# Format -> file extension
+FORMATS = {
+    "csv": ".csv",
+    "jsonl": ".jsonl",
+    "parquet": ".parquet",
+}
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def is_parquet_available():
+    """Parquet output needs the optional 'pyarrow' package."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def available_formats():
+    return [fmt for fmt in FORMATS if fmt != "parquet" or is_parquet_available()]
+
+
+def iter_application_batches(search_query=None, sort_by="created_at", sort_order="DESC",
+                             columns=None, batch_size=DEFAULT_BATCH_SIZE, created_after=None):
+    """Yields lists of row tuples (at most `batch_size` each) from the applications table."""
+    columns = columns or DEFAULT_COLUMNS
+    query_str, params = build_applications_query(search_query, sort_by, sort_order, columns, created_after)
+
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query_str, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield [tuple(row) for row in rows]
+    finally:
+        conn.close()
+
+
+def _write_csv(path, columns, batches):
+    count = 0
+    # utf-8-sig (with BOM) so Excel detects the encoding, like the .NET export.
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow([COLUMN_HEADINGS.get(c, c) for c in columns])
+        for rows in batches:
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+def _write_jsonl(path, columns, batches):
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for rows in batches:
+            for row in rows:
+                f.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+                f.write("\n")
+            count += len(rows)
+    return count
+
+
+def _write_parquet(path, columns, batches):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(c, pa.int64() if c == "id" else pa.string()) for c in columns])
+    count = 0
+    # Each batch becomes one row group, so only one batch is ever held in memory.
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in batches:
+            data = {c: [row[i] for row in rows] for i, c in enumerate(columns)}
+            writer.write_table(pa.Table.from_pydict(data, schema=schema))
+            count += len(rows)
+    return count
+
+
+WRITERS = {
+    "csv": _write_csv,
+    "jsonl": _write_jsonl,
+    "parquet": _write_parquet,
+}
+
+
+def export_applications(output_path, fmt=None, search_query=None, sort_by="created_at", sort_order="DESC",
+                        created_after=None, columns=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Streams the applications table to a file.
+
+    Args:
+        output_path (str): Destination file.
+        fmt (str, optional): 'csv', 'jsonl' or 'parquet'. Taken from the file extension if omitted.
+        search_query, sort_by, sort_order, created_after: Same meaning as in database.get_applications.
+        columns (list, optional): Columns to export (keys of COLUMN_HEADINGS).
+        batch_size (int): Rows fetched from SQLite per round trip.
+
+    Returns:
+        int: Number of rows written.
+    """
+    if fmt is None:
+        ext = os.path.splitext(output_path)[1].lower()
+        fmt = next((name for name, e in FORMATS.items() if e == ext), "csv")
+    if fmt not in WRITERS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt == "parquet" and not is_parquet_available():
+        raise ValueError("Parquet export requires the 'pyarrow' package (pip install pyarrow).")
+
+    columns = list(columns or DEFAULT_COLUMNS)
+    unknown = [c for c in columns if c not in COLUMN_HEADINGS]
+    if unknown:
+        raise ValueError(f"Unknown export columns: {', '.join(unknown)}")
+
+    batches = iter_application_batches(search_query, sort_by, sort_order, columns, batch_size, created_after)
+
+    # Write to a temporary file first so a failed export never leaves a half-written file behind.
+    tmp_path = f"{output_path}.part"
+    try:
+        count = WRITERS[fmt](tmp_path, columns, batches)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        batches.close()  # Releases the DB connection even if the writer stopped early
+    return count
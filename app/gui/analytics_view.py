@@ -1,8 +1,6 @@
 import customtkinter as ctk
 import tkinter as tk
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from tkinter import messagebox
 from ..core.database import get_analytics_data, get_daily_status_counts
 from .calendar_dialog import CalendarDialog
@@ -80,6 +78,11 @@ class AnalyticsDashboard(ctk.CTkToplevel):
         self.charts_frame.grid_columnconfigure(1, weight=1)
         self.charts_frame.grid_rowconfigure(0, weight=1)
 
+        # Matplotlib is the heaviest import in the app, so it is only loaded
+        # the first time an Analytics window is actually opened.
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
         # Matplotlib Figure
         self.fig = plt.figure(figsize=(10, 5), dpi=100)
         self.ax1 = self.fig.add_subplot(121) # Pie Chart
@@ -344,11 +347,26 @@ class AnalyticsDashboard(ctk.CTkToplevel):
         """
         Gathers detailed analytics data in a background thread and 
         displays it in a structured ReportDialog modal to avoid freezing the UI.
+        Reports are cached per date range (report_cache.py); if nothing changed
+        in the range since the last time, it opens at once.
         """
+        from ..core.report_cache import get_report_cache
+        from .report_dialog import REPORT_TOP_N
+        
         start = self.start_date_var.get().strip()
         end = self.end_date_var.get().strip()
         range_text = f"{start} to {end}" if (start and end) else "All Time"
         
+        try:
+            cached = get_report_cache().get(start or None, end or None, REPORT_TOP_N)
+        except Exception as e:
+            print(f"Report cache unavailable: {e}")
+            cached = None
+        if cached is not None:
+            from .report_dialog import ReportDialog
+            ReportDialog(self, cached, range_text, start or None, end or None)
+            return
+        
         # Show a loading dialog
         loading = ctk.CTkToplevel(self)
         loading.title("Loading...")
@@ -388,16 +406,21 @@ class AnalyticsDashboard(ctk.CTkToplevel):
                 pass
         
         def fetch_data():
-            from ..core.database import get_detailed_analytics
+            from ..core.classifier_worker import get_classifier_worker
             
             try:
-                metrics = get_detailed_analytics(
-                    start if start else None, 
-                    end if end else None,
-                    progress_callback=lambda c, t, r: self.after(0, update_progress, c, t, r)
-                )
+                # Breakdowns are cut at REPORT_TOP_N rows plus an "Other" row,
+                # so the report's size does not grow with the number of companies.
+                # The background re-warm pauses meanwhile so Ollama serves the report first.
+                with get_classifier_worker().hold():
+                    metrics = get_report_cache().compute(
+                        start if start else None, 
+                        end if end else None,
+                        top_n=REPORT_TOP_N,
+                        progress_callback=lambda c, t, r: self.after(0, update_progress, c, t, r)
+                    )
                 # Safely update GUI from main thread
-                self.after(0, self._show_report_dialog, metrics, range_text, loading)
+                self.after(0, self._show_report_dialog, metrics, range_text, loading, start, end)
             except Exception as e:
                 print(f"Error generating report: {e}")
                 self.after(0, loading.destroy)
@@ -405,7 +428,7 @@ class AnalyticsDashboard(ctk.CTkToplevel):
         import threading
         threading.Thread(target=fetch_data, daemon=True).start()
 
-    def _show_report_dialog(self, metrics, range_text, loading_dialog):
+    def _show_report_dialog(self, metrics, range_text, loading_dialog, start=None, end=None):
         """Callback to show the report dialog once data is fetched."""
         try:
             loading_dialog.destroy()
@@ -413,15 +436,19 @@ class AnalyticsDashboard(ctk.CTkToplevel):
             pass
             
         from .report_dialog import ReportDialog
-        ReportDialog(self, metrics, range_text)
+        ReportDialog(self, metrics, range_text, start or None, end or None)
 
     def open_llm_settings(self):
-        """Opens a small dialog to configure the Ollama model name via a dropdown."""
+        """Opens a small dialog to configure the Ollama model name and the classification engine."""
         from ..core.config_mgr import load_config, save_config
-        from ..core.llm_service import get_available_models
+        from ..core.llm_service import get_available_models, ENGINE_KEY, ENGINE_GENERATE, ENGINE_EMBEDDING
+        
+        # Engine -> label shown in the dropdown
+        engine_labels = {ENGINE_GENERATE: "Generate (zero-shot prompt)", ENGINE_EMBEDDING: "Embeddings (fast, batched)"}
         
         config = load_config()
         current_model = config.get("ollama_model", "llama3.2")
+        current_engine = config.get(ENGINE_KEY, ENGINE_GENERATE)
         available_models = get_available_models()
         
         if current_model not in available_models:
@@ -429,13 +456,13 @@ class AnalyticsDashboard(ctk.CTkToplevel):
         
         dialog = ctk.CTkToplevel(self)
         dialog.title("LLM Settings")
-        dialog.geometry("350x200")
+        dialog.geometry("350x290")
         
         # Center dialog
         dialog.update_idletasks()
         try:
             x = self.winfo_rootx() + (self.winfo_width() // 2) - 175
-            y = self.winfo_rooty() + (self.winfo_height() // 2) - 100
+            y = self.winfo_rooty() + (self.winfo_height() // 2) - 145
             dialog.geometry(f"+{x}+{y}")
         except Exception:
             pass
@@ -451,13 +478,32 @@ class AnalyticsDashboard(ctk.CTkToplevel):
         dropdown = ctk.CTkOptionMenu(dialog, variable=selected_model, values=available_models, width=200)
         dropdown.pack(pady=10)
         
+        ctk.CTkLabel(dialog, text="Classification Engine:", font=("Arial", 14, "bold")).pack(pady=(10, 5))
+        selected_engine = ctk.StringVar(value=engine_labels.get(current_engine, engine_labels[ENGINE_GENERATE]))
+        ctk.CTkOptionMenu(dialog, variable=selected_engine, values=list(engine_labels.values()), width=200).pack(pady=5)
+        
         def save_and_close():
             model_name = selected_model.get().strip()
             if model_name:
                 config["ollama_model"] = model_name
+                config[ENGINE_KEY] = next(e for e, label in engine_labels.items() if label == selected_engine.get())
                 save_config(config)
                 # Ensure the message box displays on top of other windows
                 messagebox.showinfo("Success", f"Ollama model changed to '{model_name}'.\nIt will be used for new unseen roles.", parent=dialog)
+
+                # Cached answers of the old model (or engine) keep serving reports;
+                # they are re-classified in the background while the app is idle.
+                # Manual corrections are never touched.
+                from ..core.database import count_stale_role_mappings
+                from ..core.llm_service import get_classifier_identity
+                from ..core.classifier_worker import get_classifier_worker
+                stale = count_stale_role_mappings(*get_classifier_identity())
+                if stale:
+                    get_classifier_worker().rewarm()
+                    messagebox.showinfo(
+                        "Re-Classify",
+                        f"{stale} roles will be re-classified with the new settings in the background.\n"
+                        "Reports keep using the current categories until then.", parent=dialog)
             dialog.destroy()
             
         btn_save = ctk.CTkButton(dialog, text="Save", width=120, command=save_and_close)
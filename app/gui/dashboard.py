@@ -1,7 +1,8 @@
 import customtkinter as ctk
 import os
-from .add_app_dialog import AddAppDialog
-from ..core.database import add_application, get_applications, get_stats, update_application_status, delete_application
+import json
+from ..core.config_mgr import get_active_root
+from ..core.database import upsert_application, get_applications, get_stats, update_application_status, delete_application
 from ..core.file_ops import create_application_folder, open_folder
 from tkinter import messagebox, Menu, filedialog
 
@@ -172,6 +173,7 @@ class Dashboard(ctk.CTkFrame):
         
         # Virtual scrolling
         self._all_apps = []
+        self._current_query = None
         self._visible_items = []
         self.ITEM_HEIGHT = 54  # Height of each AppListItem
         
@@ -375,8 +377,6 @@ class Dashboard(ctk.CTkFrame):
         
         # The 'Ghosted' count is calculated by the .NET Background Service.
         # It saves it to a file called 'analytics.json'. We try to read it here.
-        from ..core.config_mgr import get_active_root
-        import json
         root = get_active_root()
         if root:
             analytics_path = os.path.join(root, "analytics.json")
@@ -404,9 +404,8 @@ class Dashboard(ctk.CTkFrame):
         search_query = self.search_var.get()
         sort_by = self.sort_var.get()
         
-        self._all_apps = get_applications(search_query, sort_by=sort_by, sort_order=self.sort_order)
-        
-        # Filter by time
+        # Filter by time (done in SQL, using the created_at index)
+        cutoff_str = None
         time_filter = getattr(self, 'time_filter_var', None)
         is_time_filtered = time_filter and time_filter.get() != "All Time"
         if is_time_filtered:
@@ -415,10 +414,18 @@ class Dashboard(ctk.CTkFrame):
                 import datetime
                 cutoff_date = datetime.datetime.now() - datetime.timedelta(days=days)
                 cutoff_str = cutoff_date.strftime("%Y-%m-%d %H:%M:%S")
-                self._all_apps = [app for app in self._all_apps if (app['created_at'] or "1970-01-01") >= cutoff_str]
             except Exception as e:
                 print(f"Error filtering by time: {e}")
         
+        # Remember the exact query so exports match what is on screen
+        self._current_query = {
+            "search_query": search_query,
+            "sort_by": sort_by,
+            "sort_order": self.sort_order,
+            "created_after": cutoff_str
+        }
+        self._all_apps = get_applications(**self._current_query)
+        
         # Limit to 20 if Show All is off, not searching, and no time filter applied
         total_count = len(self._all_apps)
         if not self.show_all_var.get() and not search_query and not is_time_filtered:
@@ -511,6 +518,7 @@ class Dashboard(ctk.CTkFrame):
         self.refresh_list()
 
     def on_add_application(self):
+        from .add_app_dialog import AddAppDialog
         dialog = AddAppDialog(self.winfo_toplevel(), self.save_new_application)
 
     def on_open_analytics(self):
@@ -528,7 +536,6 @@ class Dashboard(ctk.CTkFrame):
 
     def on_reload(self):
         """Scans the root folder for any new directories and syncs with the database using sync_mgr."""
-        from ..core.config_mgr import get_active_root
         from ..core.sync_mgr import sync_workspace
         
         root_path = get_active_root()
@@ -556,28 +563,33 @@ class Dashboard(ctk.CTkFrame):
 
     def save_new_application(self, company, role, job_description=None, cv_template_path=None):
         try:
-            # Check if exists
-            from ..core.database import application_exists, count_applications_with_name
+            # Check if exists (and work out the next "(n)" suffix in the same query)
+            from ..core.database import next_index_for
             final_role = role
-            if application_exists(company, role):
+            next_index = next_index_for(company, role)
+            if next_index is not None:
                 if not messagebox.askyesno("Duplicate Entry", 
                     f"An application for '{company}' - '{role}' already exists.\n\nDo you want to create another one with an index?"):
                     return
                 
                 # Generate indexed name
-                count = count_applications_with_name(company, role)
-                final_role = f"{role} ({count + 1})"
+                final_role = f"{role} ({next_index})"
 
             # 1. Create Folder and templates
             folder_path, creation_time = create_application_folder(company, final_role, job_description, cv_template_path)
             
-            # 2. Update Database
-            app_id = add_application(company, final_role, folder_path, creation_time, job_description)
+            # 2. Update Database (upsert: the folder watcher or the .NET service
+            #    may already have recorded the new folder)
+            app_id = upsert_application(company, final_role, folder_path, creation_time, job_description)
             
             # Write out jalm_id for reliable sync tracking later
             from ..core.file_ops import write_jalm_id
             write_jalm_id(folder_path, app_id)
             
+            # Classify the role in the background so the next report does not wait for it
+            from ..core.classifier_worker import get_classifier_worker
+            get_classifier_worker().enqueue([final_role])
+            
             # 3. Refresh UI
             self.refresh_data()
             
@@ -600,7 +612,8 @@ class Dashboard(ctk.CTkFrame):
         
         # 2. Open Dialog
         from .export_dialog import ExportDialog
-        ExportDialog(self.winfo_toplevel(), apps_to_export, search_query)
+        ExportDialog(self.winfo_toplevel(), apps_to_export, search_query,
+                     table_query=self._current_query)
 
     def destroy(self):
         """Manual destroy override."""
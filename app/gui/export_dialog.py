@@ -1,30 +1,40 @@
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 import os
-from ..core.batch_export import BatchExporter
 
 class ExportDialog(ctk.CTkToplevel):
     """
     A modal dialog that allows users to configure and initiate a batch export.
-    Features include selecting document types (CV/JD) and choosing a destination folder.
+    Features include selecting document types (CV/JD), an optional data table
+    export (CSV / JSON Lines / Parquet) and choosing a destination folder.
     """
-    def __init__(self, parent, app_list, search_query=""):
+    # Label shown in the format menu -> table_export format
+    TABLE_FORMATS = {
+        "CSV": "csv",
+        "JSON Lines": "jsonl",
+        "Parquet": "parquet",
+    }
+
+    def __init__(self, parent, app_list, search_query="", table_query=None):
         super().__init__(parent)
         self.title("Export Options")
-        self.geometry("400x350")
+        self.geometry("400x560")
         self.resizable(False, False)
         
         self.app_list = app_list
         self.search_query = search_query
+        # Filters/sort of the dashboard list, so the table export matches the screen
+        self.table_query = table_query or {"search_query": search_query}
         self.parent = parent
         
         # UI Polish: Center the dialog relative to the main application window.
         self.update_idletasks()
         x = parent.winfo_rootx() + (parent.winfo_width() // 2) - (400 // 2)
-        y = parent.winfo_rooty() + (parent.winfo_height() // 2) - (350 // 2)
+        y = parent.winfo_rooty() + (parent.winfo_height() // 2) - (530 // 2)
         self.geometry(f"+{x}+{y}")
         
         self.grab_set() # Prevent interaction with parent while open
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         self.setup_ui()
         
     def setup_ui(self):
@@ -44,7 +54,41 @@ class ExportDialog(ctk.CTkToplevel):
         self.cv_chk.pack(pady=(10, 5), padx=20, anchor="w")
         
         self.jd_chk = ctk.CTkCheckBox(self.opts_frame, text="Export Job Descriptions", variable=self.jd_var)
-        self.jd_chk.pack(pady=(5, 20), padx=20, anchor="w")
+        self.jd_chk.pack(pady=(5, 5), padx=20, anchor="w")
+        
+        # Data table export (one file with one row per application)
+        self.table_var = ctk.BooleanVar(value=False)
+        self.table_row = ctk.CTkFrame(self.opts_frame, fg_color="transparent")
+        self.table_row.pack(fill="x", pady=(5, 5), padx=20)
+        
+        self.table_chk = ctk.CTkCheckBox(self.table_row, text="Export Data Table", variable=self.table_var)
+        self.table_chk.pack(side="left")
+        
+        # Parquet is only offered when the optional pyarrow package is installed
+        from ..core.table_export import is_parquet_available
+        formats = [label for label, fmt in self.TABLE_FORMATS.items() if fmt != "parquet" or is_parquet_available()]
+        self.table_format_var = ctk.StringVar(value=formats[0])
+        self.table_format_menu = ctk.CTkOptionMenu(self.table_row, values=formats, variable=self.table_format_var, width=110)
+        self.table_format_menu.pack(side="right")
+        
+        # Archive mode: one .zip (with manifest.csv) instead of loose files
+        self.zip_var = ctk.BooleanVar(value=False)
+        self.zip_chk = ctk.CTkCheckBox(self.opts_frame, text="Save documents as a single .zip", variable=self.zip_var)
+        self.zip_chk.pack(pady=(0, 5), padx=20, anchor="w")
+        
+        # Zero-copy mode: hard link / reflink when the target is on the same drive.
+        # Off by default: a hard-linked export shares the file with the workspace.
+        self.link_var = ctk.BooleanVar(value=False)
+        self.link_chk = ctk.CTkCheckBox(self.opts_frame, text="Fast export: link files instead of copying",
+                                        variable=self.link_var)
+        self.link_chk.pack(pady=(0, 5), padx=20, anchor="w")
+        
+        # Incremental mode: update a previous export in the chosen folder in place,
+        # copying only new or changed documents (ignored for .zip output).
+        self.incremental_var = ctk.BooleanVar(value=False)
+        self.incremental_chk = ctk.CTkCheckBox(self.opts_frame, text="Update previous export (only new/changed files)",
+                                               variable=self.incremental_var)
+        self.incremental_chk.pack(pady=(0, 20), padx=20, anchor="w")
         
         # Target Directory Selection: Show current selection and a Browse button
         self.dir_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -67,6 +111,12 @@ class ExportDialog(ctk.CTkToplevel):
         self.export_btn = ctk.CTkButton(self.btn_frame, text="Start Export", command=self.on_export)
         self.export_btn.pack(side="right", expand=True, padx=5)
 
+        # Progress widgets (packed above the buttons once an export starts)
+        self.cancel_event = None
+        self._closed = False  # Set by on_close; the worker then stops posting to the dialog
+        self.progress_bar = ctk.CTkProgressBar(self, mode="determinate")
+        self.progress_label = ctk.CTkLabel(self, text="", text_color="gray", font=("Arial", 12))
+
     def on_browse(self):
         """Opens a standard directory picker."""
         directory = filedialog.askdirectory(parent=self, title="Select Destination")
@@ -74,48 +124,148 @@ class ExportDialog(ctk.CTkToplevel):
             self.path_var.set(directory)
 
     def on_export(self):
-        """Validates inputs and triggers the BatchExporter core logic."""
+        """Validates inputs and starts the BatchExporter (and table export) on a background thread."""
         target_dir = self.path_var.get()
         if not target_dir:
             messagebox.showwarning("Validation Error", "Please select a destination folder.", parent=self)
             return
             
-        if not self.cv_var.get() and not self.jd_var.get():
-            messagebox.showwarning("Validation Error", "Please select at least one document type to export.", parent=self)
+        export_docs = self.cv_var.get() or self.jd_var.get()
+        export_table = self.table_var.get()
+        if not export_docs and not export_table:
+            messagebox.showwarning("Validation Error", "Please select at least one document type or the data table to export.", parent=self)
             return
 
-        # Visual Feedback: Disable buttons to prevent double-clicks during file IO
+        # Visual Feedback: Disable inputs while the export runs. The Cancel
+        # button stays active and now stops the export instead of closing.
         self.export_btn.configure(state="disabled", text="Exporting...")
         self.browse_btn.configure(state="disabled")
-        self.update()
-        
+        self.cancel_btn.configure(text="Stop", command=self.on_cancel_export)
+        self.progress_bar.pack(fill="x", padx=20, pady=(0, 5), before=self.btn_frame)
+        self.progress_bar.set(0)
+        self.progress_label.pack(padx=20, before=self.btn_frame)
+        self.progress_label.configure(text="Looking for documents...")
+
+        import threading
+        self.cancel_event = threading.Event()
+        options = {
+            "export_docs": export_docs,
+            "export_table": export_table,
+            "table_format": self.TABLE_FORMATS[self.table_format_var.get()],
+            "export_cv": self.cv_var.get(),
+            "export_jd": self.jd_var.get(),
+            "as_zip": self.zip_var.get(),
+            "link_files": self.link_var.get(),
+            "incremental": self.incremental_var.get() and not self.zip_var.get()
+        }
+        threading.Thread(target=self._run_export, args=(target_dir, options), daemon=True).start()
+
+    def _post(self, func, *args):
+        """Worker thread: schedules func on the main thread, unless the dialog was closed."""
+        if self._closed:
+            return
+        try:
+            self.after(0, func, *args)
+        except Exception:
+            pass  # Destroyed between the check and the call
+
+    def _run_export(self, target_dir, options):
+        """Worker thread: never touches widgets (or Tk variables) directly, only through _post()."""
         try:
-            # Execute the background export process
-            exporter = BatchExporter()
-            stats = exporter.export(
-                self.app_list, 
-                target_dir, 
-                search_query=self.search_query,
-                export_cv=self.cv_var.get(),
-                export_jd=self.jd_var.get()
-            )
-            
-            # Show final report to user
             msg = "Export Complete!\n\n"
-            if self.cv_var.get():
+            stats = {"errors": [], "cancelled": False}
+
+            if options["export_docs"]:
+                # Imported on demand so the dashboard never pays for the exporter at startup.
+                from ..core.batch_export import BatchExporter, OUTPUT_FOLDER, OUTPUT_ZIP, LINK_AUTO, LINK_COPY
+
+                exporter = BatchExporter()
+                stats = exporter.export(
+                    self.app_list, 
+                    target_dir, 
+                    search_query=self.search_query,
+                    export_cv=options["export_cv"],
+                    export_jd=options["export_jd"],
+                    progress_callback=lambda event: self._post(self._update_progress, event),
+                    cancel_event=self.cancel_event,
+                    output=OUTPUT_ZIP if options["as_zip"] else OUTPUT_FOLDER,
+                    link_strategy=LINK_AUTO if options["link_files"] else LINK_COPY,
+                    incremental=options["incremental"]
+                )
+                if stats.get("archive_path"):
+                    msg += f"Archive: {os.path.basename(stats['archive_path'])}\n"
+            
+            # The table goes in after the documents, so it never pushes the
+            # document export into an Export_<timestamp> subfolder.
+            if options["export_table"] and not self.cancel_event.is_set():
+                table_file = self.export_table(target_dir, options["table_format"])
+                msg += f"Data table: {os.path.basename(table_file)}\n"
+
+            # Build the final report for the user
+            if stats["cancelled"]:
+                msg = "Export Stopped.\n\nFiles copied so far were kept.\n\n"
+            if options["export_cv"]:
                 msg += f"CVs exported: {stats['exported_cvs']}\n"
-            if self.jd_var.get():
+            if options["export_jd"]:
                 msg += f"JDs exported: {stats['exported_jds']}\n"
+            if stats.get("unchanged"):
+                msg += f"Already up to date: {stats['unchanged']}\n"
                 
             if stats['errors']:
                 msg += f"\nErrors ({len(stats['errors'])}):\n" + "\n".join(stats['errors'][:3])
                 if len(stats['errors']) > 3:
                     msg += "\n..."
             
-            messagebox.showinfo("Success", msg, parent=self.parent)
-            self.destroy()
-            
+            self._post(self._on_export_finished, msg)
         except Exception as e:
-            messagebox.showerror("Export Failed", f"An error occurred: {e}", parent=self)
-            self.export_btn.configure(state="normal", text="Start Export")
-            self.browse_btn.configure(state="normal")
+            self._post(self._on_export_failed, e)
+
+    def _update_progress(self, event):
+        """Main thread: shows one per-file event from the exporter."""
+        try:
+            if not self.winfo_exists():
+                return
+            if event["total"]:
+                self.progress_bar.set(event["done"] / event["total"])
+            self.progress_label.configure(text=f"{event['done']}/{event['total']}  {event['name']}")
+        except Exception:
+            pass
+
+    def on_cancel_export(self):
+        """Asks the running export to stop after the files currently being copied."""
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.cancel_btn.configure(state="disabled", text="Stopping...")
+
+    def on_close(self):
+        """Closing the window also stops a running export."""
+        self._closed = True
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+        self.destroy()
+
+    def _on_export_finished(self, msg):
+        messagebox.showinfo("Success", msg, parent=self.parent)
+        try:
+            self.destroy()
+        except Exception:
+            pass  # Already closed by the user
+
+    def _on_export_failed(self, error):
+        messagebox.showerror("Export Failed", f"An error occurred: {error}", parent=self)
+        self.export_btn.configure(state="normal", text="Start Export")
+        self.browse_btn.configure(state="normal")
+        self.cancel_btn.configure(state="normal", text="Cancel", command=self.destroy)
+        self.progress_bar.pack_forget()
+        self.progress_label.pack_forget()
+
+    def export_table(self, target_dir, fmt):
+        """Streams the applications table (same filters/sort as the dashboard) into target_dir."""
+        from datetime import datetime
+        from ..core.table_export import export_applications, FORMATS
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs(target_dir, exist_ok=True)
+        output_path = os.path.join(target_dir, f"applications_{timestamp}{FORMATS[fmt]}")
+        export_applications(output_path, fmt=fmt, **self.table_query)
+        return output_path
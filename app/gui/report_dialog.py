@@ -1,16 +1,32 @@
 import customtkinter as ctk
+from tkinter import ttk
+from ..utils.table_style import style_tables, TABLE_STYLE
+
+# Rows visible per table before its own scrollbar takes over. A ttk.Treeview
+# only draws the visible rows, so a table costs the same few widgets whether
+# it has 5 rows or 5,000 (the old one-frame-per-row tables did not).
+TABLE_VISIBLE_ROWS = 12
+
+# Rows per breakdown requested from get_detailed_analytics; the rest arrives as
+# one "Other (k items)" row that can be expanded with "Show all".
+REPORT_TOP_N = 50
 
 class ReportDialog(ctk.CTkToplevel):
     """
     A detailed summary view that presents application performance metrics.
     Displays conversion rates and categorized breakdowns (Role, Company, Status).
     """
-    def __init__(self, parent, metrics, date_range_text):
+    def __init__(self, parent, metrics, date_range_text, start_date=None, end_date=None):
         super().__init__(parent)
         self.title(f"Analytics Report ({date_range_text})")
         self.geometry("1100x800")
         
         self.metrics = metrics
+        # Date range of the report, needed to expand an "Other" row
+        self.start_date = start_date
+        self.end_date = end_date
+        # Current sort per table: {tree: (column, descending)}
+        self._sort_state = {}
         
         # UI Polish: Center the report dialog.
         self.update_idletasks()
@@ -26,11 +42,12 @@ class ReportDialog(ctk.CTkToplevel):
         self.summary_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.summary_frame.pack(fill="x", padx=20, pady=20)
         
-        total = self.metrics["total_apps"]
-        oa = self.metrics["oa_count"]
-        hr = self.metrics["hr_call_count"]
-        interviewed = self.metrics["interviews_secured"]
-        offers = self.metrics["offers_count"]
+        # .get(): a partial metrics dict (e.g. an empty database) still opens the report
+        total = self.metrics.get("total_apps", 0)
+        oa = self.metrics.get("oa_count", 0)
+        hr = self.metrics.get("hr_call_count", 0)
+        interviewed = self.metrics.get("interviews_secured", 0)
+        offers = self.metrics.get("offers_count", 0)
         
         # Success Rate is the percentage of applications that successfully progressed to an interview.
         rate = (interviewed / total * 100) if total > 0 else 0
@@ -70,7 +87,9 @@ class ReportDialog(ctk.CTkToplevel):
             # Formats [ (Company, Role) ] into [ ("Company - Role", "-") ]
             return [(f"{row[0]} - {row[1]}", "-") for row in roles_list]
         
-        if self.metrics["interview_roles_list"]:
+        style_tables(self)
+
+        if self.metrics.get("interview_roles_list"):
             self._create_table(self.tables_frame, "Interviewed Roles", format_roles(self.metrics["interview_roles_list"]), row=row_idx, col=0, colspan=2, header_name="Application", title_color="#8B5CF6")
             row_idx += 1
 
@@ -83,12 +102,12 @@ class ReportDialog(ctk.CTkToplevel):
             row_idx += 1
 
         # 2. Status Table (Full Width)
-        self._create_table(self.tables_frame, "By Status", self.metrics["by_status"], row=row_idx, col=0, colspan=2, header_name="Status")
+        self._create_table(self.tables_frame, "By Status", self.metrics.get("by_status", []), breakdown="by_status", row=row_idx, col=0, colspan=2, header_name="Status")
         row_idx += 1
         
         # 3. Company & Role Tables (Side by Side)
-        self._create_table(self.tables_frame, "Top Companies", self.metrics["by_company"], row=row_idx, col=0, header_name="Company")
-        self._create_table(self.tables_frame, "Top Roles", self.metrics["by_role"], row=row_idx, col=1, header_name="Role")
+        self._create_table(self.tables_frame, "Top Companies", self.metrics.get("by_company", []), breakdown="by_company", row=row_idx, col=0, header_name="Company")
+        self._create_table(self.tables_frame, "Top Roles", self.metrics.get("by_role", []), breakdown="by_role", row=row_idx, col=1, header_name="Role")
 
     def _create_card(self, parent, title, value, color):
         """Helper to create color-coded metric cards at the top."""
@@ -98,8 +117,9 @@ class ReportDialog(ctk.CTkToplevel):
         ctk.CTkLabel(card, text=title, text_color="white", font=("Arial", 14)).pack(pady=(15, 5))
         ctk.CTkLabel(card, text=str(value), text_color="white", font=("Arial", 28, "bold")).pack(pady=(0, 15))
 
-    def _create_table(self, parent, title, data, row, col, colspan=1, header_name="Name", title_color=None):
-        """Helper to create structured data tables with headers and rows."""
+    def _create_table(self, parent, title, data, row, col, colspan=1, header_name="Name", title_color=None,
+                      breakdown=None):
+        """Helper to create a sortable data table (click a heading to sort by it)."""
         frame = ctk.CTkFrame(parent)
         frame.grid(row=row, column=col, columnspan=colspan, sticky="nsew", padx=10, pady=10)
         
@@ -108,25 +128,106 @@ class ReportDialog(ctk.CTkToplevel):
             title_lbl.configure(text_color=title_color)
         title_lbl.pack(pady=10,anchor="w", padx=15)
         
-        # Header Row
-        header = ctk.CTkFrame(frame, height=30, fg_color="transparent")
-        header.pack(fill="x", padx=10)
-        ctk.CTkLabel(header, text=header_name, font=("Arial", 12, "bold"), anchor="w").pack(side="left", padx=5, expand=True, fill="x")
-        ctk.CTkLabel(header, text="Count", font=("Arial", 12, "bold"), width=50, anchor="e").pack(side="right", padx=5)
-        
-        # Dynamic Rows based on database aggregation
         if not data:
-             ctk.CTkLabel(frame, text="No data available", text_color="gray").pack(pady=20)
-        else:
-            for item in data:
-                # item is a sqlite3.Row object or tuple
-                name = item[0]
-                count = item[1]
-                
-                row_frame = ctk.CTkFrame(frame, fg_color="transparent", height=30)
-                row_frame.pack(fill="x", padx=10, pady=2)
-                
-                name_lbl = ctk.CTkLabel(row_frame, text=str(name), anchor="w")
-                name_lbl.pack(side="left", padx=5, expand=True, fill="x")
-                
-                ctk.CTkLabel(row_frame, text=str(count), width=50, anchor="e").pack(side="right", padx=5)
+            ctk.CTkLabel(frame, text="No data available", text_color="gray").pack(pady=20)
+            return None
+
+        body = ctk.CTkFrame(frame, fg_color="transparent")
+        body.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+        tree = ttk.Treeview(body, columns=("name", "count"), show="headings", style=TABLE_STYLE,
+                            height=min(len(data), TABLE_VISIBLE_ROWS), selectmode="browse")
+        tree.heading("name", text=header_name, anchor="w", command=lambda: self._sort_table(tree, "name"))
+        tree.heading("count", text="Count", anchor="e", command=lambda: self._sort_table(tree, "count"))
+        tree.column("name", anchor="w", stretch=True, width=300)
+        tree.column("count", anchor="e", stretch=False, width=80)
+
+        # Rows are sqlite3.Row objects or tuples: (name, count)
+        for item in data:
+            tree.insert("", "end", values=(str(item[0]), str(item[1])))
+
+        if len(data) > TABLE_VISIBLE_ROWS:
+            self._add_scrollbar(body, tree)
+        tree.pack(side="left", fill="both", expand=True)
+
+        # Truncated breakdown: the last row is "Other (k items)" (see get_detailed_analytics)
+        other = self.metrics.get("other", {}).get(breakdown) if breakdown else None
+        if other:
+            tree.item(tree.get_children("")[-1], tags=("other",))
+            show_all_btn = ctk.CTkButton(frame, text=f"Show all ({other['items']} more)", height=24,
+                                         fg_color="transparent", border_width=1)
+            show_all_btn.configure(command=lambda: self._expand_other(tree, breakdown, other, show_all_btn))
+            show_all_btn.pack(pady=(0, 10))
+        return tree
+
+    def _add_scrollbar(self, body, tree):
+        scrollbar = ctk.CTkScrollbar(body, command=tree.yview)
+        scrollbar.pack(side="right", fill="y")
+        tree.configure(yscrollcommand=scrollbar.set)
+
+    def _expand_other(self, tree, breakdown, other, button):
+        """Replaces the "Other" row with the rows behind it (queried on a worker thread)."""
+        button.configure(state="disabled", text="Loading...")
+
+        def fetch():
+            from ..core.database import get_analytics_breakdown
+            try:
+                rows = get_analytics_breakdown(breakdown, self.start_date, self.end_date, offset=other["offset"])
+                self.after(0, self._insert_tail, tree, rows, button)
+            except Exception as e:
+                print(f"Error expanding report table: {e}")
+                self.after(0, lambda: button.configure(state="normal", text="Show all (retry)"))
+
+        import threading
+        threading.Thread(target=fetch, daemon=True).start()
+
+    def _insert_tail(self, tree, rows, button):
+        """Main thread: swaps the "Other" row for the detailed rows."""
+        try:
+            if not self.winfo_exists():
+                return
+            had_scrollbar = len(tree.get_children("")) > TABLE_VISIBLE_ROWS
+            tree.delete(*tree.tag_has("other"))
+            for name, count in rows:
+                tree.insert("", "end", values=(str(name), str(count)))
+
+            count = len(tree.get_children(""))
+            tree.configure(height=min(count, TABLE_VISIBLE_ROWS))
+            if count > TABLE_VISIBLE_ROWS and not had_scrollbar:
+                tree.pack_forget()
+                self._add_scrollbar(tree.master, tree)
+                tree.pack(side="left", fill="both", expand=True)
+            if tree in self._sort_state:
+                self._apply_sort(tree)
+            button.destroy()
+        except Exception:
+            pass
+
+    def _sort_table(self, tree, column):
+        """Sorts a table by one column; clicking the same heading again reverses the order."""
+        previous_column, previous_desc = self._sort_state.get(tree, (None, False))
+        # Counts start high-to-low, names A-Z
+        descending = not previous_desc if previous_column == column else column == "count"
+        self._sort_state[tree] = (column, descending)
+        self._apply_sort(tree)
+
+    def _apply_sort(self, tree):
+        column, descending = self._sort_state[tree]
+
+        def sort_key(iid):
+            value = tree.set(iid, column)
+            if column == "count":
+                return int(value) if value.isdigit() else -1  # '-' (no count) sorts last
+            return value.casefold()
+
+        # The "Other (k items)" row always stays at the bottom
+        others = set(tree.tag_has("other"))
+        rows = sorted((iid for iid in tree.get_children("") if iid not in others), key=sort_key, reverse=descending)
+        for index, iid in enumerate(rows + [iid for iid in tree.get_children("") if iid in others]):
+            tree.move(iid, "", index)
+
+        for col in ("name", "count"):
+            text = tree.heading(col, "text").rstrip(" ▲▼")
+            if col == column:
+                text += " ▼" if descending else " ▲"
+            tree.heading(col, text=text)
@@ -1,99 +1,288 @@
 import customtkinter as ctk
-from tkinter import messagebox
-from ..core.database import get_all_role_mappings, update_role_mapping, clear_all_role_mappings
+from tkinter import messagebox, ttk, filedialog
+from ..core.database import (
+    get_role_mappings_page, count_role_mappings, update_role_mappings, clear_all_role_mappings,
+    remap_role_mappings, export_role_mappings_csv, import_role_mappings_csv
+)
+from ..utils.table_style import style_tables, TABLE_STYLE
 
 from ..core.constants import CATEGORIES
 
+# Rows fetched per page. The next page is loaded when the list is scrolled
+# near its end, so opening the dialog costs one small query whatever the size
+# of the cache, and the Treeview only draws the rows that are visible.
+PAGE_SIZE = 200
+
+# Wait this long after the last keystroke before searching (ms)
+SEARCH_DELAY_MS = 250
+
 class RoleMappingDialog(ctk.CTkToplevel):
     def __init__(self, parent, on_close_callback=None):
         super().__init__(parent)
         self.title("Manage Role Classifications")
-        self.geometry("600x600")
-        
+        self.geometry("600x640")
+
         # UI Polish: Center the dialog
         self.update_idletasks()
         x = parent.winfo_rootx() + (parent.winfo_width() // 2) - (600 // 2)
-        y = parent.winfo_rooty() + (parent.winfo_height() // 2) - (600 // 2)
+        y = parent.winfo_rooty() + (parent.winfo_height() // 2) - (640 // 2)
         self.geometry(f"+{x}+{y}")
-        
+
         self.on_close_callback = on_close_callback
-        
+
+        # Edits are kept here ({original_role: category}) and written in one
+        # transaction when the dialog closes.
+        self.pending = {}
+        self.search_text = ""
+        self.loaded_rows = 0
+        self.total_rows = 0
+        self.last_role = None      # Key of the last loaded row (pages are keyset-based)
+        self.all_loaded = False
+        self._search_job = None
+
         # Close event
         self.protocol("WM_DELETE_WINDOW", self.on_close)
-        
+
         self.setup_ui()
         self.load_data()
-        
+
     def setup_ui(self):
         # 1. Header & Actions
         self.header_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.header_frame.pack(fill="x", padx=20, pady=15)
-        
+
         ctk.CTkLabel(self.header_frame, text="Current Classifications", font=("Arial", 16, "bold")).pack(side="left")
-        
-        self.reclassify_btn = ctk.CTkButton(self.header_frame, text="Re-Classify All with LLM", 
-                                            fg_color="#EF4444", hover_color="#B91C1C", 
+
+        self.reclassify_btn = ctk.CTkButton(self.header_frame, text="Re-Classify All with LLM",
+                                            fg_color="#EF4444", hover_color="#B91C1C",
                                             command=self.confirm_reclassify)
         self.reclassify_btn.pack(side="right")
-        
-        # 2. Scrollable Data Grid
-        self.grid_frame = ctk.CTkScrollableFrame(self)
-        self.grid_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
-        
-        # Grid Headers
-        ctk.CTkLabel(self.grid_frame, text="Original Role", font=("Arial", 12, "bold"), anchor="w").grid(row=0, column=0, sticky="ew", padx=10, pady=5)
-        ctk.CTkLabel(self.grid_frame, text="Mapped Group", font=("Arial", 12, "bold"), anchor="w").grid(row=0, column=1, sticky="ew", padx=10, pady=5)
-        
-        self.grid_frame.grid_columnconfigure(0, weight=1)
-        self.grid_frame.grid_columnconfigure(1, weight=1)
-        
-        self.row_widgets = []
-        
-        # 3. Footer
-        self.close_btn = ctk.CTkButton(self, text="Close", fg_color="gray", command=self.on_close)
-        self.close_btn.pack(side="bottom", pady=20)
-        
+
+        # 1b. Bulk operations
+        self.bulk_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.bulk_frame.pack(fill="x", padx=20, pady=(0, 10))
+
+        self.remap_btn = ctk.CTkButton(self.bulk_frame, text="Bulk Remap...", width=120, command=self.open_bulk_remap)
+        self.remap_btn.pack(side="left")
+        self.export_btn = ctk.CTkButton(self.bulk_frame, text="Export CSV", width=100, fg_color="gray",
+                                        command=self.on_export_csv)
+        self.export_btn.pack(side="right")
+        self.import_btn = ctk.CTkButton(self.bulk_frame, text="Import CSV", width=100, fg_color="gray",
+                                        command=self.on_import_csv)
+        self.import_btn.pack(side="right", padx=(0, 10))
+
+        # 2. Incremental search (matches the role or the group)
+        self.search_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.search_frame.pack(fill="x", padx=20, pady=(0, 10))
+
+        self.search_var = ctk.StringVar(value="")
+        self.search_entry = ctk.CTkEntry(self.search_frame, textvariable=self.search_var,
+                                         placeholder_text="Search roles or groups...")
+        self.search_entry.pack(side="left", fill="x", expand=True)
+        self.search_entry.bind("<KeyRelease>", self.on_search_changed)
+
+        self.count_label = ctk.CTkLabel(self.search_frame, text="", text_color="gray", width=110, anchor="e")
+        self.count_label.pack(side="right", padx=(10, 0))
+
+        # 4. Footer (packed before the table so it keeps its space when the window shrinks)
+        self.footer_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.footer_frame.pack(side="bottom", fill="x", padx=20, pady=20)
+
+        self.pending_label = ctk.CTkLabel(self.footer_frame, text="", text_color="gray")
+        self.pending_label.pack(side="left")
+
+        self.close_btn = ctk.CTkButton(self.footer_frame, text="Close", fg_color="gray", command=self.on_close)
+        self.close_btn.pack(side="right")
+
+        # 3b. Editor: one dropdown for the selected row(s) instead of one per row
+        self.editor_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.editor_frame.pack(side="bottom", fill="x", padx=20)
+
+        self.editor_label = ctk.CTkLabel(self.editor_frame, text="Select roles to change their group", anchor="w")
+        self.editor_label.pack(side="left", fill="x", expand=True)
+
+        self.category_var = ctk.StringVar(value="")
+        self.category_menu = ctk.CTkOptionMenu(self.editor_frame, values=list(CATEGORIES), variable=self.category_var,
+                                               command=self.on_category_changed, state="disabled", width=200)
+        self.category_menu.pack(side="right")
+
+        # 3. Data Grid
+        self.grid_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.grid_frame.pack(fill="both", expand=True, padx=20, pady=(0, 10))
+
+        self.tree = ttk.Treeview(self.grid_frame, columns=("role", "category"), show="headings",
+                                 style=style_tables(self), selectmode="extended")
+        self.tree.heading("role", text="Original Role", anchor="w")
+        self.tree.heading("category", text="Mapped Group", anchor="w")
+        self.tree.column("role", anchor="w", stretch=True, width=300)
+        self.tree.column("category", anchor="w", stretch=True, width=200)
+        self.tree.tag_configure("edited", foreground="#F59E0B")
+
+        self.scrollbar = ctk.CTkScrollbar(self.grid_frame, command=self.tree.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.configure(yscrollcommand=self.on_tree_scrolled)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.tree.bind("<<TreeviewSelect>>", self.on_selection_changed)
+
+        self.empty_label = ctk.CTkLabel(self.grid_frame, text="", text_color="gray")
+
     def load_data(self):
-        # Clear existing rows
-        for widget in self.row_widgets:
-            widget.destroy()
-        self.row_widgets.clear()
-        
-        mappings = get_all_role_mappings()
-        
-        if not mappings:
-            lbl = ctk.CTkLabel(self.grid_frame, text="No roles have been classified yet.\nOpen the Analytics Report to let the LLM classify your data.", text_color="gray")
-            lbl.grid(row=1, column=0, columnspan=2, pady=30)
-            self.row_widgets.append(lbl)
+        """(Re)starts the list at the first page of the current search."""
+        self.tree.delete(*self.tree.get_children(""))
+        self.loaded_rows = 0
+        self.last_role = None
+        self.all_loaded = False
+        self.total_rows = count_role_mappings(self.search_text)
+        self.load_next_page()
+
+        if self.total_rows == 0:
+            if self.search_text:
+                self.empty_label.configure(text="No classifications match your search.")
+            else:
+                self.empty_label.configure(text="No roles have been classified yet.\nOpen the Analytics Report to let the LLM classify your data.")
+            self.empty_label.place(relx=0.5, rely=0.4, anchor="center")
+        else:
+            self.empty_label.place_forget()
+        self.count_label.configure(text=f"{self.total_rows} roles")
+        self.on_selection_changed()
+
+    def load_next_page(self):
+        """Appends the next PAGE_SIZE rows, if any are left."""
+        if self.all_loaded:
+            return
+        # Keyset paging: the classifier may add roles while the dialog is open,
+        # which would shift OFFSET pages and repeat already loaded rows.
+        rows = get_role_mappings_page(self.search_text, limit=PAGE_SIZE, after=self.last_role)
+        for original_role, mapped_category in rows:
+            if self.tree.exists(original_role):
+                continue
+            # Unsaved edits win over what is stored
+            category = self.pending.get(original_role, mapped_category)
+            self.tree.insert("", "end", iid=original_role, values=(original_role, category),
+                             tags=("edited",) if original_role in self.pending else ())
+        self.loaded_rows += len(rows)
+        if rows:
+            self.last_role = rows[-1][0]
+        self.all_loaded = len(rows) < PAGE_SIZE
+
+    def on_tree_scrolled(self, first, last):
+        """yscrollcommand: moves the scrollbar and loads more rows near the end of the list."""
+        self.scrollbar.set(first, last)
+        if float(last) > 0.9 and not self.all_loaded:
+            self.load_next_page()
+
+    def on_search_changed(self, event=None):
+        """Debounced: searches once typing pauses."""
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DELAY_MS, self._run_search)
+
+    def _run_search(self):
+        self._search_job = None
+        text = self.search_var.get().strip()
+        if text != self.search_text:
+            self.search_text = text
+            self.load_data()
+
+    def on_selection_changed(self, event=None):
+        """Shows the group of the selected row(s) in the editor dropdown."""
+        selected = self.tree.selection()
+        if not selected:
+            self.editor_label.configure(text="Select roles to change their group")
+            self.category_menu.configure(state="disabled")
+            self.category_var.set("")
             return
 
-        for index, row in enumerate(mappings):
-            original_role = row[0]
-            mapped_category = row[1]
-            
-            # Row Frame
-            lbl_role = ctk.CTkLabel(self.grid_frame, text=original_role, anchor="w")
-            lbl_role.grid(row=index+1, column=0, sticky="ew", padx=10, pady=5)
-            
-            # Use the categories list, ensuring the current value is always included even if it's off-list
-            current_categories = list(CATEGORIES)
-            if mapped_category and mapped_category not in current_categories:
-                current_categories.append(mapped_category)
-                
-            opt_category = ctk.CTkOptionMenu(
-                self.grid_frame, 
-                values=current_categories,
-                command=lambda new_val, role=original_role: self.on_category_changed(role, new_val)
-            )
-            opt_category.set(mapped_category)
-            opt_category.grid(row=index+1, column=1, sticky="ew", padx=10, pady=5)
-            
-            self.row_widgets.extend([lbl_role, opt_category])
-
-    def on_category_changed(self, original_role, new_category):
-        """Called automatically when the user selects a new dropdown value."""
-        update_role_mapping(original_role, new_category)
-        
+        categories = {self.tree.set(iid, "category") for iid in selected}
+        # Keep an off-list category selectable, like the old per-row menus did
+        values = list(CATEGORIES)
+        for category in sorted(categories):
+            if category and category not in values:
+                values.append(category)
+        self.category_menu.configure(values=values, state="normal")
+        self.category_var.set(categories.pop() if len(categories) == 1 else "")
+
+        if len(selected) == 1:
+            self.editor_label.configure(text=f"Group for '{selected[0]}':")
+        else:
+            self.editor_label.configure(text=f"Group for {len(selected)} selected roles:")
+
+    def on_category_changed(self, new_category):
+        """Called when the user picks a group: applies it to every selected row (saved on close)."""
+        for original_role in self.tree.selection():
+            self.pending[original_role] = new_category
+            self.tree.set(original_role, "category", new_category)
+            self.tree.item(original_role, tags=("edited",))
+        self._update_pending_label()
+
+    def _update_pending_label(self):
+        count = len(self.pending)
+        self.pending_label.configure(text=f"{count} unsaved change{'s' if count != 1 else ''}" if count else "")
+
+    def save_mapping(self):
+        """Writes all pending edits in one transaction."""
+        if self.pending:
+            update_role_mappings(self.pending)
+            self.pending.clear()
+            self._update_pending_label()
+
+    def open_bulk_remap(self):
+        """Small dialog: move every title matching a pattern and/or group to another group."""
+        dialog = ctk.CTkToplevel(self)
+        dialog.title("Bulk Remap")
+        dialog.geometry("380x300")
+        dialog.transient(self)
+        dialog.grab_set()
+
+        ctk.CTkLabel(dialog, text="Titles matching (use * as wildcard):").pack(pady=(15, 5), padx=20, anchor="w")
+        pattern_var = ctk.StringVar(value=f"*{self.search_text}*" if self.search_text else "")
+        ctk.CTkEntry(dialog, textvariable=pattern_var, placeholder_text="e.g. *data engineer*").pack(fill="x", padx=20)
+
+        any_group = "(any group)"
+        ctk.CTkLabel(dialog, text="Currently in group:").pack(pady=(10, 5), padx=20, anchor="w")
+        from_var = ctk.StringVar(value=any_group)
+        ctk.CTkOptionMenu(dialog, values=[any_group] + list(CATEGORIES), variable=from_var).pack(fill="x", padx=20)
+
+        ctk.CTkLabel(dialog, text="Move to group:").pack(pady=(10, 5), padx=20, anchor="w")
+        to_var = ctk.StringVar(value=CATEGORIES[0])
+        ctk.CTkOptionMenu(dialog, values=list(CATEGORIES), variable=to_var).pack(fill="x", padx=20)
+
+        def apply():
+            pattern = pattern_var.get().strip() or None
+            category = None if from_var.get() == any_group else from_var.get()
+            if pattern is None and category is None:
+                messagebox.showwarning("Bulk Remap", "Enter a pattern or choose a group.", parent=dialog)
+                return
+            self.save_mapping()  # Pending edits first, so the bulk change is applied on top of them
+            changed = remap_role_mappings(to_var.get(), pattern=pattern, category=category)
+            dialog.destroy()
+            self.load_data()
+            messagebox.showinfo("Bulk Remap", f"{changed} role(s) moved to '{to_var.get()}'.", parent=self)
+
+        ctk.CTkButton(dialog, text="Apply", command=apply).pack(pady=20)
+
+    def on_export_csv(self):
+        path = filedialog.asksaveasfilename(parent=self, title="Export Classifications", defaultextension=".csv",
+                                            initialfile="role_mappings.csv", filetypes=[("CSV files", "*.csv")])
+        if not path:
+            return
+        self.save_mapping()
+        count = export_role_mappings_csv(path)
+        messagebox.showinfo("Export CSV", f"{count} classifications exported.", parent=self)
+
+    def on_import_csv(self):
+        path = filedialog.askopenfilename(parent=self, title="Import Classifications", filetypes=[("CSV files", "*.csv")])
+        if not path:
+            return
+        self.save_mapping()
+        try:
+            count = import_role_mappings_csv(path)
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Import CSV", f"Could not import: {e}", parent=self)
+            return
+        self.load_data()
+        messagebox.showinfo("Import CSV", f"{count} classifications imported.", parent=self)
+
     def confirm_reclassify(self):
         """Asks for confirmation before clearing the cache."""
         confirm = messagebox.askyesno(
@@ -103,10 +292,17 @@ class RoleMappingDialog(ctk.CTkToplevel):
         )
         if confirm:
             clear_all_role_mappings()
+            self.pending.clear()
+            self._update_pending_label()
             self.load_data()
             messagebox.showinfo("Success", "Cache cleared. Re-classification will occur when the report is next generated.", parent=self)
-            
+
     def on_close(self):
+        try:
+            self.save_mapping()
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not save your changes: {e}", parent=self)
+            return
         if self.on_close_callback:
             self.on_close_callback()
         self.destroy()
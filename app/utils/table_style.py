@@ -0,0 +1,19 @@
+import customtkinter as ctk
+from tkinter import ttk
+
+# ttk widgets do not follow the CustomTkinter theme by themselves. This gives
+# every Treeview table in the app (reports, role mappings) the same colours.
+TABLE_STYLE = "JALM.Treeview"
+
+
+def style_tables(widget):
+    """Configures TABLE_STYLE for the current appearance mode and returns its name."""
+    dark = ctk.get_appearance_mode() == "Dark"
+    bg, fg, heading_bg = ("#2B2B2B", "#DCE4EE", "#3A3A3A") if dark else ("#F9F9FA", "#1A1A1A", "#E5E5E5")
+    style = ttk.Style(widget)
+    style.configure(TABLE_STYLE, background=bg, fieldbackground=bg, foreground=fg,
+                    rowheight=26, borderwidth=0, font=("Arial", 12))
+    style.configure(f"{TABLE_STYLE}.Heading", background=heading_bg, foreground=fg,
+                    font=("Arial", 12, "bold"), relief="flat")
+    style.map(TABLE_STYLE, background=[("selected", "#1F6AA5")], foreground=[("selected", "white")])
+    return TABLE_STYLE
@@ -0,0 +1,250 @@
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Allow `python benchmarks/ollama_stub.py` from the project root.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Local stand-in for the Ollama HTTP API, for tests and offline benchmarks.
+# It speaks the subset JALM uses:
+#   GET  /api/tags      -> {"models": [{"name": ...}, ...]}
+#   POST /api/generate  -> answers the "Title: ...\nCategory:" prompt with the
+#                          keyword rules of run_benchmarks (or any callable),
+#                          streamed token by token or as one JSON object,
+#                          honouring `num_predict` and a `format` JSON schema.
+#   POST /api/embed     -> {"embeddings": [...]} from a small hashed vectorizer
+#                          (EMBED_DIM dimensions, deterministic).
+# Latency, per-token delay and errors can be injected, so real HTTP behaviour
+# (timeouts, slow answers, concurrent requests, refused connections, early
+# disconnects) can be exercised without a model.
+
+TITLE_PATTERN = re.compile(r"^Title:\s*(.*)$", re.MULTILINE)
+TOKEN_PATTERN = re.compile(r"\s*\S+")
+EMBED_DIM = 256
+
+
+def _default_answer(title):
+    from benchmarks.run_benchmarks import stub_classify_job_title
+    return stub_classify_job_title(title)
+
+
+def split_tokens(text):
+    """Splits an answer into word-sized 'tokens' (leading space kept, like a real tokenizer)."""
+    return TOKEN_PATTERN.findall(text)
+
+
+class StubOllamaServer:
+    """
+    Threaded HTTP server imitating Ollama.
+
+    Args:
+        answer (callable): title -> category (default: the benchmark keyword rules).
+        latency (float): Seconds before the first byte of every response.
+        token_delay (float): Seconds between two streamed tokens.
+        error_rate (float): Fraction (0..1) of /api/generate requests answered with `error_status`.
+        fail_first (int): The first n /api/generate requests fail (deterministic error injection).
+        error_status (int): HTTP status of injected errors.
+        models (list): Names reported by /api/tags.
+        seed (int): Seed for error_rate, so a run can be repeated exactly.
+    """
+    def __init__(self, answer=None, latency=0.0, token_delay=0.0, error_rate=0.0, fail_first=0,
+                 error_status=500, models=("llama3.2",), seed=0, host="127.0.0.1", port=0):
+        self.answer = answer or _default_answer
+        self.latency = latency
+        self.token_delay = token_delay
+        self.error_rate = error_rate
+        self.fail_first = fail_first
+        self.error_status = error_status
+        self.models = list(models)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._active = 0
+        self.stats = {"requests": 0, "errors": 0, "tokens_sent": 0, "disconnects": 0, "max_concurrent": 0,
+                      "embed_requests": 0, "embedded_texts": 0}
+        self.requests = []  # Parsed /api/generate payloads, in arrival order
+
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def host(self):
+        """'host:port' as expected by OLLAMA_HOST."""
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    @property
+    def url(self):
+        return f"http://{self.host}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="ollama-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops serving; later connections are refused. Safe to call twice."""
+        if self._thread is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @contextmanager
+    def as_ollama_host(self):
+        """Points llm_service (and anything else honouring OLLAMA_HOST) at this server."""
+        previous = os.environ.get("OLLAMA_HOST")
+        os.environ["OLLAMA_HOST"] = self.host
+        try:
+            yield self
+        finally:
+            if previous is None:
+                os.environ.pop("OLLAMA_HOST", None)
+            else:
+                os.environ["OLLAMA_HOST"] = previous
+
+    # --- Request handling ---
+
+    def _should_fail(self):
+        with self._lock:
+            if self.stats["requests"] <= self.fail_first:
+                return True
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def _reply_text(self, payload):
+        match = TITLE_PATTERN.search(payload.get("prompt", ""))
+        category = self.answer(match.group(1).strip() if match else "")
+        if payload.get("format"):
+            return json.dumps({"category": category})
+        return category
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass  # Keep test and benchmark output clean
+
+            def _send_json(self, status, body):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    time.sleep(stub.latency)
+                    self._send_json(200, {"models": [{"name": name} for name in stub.models]})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path not in ("/api/generate", "/api/embed"):
+                    self._send_json(404, {"error": "not found"})
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/api/embed":
+                    self._embed(payload)
+                    return
+                with stub._lock:
+                    stub.stats["requests"] += 1
+                    stub.requests.append(payload)
+                    stub._active += 1
+                    stub.stats["max_concurrent"] = max(stub.stats["max_concurrent"], stub._active)
+                try:
+                    time.sleep(stub.latency)
+                    if stub._should_fail():
+                        with stub._lock:
+                            stub.stats["errors"] += 1
+                        self._send_json(stub.error_status, {"error": "injected failure"})
+                        return
+                    self._generate(payload)
+                finally:
+                    with stub._lock:
+                        stub._active -= 1
+
+            def _embed(self, payload):
+                from app.core.embedding_classifier import local_vectors
+                texts = payload.get("input", [])
+                texts = [texts] if isinstance(texts, str) else texts
+                with stub._lock:
+                    stub.stats["embed_requests"] += 1
+                    stub.stats["embedded_texts"] += len(texts)
+                time.sleep(stub.latency)
+                vectors = local_vectors(texts, dim=EMBED_DIM) if texts else []
+                self._send_json(200, {"model": payload.get("model"), "embeddings": [v.tolist() for v in vectors]})
+
+            def _generate(self, payload):
+                tokens = split_tokens(stub._reply_text(payload))
+                num_predict = payload.get("options", {}).get("num_predict")
+                if num_predict is not None and num_predict >= 0:
+                    tokens = tokens[:num_predict]
+
+                if not payload.get("stream", True):
+                    with stub._lock:
+                        stub.stats["tokens_sent"] += len(tokens)
+                    self._send_json(200, {"model": payload.get("model"), "response": "".join(tokens),
+                                          "done": True, "eval_count": len(tokens)})
+                    return
+
+                # Streaming: one JSON object per line, no Content-Length (HTTP/1.0, closed at the end)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.end_headers()
+                try:
+                    for token in tokens:
+                        self.wfile.write(json.dumps({"response": token, "done": False}).encode("utf-8") + b"\n")
+                        self.wfile.flush()
+                        with stub._lock:
+                            stub.stats["tokens_sent"] += 1
+                        time.sleep(stub.token_delay)
+                    self.wfile.write(json.dumps({"response": "", "done": True,
+                                                 "eval_count": len(tokens)}).encode("utf-8") + b"\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client stopped reading (early termination): a real server stops generating here
+                    with stub._lock:
+                        stub.stats["disconnects"] += 1
+
+        return Handler
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stub Ollama server (rule-based answers, no model).")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each response")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Seconds between streamed tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of failing /api/generate calls")
+    args = parser.parse_args(argv)
+
+    server = StubOllamaServer(latency=args.latency, token_delay=args.token_delay,
+                              error_rate=args.error_rate, port=args.port)
+    print(f"[stub] Ollama stub listening on {server.url} (Ctrl+C to stop)")
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
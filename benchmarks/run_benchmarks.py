@@ -0,0 +1,262 @@
+import json
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+# Allow `python benchmarks/run_benchmarks.py` from the project root.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.workspace_gen import generate_workspace, add_new_folders
+
+DEFAULT_SCALES = [1000, 10000, 100000]
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Keyword rules used instead of Ollama so the benchmark is deterministic and offline.
+STUB_RULES = [
+    ("machine learning", "Machine Learning Engineer"),
+    ("data engineer", "Data Engineer"),
+    ("data scientist", "Data Scientist"),
+    ("data analyst", "Data Analyst"),
+    ("analyst", "Analyst - other"),
+    ("graduate", "Graduate Program"),
+    ("devops", "DevOps / Infrastructure"),
+    ("reliability", "DevOps / Infrastructure"),
+    ("cloud", "DevOps / Infrastructure"),
+    ("product", "Product Manager"),
+    ("designer", "UI/UX Designer"),
+    ("security", "Cybersecurity"),
+    ("support", "IT Support"),
+    ("sales", "Sales / Marketing"),
+    ("marketing", "Sales / Marketing"),
+    ("engineer", "Software Engineer"),
+    ("developer", "Software Engineer"),
+]
+
+
+def stub_classify_job_title(role_name, model_name=None):
+    """Offline stand-in for llm_service.classify_job_title / request_category."""
+    lowered = role_name.lower()
+    for keyword, category in STUB_RULES:
+        if keyword in lowered:
+            return category
+    return "Other"
+
+
+@contextmanager
+def bound_workspace(root_path, llm_server=None):
+    """
+    Points every config lookup at `root_path` without touching the user's
+    real config.json, and swaps the LLM for the offline stub.
+
+    With `llm_server` (a running StubOllamaServer) the real HTTP client is
+    used against that server instead, so classification is timed end to end.
+    """
+    from app.core import config_mgr, llm_service
+
+    global_cfg = Path(root_path).parent / f"{Path(root_path).name}_config.json"
+    with open(global_cfg, "w") as f:
+        json.dump({"active_root": str(root_path)}, f)
+
+    with mock.patch.object(config_mgr, "get_global_config_path", return_value=global_cfg):
+        if llm_server is not None:
+            with llm_server.as_ollama_host():
+                yield
+        else:
+            with mock.patch.object(llm_service, "classify_job_title", side_effect=stub_classify_job_title), \
+                    mock.patch.object(llm_service, "request_category", side_effect=stub_classify_job_title):
+                yield
+
+
+def time_call(func, repeat=1, setup=None):
+    """Runs `func` `repeat` times and returns wall-clock statistics in seconds."""
+    samples = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start)
+    return {
+        "min": round(min(samples), 6),
+        "median": round(statistics.median(samples), 6),
+        "max": round(max(samples), 6),
+        "repeat": repeat
+    }
+
+
+def run_scale(num_apps, work_dir, repeat=3, roles_per_company=5, llm_server=None):
+    """
+    Generates a workspace of `num_apps` applications and times every core path.
+    With `llm_server`, role classification goes over HTTP to that StubOllamaServer.
+    """
+    from app.core.sync_mgr import sync_workspace, sync_paths
+    from app.core.database import get_applications, get_detailed_analytics
+    from app.core.batch_export import BatchExporter
+
+    root = Path(work_dir) / f"workspace_{num_apps}"
+    start = time.perf_counter()
+    summary = generate_workspace(root, num_apps, roles_per_company)
+    generate_seconds = time.perf_counter() - start
+
+    timings = {}
+    with bound_workspace(root, llm_server):
+        # 1. Reconciling an untouched workspace (what "Scan & Reload" costs on every click)
+        timings["sync_workspace_noop"] = time_call(lambda: sync_workspace(str(root)), repeat)
+
+        # 2. Reconciling after a handful of new folders appeared on disk
+        new_count = max(1, num_apps // 100)
+        add_new_folders(root, new_count)
+        timings["sync_workspace_1pct_new"] = time_call(lambda: sync_workspace(str(root)), 1)
+        timings["sync_workspace_1pct_new"]["new_folders"] = new_count
+
+        # 2b. Picking up a single new folder with a targeted sync (what the folder watcher does)
+        one_new = add_new_folders(root, 1, company="Zeta Single Arrival")
+        timings["sync_paths_one_new"] = time_call(lambda: sync_paths(one_new, str(root)), 1)
+
+        # 3. Dashboard list queries
+        timings["get_applications_default"] = time_call(lambda: get_applications(), repeat)
+        timings["get_applications_search"] = time_call(lambda: get_applications("Engineer"), repeat)
+        timings["get_applications_sort_status"] = time_call(
+            lambda: get_applications(sort_by="Status", sort_order="ASC"), repeat)
+
+        # 4. Summary report: the first run fills the role_mappings cache, later runs hit it
+        requests_before = llm_server.stats["requests"] if llm_server else 0
+        timings["get_detailed_analytics_cold"] = time_call(lambda: get_detailed_analytics(), 1)
+        if llm_server is not None:
+            # Classification throughput through the real client (stream parsing, early stop)
+            cold = timings["get_detailed_analytics_cold"]
+            cold["llm_requests"] = llm_server.stats["requests"] - requests_before
+            cold["titles_per_second"] = round(cold["llm_requests"] / cold["median"], 1) if cold["median"] else None
+        timings["get_detailed_analytics_warm"] = time_call(lambda: get_detailed_analytics(), repeat)
+
+        # 4b. Re-opening the same report through the report cache (one change_log check)
+        from app.core.report_cache import ReportCache
+        report_cache = ReportCache()
+        report_cache.get_or_compute()
+        timings["report_cache_hit"] = time_call(lambda: report_cache.get_or_compute(), repeat)
+
+        # 5. Batch export of every application (CV + JD) into an empty folder
+        apps = get_applications()
+        export_root = Path(work_dir) / f"export_{num_apps}"
+
+        def fresh_target():
+            if export_root.exists():
+                shutil.rmtree(export_root)
+            return (str(export_root),)
+
+        timings["batch_export_all"] = time_call(
+            lambda target: BatchExporter().export(apps, target, "Bench"), 1, setup=fresh_target)
+        timings["batch_export_all"]["applications"] = len(apps)
+
+        # 5b. Same export with links instead of byte copies (same volume)
+        timings["batch_export_all_linked"] = time_call(
+            lambda target: BatchExporter().export(apps, target, "Bench", link_strategy="auto"), 1, setup=fresh_target)
+
+        # 5c. Re-running an incremental export when nothing changed (only stats, no copies)
+        fresh_target()
+        BatchExporter().export(apps, str(export_root), "Bench", incremental=True)
+        timings["batch_export_incremental_noop"] = time_call(
+            lambda: BatchExporter().export(apps, str(export_root), "Bench", incremental=True), 1)
+
+    return {
+        "scale": num_apps,
+        "workspace": summary,
+        "generate_seconds": round(generate_seconds, 3),
+        "timings": timings
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=str(Path(__file__).parent))
+        return out.stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def run_benchmarks(scales=None, output=None, repeat=3, keep=False, work_dir=None,
+                   llm_stub=False, llm_latency=0.0, llm_token_delay=0.0):
+    """
+    Runs the full suite and writes a JSON report.
+
+    With `llm_stub`, classification goes through llm_service's HTTP client to a
+    local StubOllamaServer (with the given latency / per-token delay) instead of
+    an in-process mock.
+
+    Returns:
+        dict: The report that was written to disk.
+    """
+    scales = scales or DEFAULT_SCALES
+    commit = _git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "llm": {"mode": "http-stub", "latency": llm_latency, "token_delay": llm_token_delay}
+                   if llm_stub else {"mode": "mock"}
+        },
+        "results": []
+    }
+
+    base_dir = Path(work_dir) if work_dir else Path(tempfile.mkdtemp(prefix="jalm_bench_"))
+    base_dir.mkdir(parents=True, exist_ok=True)
+    llm_server = None
+    if llm_stub:
+        from benchmarks.ollama_stub import StubOllamaServer
+        llm_server = StubOllamaServer(latency=llm_latency, token_delay=llm_token_delay).start()
+    try:
+        for scale in scales:
+            print(f"[bench] {scale} applications ...", flush=True)
+            result = run_scale(scale, base_dir, repeat, llm_server=llm_server)
+            report["results"].append(result)
+            for name, stats in result["timings"].items():
+                print(f"    {name:<32} {stats['median']:.4f}s")
+    finally:
+        if llm_server is not None:
+            llm_server.stop()
+        # Only clean up folders we created ourselves.
+        if not keep and not work_dir:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+    output_path = Path(output) if output else RESULTS_DIR / f"bench_{commit}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent=4)
+    print(f"[bench] Results written to {output_path}")
+    return report
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="JALM end-to-end performance benchmarks.")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="Application counts to benchmark (default: 1000 10000 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions for read-only paths")
+    parser.add_argument("--output", help="Path of the JSON report (default: benchmarks/results/bench_<commit>.json)")
+    parser.add_argument("--work-dir", help="Where to generate workspaces (default: a temp folder)")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary workspaces after the run")
+    parser.add_argument("--llm-stub", action="store_true",
+                        help="Classify over HTTP against a local stub Ollama server instead of a mock")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Stub: seconds before each response")
+    parser.add_argument("--llm-token-delay", type=float, default=0.0, help="Stub: seconds between streamed tokens")
+    args = parser.parse_args(argv)
+
+    run_benchmarks(args.scales, args.output, args.repeat, args.keep, args.work_dir,
+                   args.llm_stub, args.llm_latency, args.llm_token_delay)
+
+
+if __name__ == "__main__":
+    main()
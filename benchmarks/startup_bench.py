@@ -0,0 +1,109 @@
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+# Cold-start guard for main.py.
+# It runs the interpreter with `-X importtime`, which prints one line per imported
+# module to stderr, and checks two things:
+#   1. Heavy modules that are only needed later (matplotlib, the LLM client, the
+#      batch exporter, the analytics window) are NOT imported before first paint.
+#   2. The total import time stays under an optional budget.
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# What the interpreter has to load before the dashboard can be drawn.
+FIRST_PAINT_IMPORTS = "import main; import app.gui.dashboard"
+
+# Modules that must stay lazy (loaded on first use, never at startup).
+DEFERRED_MODULES = [
+    "matplotlib",
+    "app.gui.analytics_view",
+    "app.gui.report_dialog",
+    "app.core.llm_service",
+    "app.core.batch_export",
+]
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_imports(statement=FIRST_PAINT_IMPORTS):
+    """
+    Runs `statement` in a fresh interpreter with -X importtime.
+
+    Returns:
+        dict: {module_name: (self_us, cumulative_us, depth)} for every imported module.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=str(PROJECT_ROOT),
+        capture_output=True,
+        text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Startup import failed:\n{proc.stderr[-2000:]}")
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            # Each nesting level is indented by two spaces.
+            modules[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return modules
+
+
+def total_import_ms(modules):
+    """Sum of the cumulative time of every top-level import, in milliseconds."""
+    return sum(cum for _, cum, depth in modules.values() if depth == 0) / 1000.0
+
+
+def find_eager_imports(modules, deferred=None):
+    """Returns the deferred modules (or their submodules) that were imported eagerly."""
+    deferred = deferred or DEFERRED_MODULES
+    return sorted(name for name in modules
+                  if any(name == d or name.startswith(d + ".") for d in deferred))
+
+
+def run_startup_bench(budget_ms=None, top=10):
+    """
+    Measures startup imports and returns a report dict with an 'ok' flag.
+    """
+    modules = measure_imports()
+    eager = find_eager_imports(modules)
+    total_ms = total_import_ms(modules)
+    slowest = sorted(modules.items(), key=lambda kv: kv[1][1], reverse=True)[:top]
+
+    ok = not eager and (budget_ms is None or total_ms <= budget_ms)
+    return {
+        "ok": ok,
+        "total_import_ms": round(total_ms, 2),
+        "budget_ms": budget_ms,
+        "eager_deferred_modules": eager,
+        "slowest": [{"module": name, "cumulative_ms": cum / 1000.0} for name, (_, cum, _) in slowest]
+    }
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Guards JALM cold-start import time.")
+    parser.add_argument("--budget-ms", type=float, help="Fail if total import time exceeds this")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run_startup_bench(args.budget_ms)
+    if args.json:
+        print(json.dumps(report, indent=4))
+    else:
+        print(f"Startup imports: {report['total_import_ms']:.1f} ms")
+        for entry in report["slowest"]:
+            print(f"    {entry['module']:<60} {entry['cumulative_ms']:.1f} ms")
+        if report["eager_deferred_modules"]:
+            print("Deferred modules imported at startup: " + ", ".join(report["eager_deferred_modules"]))
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
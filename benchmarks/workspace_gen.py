@@ -0,0 +1,197 @@
+import os
+import random
+import sqlite3
+from pathlib import Path
+
+from app.core.file_ops import get_folder_creation_time
+
+# Synthetic workspace generator used by the benchmark harness.
+# It builds a realistic "Root / Company / Role" tree (the same layout that
+# scan_for_existing_applications expects) and a matching jalm_apps.db so that
+# the sync, analytics and export paths can be timed at any scale.
+
+COMPANY_PREFIXES = [
+    "Blue", "North", "Quantum", "Silver", "Bright", "Iron", "Atlas", "Nova",
+    "Cedar", "Summit", "Vertex", "Harbor", "Pixel", "Crimson", "Lumen", "Orbit"
+]
+COMPANY_SUFFIXES = [
+    "Analytics", "Systems", "Labs", "Bank", "Health", "Logistics", "Software",
+    "Energy", "Retail", "Capital", "Media", "Robotics", "Insurance", "Foods"
+]
+
+ROLE_TITLES = [
+    "Software Engineer", "Senior Software Engineer", "Backend Developer",
+    "Frontend Developer", "Full Stack Developer", "Data Engineer",
+    "Senior Data Engineer", "Data Scientist", "Data Analyst", "BI Analyst",
+    "Business Analyst", "Graduate Program", "Machine Learning Engineer",
+    "DevOps Engineer", "Site Reliability Engineer", "Cloud Engineer",
+    "Product Manager", "UX Designer", "Security Analyst", "IT Support Specialist",
+    "Sales Executive", "Marketing Analyst", "Platform Engineer", "QA Engineer"
+]
+
+# Rough shape of a real job search: most applications never move past 'Applied'.
+STATUS_WEIGHTS = {
+    "Applied": 55,
+    "Rejected": 20,
+    "Ghosted": 10,
+    "OA": 5,
+    "HR Call": 4,
+    "Interviewed": 4,
+    "Offer": 2
+}
+
+INTERVIEW_STATUSES = ("Interviewed", "Offer")
+
+# Smallest byte string that most PDF readers will still recognise.
+FAKE_PDF = b"%PDF-1.4\n1 0 obj<<>>endobj\ntrailer<<>>\n%%EOF\n"
+
+
+def _company_names(count, rng):
+    """Returns `count` unique, human-looking company names."""
+    names = []
+    for i in range(count):
+        prefix = COMPANY_PREFIXES[rng.randrange(len(COMPANY_PREFIXES))]
+        suffix = COMPANY_SUFFIXES[rng.randrange(len(COMPANY_SUFFIXES))]
+        # The numeric tag keeps names unique at any scale.
+        names.append(f"{prefix} {suffix} {i:05d}")
+    return names
+
+
+def _role_names(count, rng):
+    """Returns `count` role folder names, indexed like the dashboard does for repeats."""
+    roles = []
+    seen = {}
+    for _ in range(count):
+        title = ROLE_TITLES[rng.randrange(len(ROLE_TITLES))]
+        seen[title] = seen.get(title, 0) + 1
+        roles.append(title if seen[title] == 1 else f"{title} ({seen[title]})")
+    return roles
+
+
+def _pick_status(rng):
+    statuses = list(STATUS_WEIGHTS.keys())
+    weights = list(STATUS_WEIGHTS.values())
+    return rng.choices(statuses, weights=weights, k=1)[0]
+
+
+def generate_workspace(root_path, num_apps, roles_per_company=5, user_name="Bench User",
+                       db_name="jalm_apps.db", seed=42):
+    """
+    Builds a synthetic workspace and a seeded database inside `root_path`.
+
+    Args:
+        root_path (str): Destination folder (created if missing).
+        num_apps (int): Total number of application folders to create.
+        roles_per_company (int): Roles created under each company folder.
+        user_name (str): Used for the CV file names, like the real templates.
+        db_name (str): Database file name inside the root.
+        seed (int): Seed for the random generator so runs are reproducible.
+
+    Returns:
+        dict: Summary with the number of companies, applications and status counts.
+    """
+    rng = random.Random(seed)
+    root = Path(root_path)
+    root.mkdir(parents=True, exist_ok=True)
+
+    num_companies = max(1, -(-num_apps // roles_per_company))  # Ceiling division
+    companies = _company_names(num_companies, rng)
+
+    rows = []
+    interview_rows = []
+    status_counts = {}
+    app_id = 0
+
+    for company in companies:
+        remaining = num_apps - app_id
+        if remaining <= 0:
+            break
+        company_dir = root / company
+        company_dir.mkdir(exist_ok=True)
+
+        for role in _role_names(min(roles_per_company, remaining), rng):
+            app_id += 1
+            role_dir = company_dir / role
+            role_dir.mkdir(exist_ok=True)
+
+            status = _pick_status(rng)
+            status_counts[status] = status_counts.get(status, 0) + 1
+
+            role_clean = "".join(c for c in role if c.isalnum() or c in (' ', '_', '-')).strip()
+            (role_dir / f"{user_name}_CV_{role_clean}.pdf").write_bytes(FAKE_PDF)
+            (role_dir / "job_description.txt").write_text(
+                f"{role} at {company}.\nResponsibilities: build and ship things.\n", encoding="utf-8")
+            (role_dir / ".jalm_id").write_text(str(app_id), encoding="utf-8")
+
+            if status in INTERVIEW_STATUSES:
+                (role_dir / "interviews.txt").write_text(
+                    "\n--- Interview 1 (2026-01-01 10:00) ---\nTechnical round\n", encoding="utf-8")
+                interview_rows.append((app_id, 1, "Technical round"))
+
+            # Keep created_at identical to what sync_workspace would read from disk,
+            # so a re-sync of an untouched workspace measures pure reconciliation.
+            created_at = get_folder_creation_time(str(role_dir))
+            rows.append((app_id, company, role, str(role_dir.absolute()), status, created_at))
+
+    _seed_database(root / db_name, rows, interview_rows)
+
+    return {
+        "companies": len(companies),
+        "applications": len(rows),
+        "interviews": len(interview_rows),
+        "status_counts": status_counts
+    }
+
+
+def _seed_database(db_path, rows, interview_rows):
+    """Creates the schema through init_db and bulk-loads the generated rows."""
+    from unittest import mock
+    from app.core import database
+
+    # Reuse the real schema so the benchmark always matches production.
+    with mock.patch.object(database, "get_active_root", return_value=str(db_path.parent)), \
+            mock.patch.object(database, "DB_NAME", db_path.name):
+        database.init_db()
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        conn.executemany('''
+            INSERT INTO applications (id, company_name, role_name, folder_path, status, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+        conn.executemany('''
+            INSERT INTO interviews (app_id, sequence, notes) VALUES (?, ?, ?)
+        ''', interview_rows)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def add_new_folders(root_path, count, seed=7, company="Zeta New Arrivals"):
+    """Creates `count` brand-new role folders (no .jalm_id) to simulate fresh work on disk."""
+    rng = random.Random(seed)
+    root = Path(root_path)
+    company_dir = root / company
+    company_dir.mkdir(exist_ok=True)
+    created = []
+    for i in range(count):
+        role_dir = company_dir / f"{ROLE_TITLES[rng.randrange(len(ROLE_TITLES))]} {i}"
+        role_dir.mkdir(exist_ok=True)
+        (role_dir / "job_description.txt").write_text("New role", encoding="utf-8")
+        created.append(str(role_dir))
+    return created
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic JALM workspace.")
+    parser.add_argument("root", help="Destination folder for the workspace")
+    parser.add_argument("--apps", type=int, default=1000, help="Number of applications")
+    parser.add_argument("--roles-per-company", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    summary = generate_workspace(args.root, args.apps, args.roles_per_company, seed=args.seed)
+    print(f"Generated {summary['applications']} applications across "
+          f"{summary['companies']} companies in {os.path.abspath(args.root)}")
@@ -1,15 +1,16 @@
 import atexit
 import signal
 import sys
-import subprocess
 import customtkinter as ctk
 from app.core.config_mgr import is_config_complete
-from app.gui.setup_wizard import SetupWizard
-from app.core.database import init_db
-from app.core.service_mgr import ServiceManager
 
 # This is the entry point of the entire JALM application.
 # It creates the main window and manages the app's overall lifecycle.
+#
+# PERFORMANCE: Only the window toolkit and the tiny config module are imported
+# up-front. Everything else (database, service manager, setup wizard, and later
+# matplotlib / the LLM client / the batch exporter) is imported on first use,
+# so the dashboard paints as early as possible.
 class JALMApp(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -21,24 +22,22 @@ class JALMApp(ctk.CTk):
 
         # 2. Database Preparation
         # This creates the necessary SQLite tables if they don't exist yet.
+        # Migrations are version-gated, so on a normal launch this is a single
+        # PRAGMA read and no schema work at all.
+        from app.core.database import init_db
         init_db()
 
-        # 3. Hybrid Sync & AI Startup
-        # We start the .NET background service right away.
-        # This service handles real-time folder watching and document generation.
-        self.start_ollama()
-        self.service_mgr = ServiceManager()
-        self.service_mgr.start_service()
-
-        # 4. Safe Shutdown
+        # 3. Safe Shutdown
         # 'atexit' ensures that when the user closes this Python app, 
         # the background .NET service is also stopped automatically.
+        from app.core.service_mgr import ServiceManager
+        self.service_mgr = ServiceManager()
         atexit.register(self.service_mgr.stop_service)
         
         # Bind close handler to ensure clean shutdown
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
-        # 5. Initialization Logic
+        # 4. Initialization Logic
         # If the user hasn't finished the initial setup (name, root folder, etc.), 
         # we hide the main window and show the Setup Wizard instead.
         if not is_config_complete():
@@ -47,27 +46,69 @@ class JALMApp(ctk.CTk):
         else:
             self.init_main_ui()
 
-    def start_ollama(self):
-        """Attempts to start the local Ollama server silently in the background."""
-        try:
-            # Hide the console window on Windows
-            startupinfo = None
-            if sys.platform == "win32":
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            
-            # Launch ollama serve in the background, suppressing output.
-            # If it's already running, this will just fail quietly.
-            subprocess.Popen(['ollama', 'serve'], 
-                             startupinfo=startupinfo, 
-                             stdout=subprocess.DEVNULL, 
-                             stderr=subprocess.DEVNULL)
-            print("Auto-started Ollama background service.")
-        except Exception as e:
-            print(f"Could not auto-start Ollama: {e}")
+        # 5. Hybrid Sync & AI Startup
+        # Ollama and the .NET background service are started on a worker thread
+        # once the window is idle, so the dashboard is drawn straight from the
+        # database without waiting for the sidecar processes.
+        self.startup_pipeline = None
+        self.folder_watcher = None
+        self.classifier_worker = None
+        self.after_idle(self.start_background_services)
+
+    def start_background_services(self):
+        """Launches Ollama, the .NET service or folder watcher (plus readiness probes) and the role classifier in the background."""
+        from app.core.startup import StartupPipeline, start_ollama, probe_ollama, wait_until
+
+        def ollama_stage():
+            # Skip the spawn entirely if a server is already listening.
+            if not probe_ollama():
+                start_ollama()
+            return wait_until(probe_ollama, timeout=15.0)
+
+        def service_stage():
+            self.service_mgr.start_service()
+            return self.service_mgr.is_running()
+
+        def watcher_stage():
+            # Without JALM.Service.exe (e.g. on Linux) nothing would watch the
+            # workspace, so run the in-process folder watcher instead.
+            if self.service_mgr.is_running():
+                return True
+            from app.core.folder_watcher import watch_active_root
+            self.folder_watcher = watch_active_root()
+            atexit.register(self.folder_watcher.stop)
+            # No workspace yet: the watcher starts once the setup wizard sets one
+            return self.folder_watcher.is_running or not self.folder_watcher.root
+
+        def classifier_stage():
+            # Re-classify roles answered by another model/prompt while the app is
+            # idle; any key press or click pushes the work back.
+            from app.core.classifier_worker import get_classifier_worker
+            worker = self.classifier_worker = get_classifier_worker()
+            atexit.register(worker.stop)
+            self.after(0, lambda: self.bind_all("<Any-KeyPress>", lambda e: worker.notify_activity(), add="+"))
+            self.after(0, lambda: self.bind_all("<Any-ButtonPress>", lambda e: worker.notify_activity(), add="+"))
+            worker.rewarm()
+            return worker.is_running
+
+        def report_cache_stage():
+            # Drop the report-cache change log written while the app was closed
+            # (e.g. by the .NET service); nothing is cached yet that needs it.
+            from app.core.report_cache import get_report_cache
+            get_report_cache().prune()
+            return True
+
+        self.startup_pipeline = StartupPipeline()
+        self.startup_pipeline.add_stage("service", service_stage)
+        self.startup_pipeline.add_stage("watcher", watcher_stage)
+        self.startup_pipeline.add_stage("ollama", ollama_stage)
+        self.startup_pipeline.add_stage("classifier", classifier_stage)
+        self.startup_pipeline.add_stage("report_cache", report_cache_stage)
+        self.startup_pipeline.start()
 
     def show_setup_wizard(self):
         """Displays the step-by-step installation guide (Setup Wizard)."""
+        from app.gui.setup_wizard import SetupWizard
         wizard = SetupWizard(self, self.on_setup_complete)
         wizard.focus_set()
 
@@ -84,6 +125,10 @@ class JALMApp(ctk.CTk):
 
     def on_closing(self):
         """Handle window close event with proper cleanup."""
+        if self.folder_watcher is not None:
+            self.folder_watcher.stop()
+        if self.classifier_worker is not None:
+            self.classifier_worker.stop()
         try:
             # IMPORTANT: Destroy all children first. This triggers the <Destroy> event
             # in the Dashboard, which cancels all active background timers.
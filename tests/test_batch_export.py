@@ -37,3 +37,215 @@ def test_batch_export_ignores_missing(mocker, tmp_path):
     apps = [{"company_name": "Apple", "role_name": "Dev", "folder_path": str(tmp_path / "Missing")}]
     stats = exporter.export(apps, str(tmp_path / "Export"))
     assert len(stats["errors"]) == 1
+
+def _make_apps(root, count):
+    apps = []
+    for i in range(count):
+        folder = root / f"Company {i}" / "Dev"
+        folder.mkdir(parents=True)
+        (folder / "CV.pdf").write_text(f"cv {i}")
+        (folder / "job_description.txt").write_text(f"jd {i}")
+        apps.append({"company_name": f"Company {i}", "role_name": "Dev", "folder_path": str(folder)})
+    return apps
+
+def _db_apps(root, count):
+    # Same folders, but as the dashboard passes them: sqlite3.Row from get_applications()
+    from app.core.database import add_application, get_applications
+    for app in _make_apps(root, count):
+        add_application(app["company_name"], app["role_name"], app["folder_path"])
+    return get_applications()
+
+def test_progress_events_for_database_rows(tmp_path):
+    apps = _db_apps(tmp_path / "ws", 2)
+    events = []
+    stats = BatchExporter().export(apps, str(tmp_path / "out"), progress_callback=events.append)
+
+    assert stats["errors"] == []
+    assert len(events) == 4
+    assert sorted({e["company"] for e in events}) == ["Company 0", "Company 1"]
+
+def test_parallel_export_numbering_follows_application_order(tmp_path, mocker):
+    import random
+    import shutil
+    import time
+    apps = _make_apps(tmp_path / "ws", 20)
+    
+    # Make workers finish in a random order
+    real_copy = shutil.copy2
+    def slow_copy(src, dst):
+        time.sleep(random.random() / 100)
+        return real_copy(src, dst)
+    mocker.patch("app.core.batch_export.shutil.copy2", side_effect=slow_copy)
+    
+    events = []
+    stats = BatchExporter(max_workers=8).export(apps, str(tmp_path / "out"), "Dev", progress_callback=events.append)
+    
+    assert stats["exported_cvs"] == 20 and stats["exported_jds"] == 20
+    for i in range(20):
+        assert (tmp_path / "out" / f"Dev cv {i + 1}.pdf").read_text() == f"cv {i}"
+        assert (tmp_path / "out" / f"Dev jd {i + 1}.txt").read_text() == f"jd {i}"
+    
+    assert len(events) == 40
+    assert [e["done"] for e in events] == list(range(1, 41))
+    assert all(e["total"] == 40 and e["status"] == "copied" for e in events)
+
+def test_export_can_be_cancelled(tmp_path, mocker):
+    import shutil
+    import threading
+    apps = _make_apps(tmp_path / "ws", 10)
+    cancel = threading.Event()
+    
+    # The user presses Stop while the first file is being copied
+    real_copy = shutil.copy2
+    def copy_then_cancel(src, dst):
+        cancel.set()
+        return real_copy(src, dst)
+    mocker.patch("app.core.batch_export.shutil.copy2", side_effect=copy_then_cancel)
+    
+    events = []
+    stats = BatchExporter(max_workers=1).export(apps, str(tmp_path / "out"), "Dev",
+                                                progress_callback=events.append, cancel_event=cancel)
+    
+    assert stats["cancelled"]
+    assert stats["exported_cvs"] + stats["exported_jds"] == 1
+    assert [e["status"] for e in events].count("skipped") == 19
+    assert stats["errors"] == []
+
+def test_zip_export_streams_into_one_archive_with_manifest(tmp_path):
+    import csv
+    import io
+    import zipfile
+    from app.core.batch_export import OUTPUT_ZIP
+    apps = _make_apps(tmp_path / "ws", 3)
+    
+    archive = tmp_path / "out" / "backup.zip"
+    stats = BatchExporter().export(apps, str(archive), "Dev", output=OUTPUT_ZIP)
+    
+    assert stats["archive_path"] == str(archive)
+    assert not archive.with_name("backup.zip.part").exists()
+    with zipfile.ZipFile(archive) as zf:
+        infos = {info.filename: info for info in zf.infolist()}
+        assert infos["Dev cv 2.pdf"].compress_type == zipfile.ZIP_STORED
+        assert infos["Dev jd 2.txt"].compress_type == zipfile.ZIP_DEFLATED
+        assert zf.read("Dev cv 3.pdf") == b"cv 2"
+        
+        manifest = list(csv.reader(io.StringIO(zf.read("manifest.csv").decode("utf-8-sig"))))
+    assert manifest[0] == ["File", "Type", "Company", "Role", "Source"]
+    assert manifest[1][:4] == ["Dev cv 1.pdf", "CV", "Company 0", "Dev"]
+    assert len(manifest) == 7
+
+def test_zip_export_of_database_rows(tmp_path):
+    import zipfile
+    from app.core.batch_export import OUTPUT_ZIP
+    apps = _db_apps(tmp_path / "ws", 2)
+
+    archive = tmp_path / "out" / "backup.zip"
+    stats = BatchExporter().export(apps, str(archive), output=OUTPUT_ZIP)
+
+    assert stats["errors"] == [] and archive.exists()
+    with zipfile.ZipFile(archive) as zf:
+        manifest = zf.read("manifest.csv").decode("utf-8-sig")
+    assert "Company 0" in manifest and "Company 1" in manifest
+
+def test_zip_export_into_folder_does_not_create_subfolder(tmp_path):
+    from app.core.batch_export import OUTPUT_ZIP
+    apps = _make_apps(tmp_path / "ws", 1)
+    target = tmp_path / "out"
+    target.mkdir()
+    (target / "existing.txt").write_text("keep")
+    
+    stats = BatchExporter().export(apps, str(target), "Dev", output=OUTPUT_ZIP)
+    
+    assert Path(stats["archive_path"]).parent == target
+    assert Path(stats["archive_path"]).name.startswith("Export_")
+
+def test_hardlink_strategy_shares_file_and_records_strategy(tmp_path):
+    import os
+    from app.core.batch_export import LINK_HARDLINK
+    apps = _make_apps(tmp_path / "ws", 3)
+    
+    stats = BatchExporter().export(apps, str(tmp_path / "out"), "Dev", link_strategy=LINK_HARDLINK)
+    
+    assert stats["strategies"] == {"hardlink": 6, "reflink": 0, "copy": 0}
+    source = Path(apps[0]["folder_path"]) / "CV.pdf"
+    assert os.path.samefile(source, tmp_path / "out" / "Dev cv 1.pdf")
+
+def test_auto_strategy_falls_back_to_copy_across_volumes(tmp_path, mocker):
+    import errno
+    from app.core.batch_export import LINK_AUTO
+    apps = _make_apps(tmp_path / "ws", 3)
+    link = mocker.patch("app.core.batch_export.os.link", side_effect=OSError(errno.EXDEV, "cross-device"))
+    clone = mocker.patch("app.core.batch_export.reflink", side_effect=OSError(errno.EOPNOTSUPP, "no reflink"))
+    
+    events = []
+    stats = BatchExporter(max_workers=1).export(apps, str(tmp_path / "out"), "Dev",
+                                                progress_callback=events.append, link_strategy=LINK_AUTO)
+    
+    assert stats["strategies"] == {"hardlink": 0, "reflink": 0, "copy": 6}
+    assert {e["strategy"] for e in events} == {"copy"}
+    # Unsupported strategies are only tried once per export
+    assert link.call_count == 1 and clone.call_count == 1
+    assert (tmp_path / "out" / "Dev jd 3.txt").read_text() == "jd 2"
+
+def test_incremental_export_copies_only_new_and_changed_files(tmp_path, mocker):
+    import shutil
+    apps = _make_apps(tmp_path / "ws", 3)
+    target = tmp_path / "Backup"
+
+    first = BatchExporter().export(apps, str(target), "Dev", incremental=True)
+    assert first["exported_cvs"] == 3 and first["unchanged"] == 0
+    assert (target / ".jalm_export_manifest.json").exists()
+
+    # Change one CV, add a new application
+    changed = Path(apps[1]["folder_path"]) / "CV.pdf"
+    changed.write_text("cv 1, updated")
+    apps += _make_apps(tmp_path / "ws2", 1)
+
+    copy = mocker.spy(shutil, "copy2")
+    second = BatchExporter().export(apps, str(target), "Dev", incremental=True, export_jd=False)
+    assert second["exported_cvs"] == 2
+    assert second["unchanged"] == 2
+    assert copy.call_count == 2
+
+    # No Export_ subfolder, and the changed file kept its name
+    assert not [p for p in target.iterdir() if p.name.startswith("Export_")]
+    assert (target / "Dev cv 2.pdf").read_text() == "cv 1, updated"
+    assert (target / "Dev cv 4.pdf").read_text() == "cv 0"
+
+    # Removed applications are only deleted with prune=True
+    third = BatchExporter().export(apps[:1], str(target), "Dev", incremental=True, export_jd=False)
+    assert third["pruned"] == 0 and (target / "Dev cv 2.pdf").exists()
+    fourth = BatchExporter().export(apps[:1], str(target), "Dev", incremental=True, export_jd=False, prune=True)
+    assert fourth["pruned"] == 3  # JDs were not part of this export, so they stay
+    assert sorted(p.name for p in target.iterdir()) == [
+        ".jalm_export_manifest.json", "Dev cv 1.pdf", "Dev jd 1.txt", "Dev jd 2.txt", "Dev jd 3.txt"]
+
+def test_incremental_export_of_database_rows(tmp_path):
+    apps = _db_apps(tmp_path / "ws", 2)
+    target = tmp_path / "Backup"
+
+    first = BatchExporter().export(apps, str(target), incremental=True)
+    assert first["errors"] == []
+    assert first["exported_cvs"] == 2
+    second = BatchExporter().export(apps, str(target), incremental=True)
+    assert second["unchanged"] == 4
+
+def test_incremental_export_with_hash_ignores_touched_files(tmp_path, mocker):
+    import os
+    import shutil
+    apps = _make_apps(tmp_path / "ws", 2)
+    target = tmp_path / "Backup"
+    BatchExporter().export(apps, str(target), "Dev", incremental=True, verify_hash=True)
+
+    # Same content, new mtime
+    cv = Path(apps[0]["folder_path"]) / "CV.pdf"
+    os.utime(cv, ns=(cv.stat().st_atime_ns, cv.stat().st_mtime_ns + 10**9))
+
+    copy = mocker.spy(shutil, "copy2")
+    stats = BatchExporter().export(apps, str(target), "Dev", incremental=True, verify_hash=True)
+    assert stats["unchanged"] == 4
+    copy.assert_not_called()
+
+def test_incremental_export_rejects_zip(tmp_path):
+    with pytest.raises(ValueError):
+        BatchExporter().export([], str(tmp_path), incremental=True, output="zip")
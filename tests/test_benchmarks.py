@@ -0,0 +1,49 @@
+import json
+import sqlite3
+from pathlib import Path
+from benchmarks.workspace_gen import generate_workspace
+from benchmarks.run_benchmarks import run_benchmarks, stub_classify_job_title
+
+def test_generate_workspace_layout(tmp_path):
+    root = tmp_path / "ws"
+    summary = generate_workspace(root, 12, roles_per_company=5)
+    
+    assert summary["applications"] == 12
+    assert summary["companies"] == 3
+    
+    role_dirs = [d for c in root.iterdir() if c.is_dir() for d in c.iterdir() if d.is_dir()]
+    assert len(role_dirs) == 12
+    for role_dir in role_dirs:
+        assert (role_dir / ".jalm_id").exists()
+        assert (role_dir / "job_description.txt").exists()
+        assert any(p.suffix == ".pdf" for p in role_dir.iterdir())
+    
+    conn = sqlite3.connect(str(root / "jalm_apps.db"))
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM applications").fetchone()[0] == 12
+    finally:
+        conn.close()
+
+def test_stub_classifier_is_offline():
+    assert stub_classify_job_title("Senior Data Engineer") == "Data Engineer"
+    assert stub_classify_job_title("Chef") == "Other"
+
+def test_run_benchmarks_writes_report(tmp_path):
+    output = tmp_path / "bench.json"
+    run_benchmarks(scales=[20], output=str(output), repeat=1, work_dir=str(tmp_path / "work"))
+    
+    report = json.loads(output.read_text())
+    result = report["results"][0]
+    assert result["scale"] == 20
+    assert "sync_workspace_noop" in result["timings"]
+    assert result["timings"]["batch_export_all"]["applications"] >= 20
+
+def test_run_benchmarks_through_stub_ollama(tmp_path):
+    output = tmp_path / "bench.json"
+    run_benchmarks(scales=[20], output=str(output), repeat=1, work_dir=str(tmp_path / "work"), llm_stub=True)
+    
+    report = json.loads(output.read_text())
+    assert report["meta"]["llm"]["mode"] == "http-stub"
+    cold = report["results"][0]["timings"]["get_detailed_analytics_cold"]
+    assert cold["llm_requests"] > 0
+    assert cold["titles_per_second"] > 0
@@ -0,0 +1,131 @@
+import time
+import urllib.error
+from app.core.classifier_worker import ClassifierWorker
+from app.core.database import (get_mapped_role, update_role_mapping, get_db_connection,
+                               count_stale_role_mappings)
+from app.core.llm_service import get_prompt_hash
+
+def mapping(role):
+    conn = get_db_connection()
+    try:
+        return conn.execute("SELECT mapped_category, model_name, prompt_hash, source FROM role_mappings "
+                            "WHERE original_role = ?", (role,)).fetchone()
+    finally:
+        conn.close()
+
+def seed(mocker):
+    """Three roles answered by 'old-model', one manual correction, one rule match."""
+    mocker.patch("app.core.llm_service.get_current_model", return_value="old-model")
+    mocker.patch("app.core.llm_service.request_category", return_value="Other")
+    for role in ["Web Dev", "Data Guy", "Cook", "Software Engineer"]:
+        get_mapped_role(role)
+    update_role_mapping("Cook", "Other")  # manual
+
+def test_rewarm_reclassifies_stale_rows_and_keeps_manual(mocker):
+    seed(mocker)
+    assert tuple(mapping("Software Engineer")) == ("Software Engineer", None, None, "rule")
+
+    # Switching models: old answers are stale but still served without asking Ollama
+    mocker.patch("app.core.llm_service.get_current_model", return_value="new-model")
+    request = mocker.patch("app.core.llm_service.request_category", return_value="Software Engineer")
+    assert count_stale_role_mappings("new-model", get_prompt_hash()) == 2
+    assert get_mapped_role("Web Dev") == "Other"
+    request.assert_not_called()
+
+    worker = ClassifierWorker()
+    worker.rewarm(start=False)  # Driven synchronously below
+    assert worker.run_pending() == 2
+    assert tuple(mapping("Web Dev")) == ("Software Engineer", "new-model", get_prompt_hash(), "llm")
+    assert tuple(mapping("Cook"))[0::3] == ("Other", "manual")
+    assert count_stale_role_mappings("new-model", get_prompt_hash()) == 0
+    assert worker.run_pending() == 0
+
+def test_failure_keeps_old_mapping(mocker):
+    seed(mocker)
+    mocker.patch("app.core.llm_service.get_current_model", return_value="new-model")
+    request = mocker.patch("app.core.llm_service.request_category",
+                           side_effect=urllib.error.URLError("connection refused"))
+
+    worker = ClassifierWorker()
+    worker.rewarm(start=False)
+    assert worker.run_pending() == 0
+    request.assert_called_once()  # Ollama down: the pass stops after the first title
+    assert tuple(mapping("Web Dev"))[:2] == ("Other", "old-model")
+    assert isinstance(worker.last_error, urllib.error.URLError)
+
+def test_rewarm_pass_pages_by_key(mocker):
+    from app.core.database import get_stale_role_mappings
+    seed(mocker)
+    assert get_stale_role_mappings("new-model", get_prompt_hash()) == ["Web Dev", "Data Guy"]
+    assert get_stale_role_mappings("new-model", get_prompt_hash(), after="Web Dev") == ["Data Guy"]
+    assert get_stale_role_mappings("new-model", get_prompt_hash(), after="Data Guy") == []
+
+    # A title that keeps failing is tried once per pass, without binding every title tried so far
+    mocker.patch("app.core.llm_service.get_current_model", return_value="new-model")
+    request = mocker.patch("app.core.llm_service.request_category", side_effect=ValueError("bad answer"))
+    worker = ClassifierWorker()
+    worker.rewarm(start=False)
+    assert worker.run_pending() == 0
+    assert request.call_count == 2
+
+def test_background_thread_waits_for_hold(mocker):
+    seed(mocker)
+    mocker.patch("app.core.llm_service.get_current_model", return_value="new-model")
+    mocker.patch("app.core.llm_service.request_category", return_value="Data Engineer")
+
+    worker = ClassifierWorker(idle_delay=0, item_pause=0)
+    try:
+        with worker.hold():
+            worker.rewarm()
+            time.sleep(0.2)
+            assert mapping("Data Guy")[1] == "old-model"
+        deadline = time.monotonic() + 5
+        while count_stale_role_mappings("new-model", get_prompt_hash()) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert mapping("Data Guy")[:2] == ("Data Engineer", "new-model")
+    finally:
+        worker.stop()
+
+def test_enqueued_new_roles_go_first_and_skip_cached(mocker):
+    seed(mocker)
+    mocker.patch("app.core.llm_service.get_current_model", return_value="new-model")
+    request = mocker.patch("app.core.llm_service.request_category", return_value="Data Engineer")
+
+    worker = ClassifierWorker()
+    worker.rewarm(start=False)
+    worker.enqueue(["Spark Dev", "Cook", "Spark Dev", "Data Engineer"])
+    # Cached "Cook" is skipped and duplicates are dropped; the stale rows come last
+    assert worker.run_pending() == 4
+    assert [c.args[0] for c in request.call_args_list][0] == "Spark Dev"
+    assert request.call_count == 3  # "Data Engineer" is a rule match
+    assert tuple(mapping("Spark Dev")) == ("Data Engineer", "new-model", get_prompt_hash(), "llm")
+    assert tuple(mapping("Data Engineer"))[3] == "rule"
+
+def test_database_errors_do_not_kill_the_thread(mocker):
+    import sqlite3
+    from app.core import database
+    seed(mocker)
+    mocker.patch("app.core.llm_service.get_current_model", return_value="new-model")
+    mocker.patch("app.core.llm_service.request_category", return_value="Data Engineer")
+    # The .NET service holds the write lock for the first save
+    real_save = database.save_role_classification
+    calls = []
+    def flaky_save(*args):
+        calls.append(args[0])
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return real_save(*args)
+    mocker.patch("app.core.database.save_role_classification", side_effect=flaky_save)
+
+    worker = ClassifierWorker(idle_delay=0, item_pause=0, error_backoff=0)
+    try:
+        worker.rewarm()
+        deadline = time.monotonic() + 5
+        while len(calls) < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert worker.is_running
+        assert isinstance(worker.last_error, sqlite3.OperationalError)
+        assert len(calls) >= 2  # Carried on with the next title
+    finally:
+        worker.stop()
+
@@ -32,3 +32,64 @@ def test_config_lifecycle(mocker, tmp_path):
     assert new_cfg["user_name"] == "Alice"
     
     assert is_config_complete() is True
+
+def test_config_reads_are_cached_until_file_changes(mocker, tmp_path):
+    from app.core import config_mgr
+    global_cfg = tmp_path / "global_config.json"
+    mocker.patch("app.core.config_mgr.get_global_config_path", return_value=global_cfg)
+    set_active_root(tmp_path)
+    
+    spy = mocker.spy(config_mgr.json, "load")
+    for _ in range(5):
+        assert get_active_root() == str(tmp_path)
+    assert spy.call_count == 0  # set_active_root wrote through to the cache
+    
+    # An external edit (different size) is picked up on the next read
+    other = tmp_path / "other_workspace"
+    global_cfg.write_text(json.dumps({"active_root": str(other), "extra": "padding"}))
+    assert get_active_root() == str(other)
+    assert spy.call_count == 1
+
+def test_load_config_returns_independent_copies(mocker, tmp_path):
+    global_cfg = tmp_path / "global_config.json"
+    mocker.patch("app.core.config_mgr.get_global_config_path", return_value=global_cfg)
+    set_active_root(tmp_path)
+    save_config({"user_name": "Bob", "ollama_model": "mistral", "additional_cv_templates": {"A": "/a.docx"}})
+    
+    cfg = load_config()
+    cfg["user_name"] = "Mutated"
+    cfg["additional_cv_templates"]["B"] = "/b.docx"  # Nested values too
+    assert load_config()["user_name"] == "Bob"
+    assert load_config()["additional_cv_templates"] == {"A": "/a.docx"}
+    
+    from app.core.config_mgr import get_config_value
+    assert get_config_value("ollama_model") == "mistral"
+
+def test_root_listeners_notified_on_change(mocker, tmp_path):
+    from app.core.config_mgr import add_root_listener, remove_root_listener
+    global_cfg = tmp_path / "global_config.json"
+    mocker.patch("app.core.config_mgr.get_global_config_path", return_value=global_cfg)
+    set_active_root(tmp_path / "a")
+    
+    seen = []
+    add_root_listener(seen.append)
+    try:
+        set_active_root(tmp_path / "a")  # unchanged -> no event
+        set_active_root(tmp_path / "b")
+    finally:
+        remove_root_listener(seen.append)
+    
+    assert seen == [str(tmp_path / "b")]
+
+def test_first_root_after_none_notifies_listeners(mocker, monkeypatch, tmp_path):
+    from app.core import config_mgr
+    mocker.patch("app.core.config_mgr.get_global_config_path", return_value=tmp_path / "global_config.json")
+    monkeypatch.setattr(config_mgr, "_last_seen_root", config_mgr._UNSET)
+    monkeypatch.setattr(config_mgr, "_root_listeners", [])
+
+    seen = []
+    config_mgr.add_root_listener(seen.append)
+    assert config_mgr.get_active_root() is None  # First run: no global config yet
+    set_active_root(tmp_path / "ws")             # e.g. the setup wizard
+    assert seen == [str(tmp_path / "ws")]
+
@@ -0,0 +1,56 @@
+import os
+from app.core import doc_index
+from app.core.doc_index import classify_folder, refresh_documents, get_documents, forget_orphaned_documents
+from app.core.database import add_application, get_db_connection
+
+def make_folder(tmp_path):
+    folder = tmp_path / "Google" / "SWE"
+    folder.mkdir(parents=True)
+    (folder / "Alice_CV.pdf").write_text("cv")
+    (folder / "Alice_Cover Letter_SWE.docx").write_text("cover")
+    (folder / "job_description.txt").write_text("jd")
+    (folder / "~$ice_CV.docx").write_text("lock file")
+    (folder / "interviews.txt").write_text("")
+    return folder
+
+def test_classify_folder_picks_each_document_once(tmp_path):
+    folder = make_folder(tmp_path)
+    (folder / "portfolio.pdf").write_text("other pdf")
+
+    docs = classify_folder(str(folder))
+    assert docs["cv"]["name"] == "Alice_CV.pdf"
+    assert docs["cv"]["size"] == 2
+    assert docs["cover_letter"]["name"] == "Alice_Cover Letter_SWE.docx"
+    assert docs["jd"]["name"] == "job_description.txt"
+    assert classify_folder(str(tmp_path / "Missing")) is None
+
+def test_refresh_relists_only_changed_folders(tmp_path, mocker):
+    folder = str(make_folder(tmp_path))
+    assert get_documents(folder)["cv"]["name"] == "Alice_CV.pdf"
+
+    # Folder mtime unchanged: served from the index without listing the folder
+    scan = mocker.spy(doc_index, "classify_folder")
+    assert refresh_documents([folder])[folder]["jd"]["name"] == "job_description.txt"
+    scan.assert_not_called()
+
+    # A new, higher priority CV changes the folder mtime and is picked up
+    os.remove(os.path.join(folder, "Alice_CV.pdf"))
+    with open(os.path.join(folder, "Alice_Resume.docx"), "w") as f:
+        f.write("resume")
+    os.utime(folder, ns=(0, os.stat(folder).st_mtime_ns + 10**9))  # Coarse mtime filesystems
+    assert get_documents(folder)["cv"]["name"] == "Alice_Resume.docx"
+    assert scan.call_count == 1
+
+def test_sync_builds_index_and_forgets_orphans(tmp_path):
+    from app.core.sync_mgr import sync_workspace
+
+    folder = str(make_folder(tmp_path))
+    add_application("Old", "Gone", str(tmp_path / "Old" / "Gone"))
+    refresh_documents([str(tmp_path)])  # Not an application folder: orphan
+
+    sync_workspace(str(tmp_path))
+    conn = get_db_connection()
+    rows = conn.execute("SELECT folder_path, cv_name FROM document_index").fetchall()
+    conn.close()
+    assert [tuple(r) for r in rows] == [(folder, "Alice_CV.pdf")]
+    assert forget_orphaned_documents() == 0
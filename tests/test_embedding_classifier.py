@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from app.core import embedding_classifier
+from app.core.embedding_classifier import (classify_titles, embed, local_vectors, score,
+                                           LOCAL_VECTORIZER, prototype_texts)
+from app.core.database import get_db_connection, get_detailed_analytics, add_application, get_all_role_mappings
+
+def cached_models():
+    conn = get_db_connection()
+    try:
+        return dict(conn.execute("SELECT model, COUNT(*) FROM role_embeddings GROUP BY model").fetchall())
+    finally:
+        conn.close()
+
+def test_local_vectorizer_scores_a_batch_in_one_matmul():
+    titles = ["Senior Data Engineer", "Backend Developer", "UX Designer", "Pastry Chef"]
+    vectors = local_vectors(titles)
+    assert vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+
+    best, similarity = score(vectors, local_vectors(prototype_texts()))
+    assert best.shape == (4,)
+    categories, model_name, _ = classify_titles(titles, backend=LOCAL_VECTORIZER)
+    assert categories == {"Senior Data Engineer": "Data Engineer", "Backend Developer": "Software Engineer",
+                          "UX Designer": "UI/UX Designer", "Pastry Chef": "Other"}
+    assert model_name == f"embed:{LOCAL_VECTORIZER}"
+
+def test_vectors_are_cached_as_float32_blobs(mocker):
+    compute = mocker.spy(embedding_classifier, "_compute")
+    first = embed(["Data Analyst", "Data Analyst", "QA Engineer"], LOCAL_VECTORIZER)
+    assert first.shape == (3, embedding_classifier.LOCAL_DIM)
+    assert compute.call_args[0][0] == ["Data Analyst", "QA Engineer"]  # Each text embedded once
+
+    again = embed(["QA Engineer", "Data Analyst"], LOCAL_VECTORIZER)
+    assert compute.call_count == 1  # Served from role_embeddings
+    assert np.array_equal(again[0], first[2])
+    assert cached_models() == {LOCAL_VECTORIZER: 2}
+
+def test_ollama_embeddings_with_local_fallback(monkeypatch, mocker):
+    from benchmarks.ollama_stub import StubOllamaServer, EMBED_DIM
+    mocker.patch("app.core.embedding_classifier.configured_backend", return_value="nomic-embed-text")
+    monkeypatch.setattr(embedding_classifier, "_unavailable", {})
+
+    with StubOllamaServer() as ollama:
+        monkeypatch.setenv("OLLAMA_HOST", ollama.host)
+        categories, model_name, _ = classify_titles(["Cloud Platform Engineer", "Sales Executive"])
+        assert model_name == "embed:nomic-embed-text"
+        assert categories["Sales Executive"] == "Sales / Marketing"
+        assert ollama.stats["embed_requests"] == 2  # Prototypes + titles, each one batched request
+        classify_titles(["Sales Executive"])
+        assert ollama.stats["embed_requests"] == 2  # Everything cached now
+    assert cached_models()["nomic-embed-text"] == len(prototype_texts()) + 2
+    assert embed(["Sales Executive"], "nomic-embed-text").shape == (1, EMBED_DIM)
+
+    # Ollama gone: new titles use the built-in vectorizer (and say so in model_name)
+    categories, model_name, _ = classify_titles(["Penetration Tester"])
+    assert model_name == f"embed:{LOCAL_VECTORIZER}"
+    assert categories["Penetration Tester"] == "Cybersecurity"
+
+    # ... and fallback answers are what the classifier currently produces, so
+    # they are not stale (re-embedded) on every re-warm pass during the outage
+    from app.core.database import save_role_classification, count_stale_role_mappings
+    assert embedding_classifier.get_identity() == (model_name, embedding_classifier.get_prototype_hash())
+    save_role_classification("Penetration Tester", "Cybersecurity", "llm", *embedding_classifier.get_identity())
+    assert count_stale_role_mappings(*embedding_classifier.get_identity()) == 0
+
+    # Ollama is tried again once the retry window has passed
+    monkeypatch.setattr(embedding_classifier, "FALLBACK_RETRY_SECONDS", 0)
+    assert embedding_classifier.get_identity()[0] == "embed:nomic-embed-text"
+
+def test_report_classifies_uncached_roles_in_one_batch(mocker):
+    mocker.patch("app.core.llm_service.is_embedding_engine", return_value=True)
+    mocker.patch("app.core.embedding_classifier.configured_backend", return_value=LOCAL_VECTORIZER)
+    request = mocker.patch("app.core.llm_service.request_category")
+    batch = mocker.spy(embedding_classifier, "classify_titles")
+    for i, role in enumerate(["Data Engineer", "Senior Data Engineer", "Frontend Developer", "Frontend Developer"]):
+        add_application("Acme", role, f"/tmp/acme/{i}")
+
+    metrics = get_detailed_analytics()
+    assert dict(metrics["by_role"]) == {"Data Engineer": 2, "Software Engineer": 2}
+    assert batch.call_count == 1  # "Data Engineer" is a rule match, the other two go in one batch
+    request.assert_not_called()
+    mappings = dict(get_all_role_mappings())
+    assert mappings["Frontend Developer"] == "Software Engineer"
@@ -0,0 +1,115 @@
+import os
+import pytest
+from app.core.folder_watcher import FolderWatcher, InotifyBackend
+from app.core.database import get_applications, add_application, add_interview, get_interviews
+from app.core.startup import wait_until
+
+def make_role(root, company, role):
+    path = root / company / role
+    path.mkdir(parents=True)
+    return path
+
+def apps_by_path():
+    return {app['folder_path']: app for app in get_applications()}
+
+def test_polling_watcher_upserts_renames_and_deletes(tmp_path):
+    root = tmp_path / "workspace"
+    root.mkdir()
+    watcher = FolderWatcher(str(root), debounce=0.01, backend="polling")
+    backend = watcher._create_backend()
+    backend.poll_once()  # Initial snapshot
+
+    # 1. A new folder is picked up without a full rescan
+    role = make_role(root, "Google", "Engineer")
+    backend.poll_once()
+    watcher.flush()
+    apps = apps_by_path()
+    assert list(apps) == [str(role)]
+    app_id = apps[str(role)]['id']
+    assert (role / ".jalm_id").read_text().strip() == str(app_id)
+
+    # 2. Renaming the company keeps the record (and its notes)
+    add_interview(app_id, "Phone screen")
+    os.rename(root / "Google", root / "Alphabet")
+    backend.poll_once()
+    watcher.flush()
+    app = get_applications()[0]
+    assert app['id'] == app_id
+    assert app['company_name'] == "Alphabet"
+    assert app['folder_path'] == str(root / "Alphabet" / "Engineer")
+    assert len(get_interviews(app_id)) == 1
+
+    # 3. Deleting it removes the record
+    os.rename(root / "Alphabet" / "Engineer", tmp_path / "Engineer")  # moved out of the workspace
+    backend.poll_once()
+    watcher.flush()
+    assert get_applications() == []
+
+def test_debounce_coalesces_events_per_path(tmp_path, mocker):
+    watcher = FolderWatcher(str(tmp_path), debounce=10)
+    process = mocker.patch.object(watcher, "_process")
+    path = str(tmp_path / "Acme" / "Dev")
+
+    watcher._queue_event("created", path)
+    watcher._queue_event("deleted", path)
+    watcher._queue_event("created", path)
+    watcher.flush()
+
+    process.assert_called_once_with(("created", path, None))
+
+def test_remove_folder_only_deletes_missing_subtree(tmp_path):
+    from app.core.sync_mgr import remove_folder
+
+    kept = make_role(tmp_path, "Acme", "Dev")
+    add_application("Acme", "Dev", str(kept))
+    add_application("Acme", "QA", str(tmp_path / "Acme" / "QA"))
+    add_application("Acme Corp", "QA", str(tmp_path / "Acme Corp" / "QA"))
+
+    # Only the missing folder under 'Acme' goes; 'Acme Corp' shares the prefix but not the folder.
+    assert remove_folder(str(tmp_path / "Acme")) == 1
+    assert sorted(apps_by_path()) == sorted([str(kept), str(tmp_path / "Acme Corp" / "QA")])
+
+def test_watch_active_root_waits_for_a_workspace(tmp_path, mocker, monkeypatch):
+    from app.core import config_mgr
+    from app.core.folder_watcher import watch_active_root
+    mocker.patch("app.core.config_mgr.get_global_config_path", return_value=tmp_path / "global_config.json")
+    monkeypatch.setattr(config_mgr, "_last_seen_root", config_mgr._UNSET)
+    monkeypatch.setattr(config_mgr, "_root_listeners", [])
+    monkeypatch.chdir(tmp_path)
+
+    watcher = watch_active_root(backend="polling")
+    assert watcher.root is None and not watcher.is_running  # Never the working directory
+    assert not watcher.start()
+
+    # The setup wizard setting the first root starts it (on a helper thread)
+    root = tmp_path / "workspace"
+    root.mkdir()
+    config_mgr.set_active_root(root)
+    try:
+        assert wait_until(lambda: watcher.is_running, timeout=5.0)
+        assert watcher.root == str(root)
+    finally:
+        watcher.stop()
+
+@pytest.mark.skipif(not InotifyBackend.is_available(), reason="inotify not available")
+def test_inotify_watcher_picks_up_new_and_renamed_folders(tmp_path):
+    root = tmp_path / "workspace"
+    (root / "Existing").mkdir(parents=True)
+    watcher = FolderWatcher(str(root), debounce=0.05, backend="inotify")
+    assert watcher.start()
+    try:
+        make_role(root, "Existing", "Dev")
+        assert wait_until(lambda: str(root / "Existing" / "Dev") in apps_by_path(), timeout=5, interval=0.05)
+        app_id = get_applications()[0]['id']
+
+        os.rename(root / "Existing" / "Dev", root / "Existing" / "Senior Dev")
+        assert wait_until(lambda: str(root / "Existing" / "Senior Dev") in apps_by_path(), timeout=5, interval=0.05)
+        app = get_applications()[0]
+        assert app['id'] == app_id
+        assert app['role_name'] == "Senior Dev"
+
+        # A company created after start is watched too
+        make_role(root, "NewCo", "PM")
+        assert wait_until(lambda: len(get_applications()) == 2, timeout=5, interval=0.05)
+    finally:
+        watcher.stop()
@@ -1,24 +1,118 @@
+import json
 import pytest
-from app.core.llm_service import classify_job_title
+from app.core.llm_service import classify_job_title, request_category, ollama_url
+
+def stream_response(mocker, chunks):
+    """Mocks urlopen with a streamed /api/generate answer (one JSON object per line)."""
+    lines = [json.dumps({"response": c, "done": False}).encode() + b"\n" for c in chunks]
+    lines.append(json.dumps({"response": "", "done": True}).encode() + b"\n")
+    mock_response = mocker.MagicMock()
+    mock_response.__iter__.return_value = iter(lines)
 
-def test_classify_job_title_success(mocker):
-    # Mock urllib.request.urlopen returning a successful response
-    mock_response = mocker.Mock()
-    mock_response.read.return_value = b'{"response": "Data Engineer"}'
-    
     mock_urlopen = mocker.patch("urllib.request.urlopen")
     mock_urlopen.return_value.__enter__.return_value = mock_response
-    
+    return mock_urlopen
+
+def sent_payload(mock_urlopen):
+    return json.loads(mock_urlopen.call_args[0][0].data)
+
+def test_classify_job_title_success(mocker):
+    # Mock urllib.request.urlopen returning a successful (streamed) response
+    mock_urlopen = stream_response(mocker, ["Data", " Engineer"])
+
     mocker.patch("app.core.llm_service.get_current_model", return_value="llama3.2")
     mocker.patch("app.core.llm_service.CATEGORIES", ["Software Engineer", "Data Engineer"])
-    
+
     result = classify_job_title("spark scala developer")
     assert result == "Data Engineer"
+    payload = sent_payload(mock_urlopen)
+    assert payload["stream"] is True
+    assert payload["options"]["num_predict"] > 0
+    assert "format" not in payload
 
 def test_classify_job_title_invalid_json(mocker):
     # Ensure it falls back to title case on failure
     mock_urlopen = mocker.patch("urllib.request.urlopen", side_effect=Exception("Connection refused"))
     mocker.patch("app.core.llm_service.get_current_model", return_value="llama3.2")
-    
+
     result = classify_job_title("frontend wizard")
     assert result == "Frontend Wizard"
+
+def test_stream_stops_at_first_complete_category(mocker):
+    # "Data" alone is ambiguous; "Data Scientist" is complete, so nothing after it is read
+    mock_urlopen = stream_response(mocker, ["Data", " Scientist", ".\n", "Because the title ..."])
+    response = mock_urlopen.return_value.__enter__.return_value
+
+    assert request_category("ML researcher", "llama3.2", structured=False) == "Data Scientist"
+    assert json.loads(next(response.__iter__.return_value))["response"] == ".\n"
+
+def test_structured_output_sends_category_schema(mocker):
+    mock_urlopen = stream_response(mocker, ['{"category', '": "', 'Cyber', 'security"', '}'])
+
+    assert request_category("pentester", "llama3.2", structured=True) == "Cybersecurity"
+    schema = sent_payload(mock_urlopen)["format"]
+    assert schema["properties"]["category"]["enum"][-1] == "Other"
+
+    # A free-text answer that is not a category is still returned (as before streaming)
+    stream_response(mocker, ["Wizard", "\n"])
+    assert request_category("frontend wizard", "llama3.2", structured=False) == "Wizard"
+    stream_response(mocker, [])
+    with pytest.raises(ValueError):
+        request_category("frontend wizard", "llama3.2", structured=False)
+
+def test_ollama_host_from_environment(monkeypatch):
+    monkeypatch.delenv("OLLAMA_HOST", raising=False)
+    assert ollama_url("/api/tags") == "http://localhost:11434/api/tags"
+    monkeypatch.setenv("OLLAMA_HOST", "127.0.0.1:5000")
+    assert ollama_url("/api/generate") == "http://127.0.0.1:5000/api/generate"
+    monkeypatch.setenv("OLLAMA_HOST", "https://gpu-box:11434/")
+    assert ollama_url("/api/tags") == "https://gpu-box:11434/api/tags"
+
+# --- Real HTTP against the stub Ollama server (benchmarks/ollama_stub.py) ---
+
+@pytest.fixture
+def ollama(monkeypatch):
+    from benchmarks.ollama_stub import StubOllamaServer
+    server = StubOllamaServer(models=["llama3.2", "mistral"]).start()
+    monkeypatch.setenv("OLLAMA_HOST", server.host)
+    yield server
+    server.stop()
+
+def test_stub_server_round_trip(ollama):
+    from app.core.llm_service import get_available_models
+    assert get_available_models() == ["llama3.2", "mistral"]
+    assert request_category("Senior Data Engineer", "llama3.2", structured=False) == "Data Engineer"
+    assert request_category("Chef", "llama3.2", structured=True) == "Other"
+    assert ollama.requests[1]["format"]["properties"]["category"]["enum"][0] == "Software Engineer"
+    assert ollama.requests[0]["options"]["num_predict"] > 0
+
+def test_stub_server_errors_and_refused_connection(ollama, mocker):
+    import urllib.error
+    from app.core.database import get_mapped_role
+    mocker.patch("app.core.llm_service.get_current_model", return_value="llama3.2")
+
+    ollama.fail_first = 1
+    with pytest.raises(urllib.error.HTTPError):
+        request_category("Web Developer", "llama3.2", structured=False)
+    assert classify_job_title("Web Developer") == "Software Engineer"  # Next request succeeds
+
+    # Ollama gone: the report falls back to the title and does not stall
+    ollama.stop()
+    with pytest.raises(urllib.error.URLError):
+        request_category("Web Developer", "llama3.2", structured=False)
+    assert get_mapped_role("Pastry Chef") == "Pastry Chef"
+
+def test_stub_server_timeout_and_concurrency(ollama, mocker):
+    import socket
+    from concurrent.futures import ThreadPoolExecutor
+    ollama.latency = 0.3
+    mocker.patch("app.core.llm_service.OLLAMA_TIMEOUT", 0.05)
+    with pytest.raises((socket.timeout, OSError)):
+        request_category("Data Analyst II", "llama3.2", structured=False)
+
+    mocker.patch("app.core.llm_service.OLLAMA_TIMEOUT", 5)
+    titles = ["Data Analyst", "Product Owner", "Security Engineer", "Sales Lead"]
+    with ThreadPoolExecutor(4) as pool:
+        answers = list(pool.map(lambda t: request_category(t, "llama3.2", structured=False), titles))
+    assert answers == ["Data Analyst", "Product Manager", "Cybersecurity", "Sales / Marketing"]
+    assert ollama.stats["max_concurrent"] > 1
@@ -0,0 +1,89 @@
+import re
+import sqlite3
+from pathlib import Path
+import pytest
+from app.core import migrations
+from app.core.migrations import migrate, get_schema_version, SCHEMA_VERSION
+
+def _legacy_db(path):
+    # Shape of a workspace database created before job_description and versioning existed
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE applications (id INTEGER PRIMARY KEY AUTOINCREMENT, company_name TEXT NOT NULL, role_name TEXT NOT NULL, folder_path TEXT NOT NULL, status TEXT DEFAULT 'Applied', created_at DATETIME DEFAULT CURRENT_TIMESTAMP)")
+    conn.execute("INSERT INTO applications (company_name, role_name, folder_path, status) VALUES ('Google', 'SWE', '/g', 'Interviewing')")
+    conn.commit()
+    return conn
+
+def test_migrate_upgrades_legacy_database(tmp_path):
+    conn = _legacy_db(tmp_path / "legacy.db")
+    try:
+        assert migrate(conn) == SCHEMA_VERSION
+        assert get_schema_version(conn) == SCHEMA_VERSION
+        
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(applications)")]
+        assert "job_description" in columns
+        assert conn.execute("SELECT status FROM applications").fetchone()[0] == "Interviewed"
+        
+        # Second run is a no-op
+        assert migrate(conn) == SCHEMA_VERSION
+    finally:
+        conn.close()
+
+def test_failed_step_rolls_back(tmp_path, mocker):
+    def broken_step(cursor):
+        cursor.execute("CREATE TABLE half_done (id INTEGER)")
+        raise sqlite3.OperationalError("boom")
+    
+    mocker.patch.object(migrations, "MIGRATIONS", migrations.MIGRATIONS + [(SCHEMA_VERSION + 1, "Broken", broken_step)])
+    mocker.patch.object(migrations, "SCHEMA_VERSION", SCHEMA_VERSION + 1)
+    
+    conn = sqlite3.connect(str(tmp_path / "new.db"))
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            migrate(conn)
+        assert get_schema_version(conn) == 0
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+        assert "half_done" not in tables
+        assert "applications" not in tables
+    finally:
+        conn.close()
+
+def test_newer_schema_is_rejected(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "future.db"))
+    try:
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 5}")
+        with pytest.raises(RuntimeError):
+            migrate(conn)
+    finally:
+        conn.close()
+
+def test_dotnet_service_expects_current_schema():
+    # The .NET DatabaseService reads the same user_version; both sides must agree.
+    source = (Path(__file__).parent.parent / "JALM.Service" / "DatabaseService.cs").read_text(encoding="utf-8")
+    expected = int(re.search(r"ExpectedSchemaVersion\s*=\s*(\d+)", source).group(1))
+    assert expected == SCHEMA_VERSION
+
+def test_folder_path_lookups_use_index(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "plan.db"))
+    try:
+        migrate(conn)
+        plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM applications WHERE folder_path = ?", ("/x",)))
+        assert "USING INDEX" in plan
+    finally:
+        conn.close()
+
+def test_unique_folder_path_migration_dedupes_existing_rows(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "dupes.db"))
+    try:
+        migrate(conn, target_version=2)
+        conn.executemany("INSERT INTO applications (company_name, role_name, folder_path) VALUES (?, ?, ?)",
+                         [("A", "Dev", "/a"), ("A", "Dev", "/a"), ("B", "QA", "/b"), ("A", "Dev", "/a")])
+        conn.commit()
+        
+        migrate(conn)
+        rows = conn.execute("SELECT id, folder_path FROM applications ORDER BY id").fetchall()
+        assert rows == [(1, "/a"), (3, "/b")]
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute("INSERT INTO applications (company_name, role_name, folder_path) VALUES ('C', 'X', '/a')")
+    finally:
+        conn.close()
@@ -0,0 +1,106 @@
+from app.core import database
+from app.core.report_cache import ReportCache
+from app.core.database import (add_application, update_application_status, add_interview, get_db_connection,
+                               update_role_mapping, save_role_classification)
+
+def change_log_size():
+    conn = get_db_connection()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM change_log").fetchone()[0]
+    finally:
+        conn.close()
+
+def seed():
+    save_role_classification("Dev", "Software Engineer", "llm", "llama3.2", "hash")
+    return {
+        "jan": add_application("Acme", "Dev", "/tmp/acme/jan", "2026-01-10 09:00:00"),
+        "mar": add_application("Beta", "Dev", "/tmp/beta/mar", "2026-03-05 09:00:00"),
+    }
+
+def test_repeat_report_is_served_from_cache(mocker):
+    ids = seed()
+    # Rows of the OA / HR Call / interview lists must be copyable like the rest
+    update_application_status(ids["jan"], "OA")
+    hr = add_application("Delta", "Dev", "/tmp/delta/jan", "2026-01-12 09:00:00")
+    update_application_status(hr, "HR Call")
+    interviewed = add_application("Echo", "Dev", "/tmp/echo/jan", "2026-01-15 09:00:00")
+    add_interview(interviewed, "Onsite")
+    compute = mocker.spy(database, "get_detailed_analytics")
+    cache = ReportCache()
+
+    first = cache.get_or_compute("2026-01-01", "2026-01-31", top_n=50)
+    assert first["total_apps"] == 3
+    assert (first["oa_roles_list"], first["hr_call_roles_list"], first["interview_roles_list"]) == (
+        [("Acme", "Dev")], [("Delta", "Dev")], [("Echo", "Dev")])
+    first["total_apps"] = 99  # Callers get their own copy
+    first["oa_roles_list"].clear()
+    again = cache.get_or_compute("2026-01-01", "2026-01-31", top_n=50)
+    assert (again["total_apps"], again["oa_roles_list"]) == (3, [("Acme", "Dev")])
+    assert compute.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Another top_n or range is a different report
+    cache.get_or_compute("2026-01-01", "2026-01-31", top_n=None)
+    assert compute.call_count == 2
+
+def test_only_ranges_touched_by_changes_are_recomputed(mocker):
+    ids = seed()
+    cache = ReportCache()
+    cache.get_or_compute("2026-01-01", "2026-01-31")
+    cache.get_or_compute("2026-03-01", "2026-03-31")
+    cache.get_or_compute()  # All Time
+
+    # A new application in March leaves January alone
+    add_application("Gamma", "Dev", "/tmp/gamma/mar", "2026-03-20 09:00:00")
+    assert cache.get("2026-01-01", "2026-01-31") is not None
+    assert cache.get("2026-03-01", "2026-03-31") is None
+    assert cache.get() is None
+    assert cache.get_or_compute("2026-03-01", "2026-03-31")["total_apps"] == 2
+
+    # Status changes and interviews count for the application's creation date
+    update_application_status(ids["jan"], "Rejected")
+    assert cache.get("2026-01-01", "2026-01-31") is None
+    cache.get_or_compute("2026-01-01", "2026-01-31")
+    add_interview(ids["mar"], "Phone screen")
+    assert cache.get("2026-01-01", "2026-01-31") is not None
+    assert cache.get("2026-03-01", "2026-03-31") is None
+
+def test_role_mapping_changes_invalidate_every_range():
+    seed()
+    cache = ReportCache()
+    cache.get_or_compute("2026-01-01", "2026-01-31")
+
+    # A brand-new mapping (first classification) cannot change a cached report
+    save_role_classification("Tester", "Software Engineer", "llm", "llama3.2", "hash")
+    assert cache.get("2026-01-01", "2026-01-31") is not None
+
+    update_role_mapping("Dev", "Data Engineer")
+    assert cache.get("2026-01-01", "2026-01-31") is None
+    assert dict(cache.get_or_compute("2026-01-01", "2026-01-31")["by_role"]) == {"Data Engineer": 1}
+
+def test_lru_eviction_and_change_log_pruning():
+    seed()
+    assert change_log_size() > 0
+    cache = ReportCache(max_entries=2)
+    cache.get_or_compute("2026-01-01", "2026-01-31")
+    cache.get_or_compute("2026-03-01", "2026-03-31")
+    assert change_log_size() == 0  # Nothing cached needs the older rows
+
+    cache.get("2026-01-01", "2026-01-31")  # January is now the most recently used
+    cache.get_or_compute()
+    assert len(cache) == 2
+    assert cache.get("2026-03-01", "2026-03-31") is None
+    assert cache.get("2026-01-01", "2026-01-31") is not None
+
+def test_change_log_is_pruned_on_hits_and_at_startup():
+    seed()
+    cache = ReportCache()
+    assert cache.prune() == 2  # Startup: nothing cached, so nothing needs the log
+    assert change_log_size() == 0
+
+    cache.get_or_compute("2026-01-01", "2026-01-31")
+    add_application("Gamma", "Dev", "/tmp/gamma/mar", "2026-03-20 09:00:00")  # Outside January
+    assert change_log_size() == 1
+    assert cache.get("2026-01-01", "2026-01-31") is not None
+    assert change_log_size() == 0  # The hit moved the entry forward, so the row is not needed
+
@@ -0,0 +1,35 @@
+import importlib.util
+import pytest
+from benchmarks.startup_bench import measure_imports, find_eager_imports
+
+@pytest.mark.skipif(importlib.util.find_spec("customtkinter") is None, reason="customtkinter not installed")
+def test_first_paint_does_not_import_heavy_modules():
+    modules = measure_imports()
+    
+    assert "app.gui.dashboard" in modules
+    assert find_eager_imports(modules) == []
+
+def test_find_eager_imports_matches_submodules():
+    modules = {"matplotlib.pyplot": (1, 1, 1), "app.core.database": (1, 1, 0)}
+    assert find_eager_imports(modules) == ["matplotlib.pyplot"]
+
+def test_startup_pipeline_runs_stages_in_background():
+    from app.core.startup import StartupPipeline, DONE, FAILED
+    
+    completed = []
+    pipeline = StartupPipeline(on_stage_complete=lambda name, state: completed.append((name, state)))
+    pipeline.add_stage("service", lambda: True)
+    pipeline.add_stage("ollama", lambda: False)
+    pipeline.add_stage("broken", lambda: 1 / 0)
+    pipeline.start()
+    
+    assert pipeline.wait(timeout=5)
+    assert completed == [("service", DONE), ("ollama", FAILED), ("broken", FAILED)]
+    assert pipeline.is_ready("service")
+    assert not pipeline.is_ready("ollama")
+
+def test_wait_until_times_out():
+    from app.core.startup import wait_until
+    
+    assert wait_until(lambda: True, timeout=0.1)
+    assert not wait_until(lambda: False, timeout=0.05, interval=0.01)
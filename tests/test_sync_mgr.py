@@ -21,11 +21,78 @@ def test_sync_workspace_cycle(mocker, tmp_path):
     # Create an app physically
     create_application_folder("Apple", "Dev")
     
-    # Sync should find it and add it
+    # Sync should find it and add it (and queue its role for classification)
+    enqueue = mocker.patch("app.core.classifier_worker.ClassifierWorker.enqueue")
     add, upd, rm, dup = sync_workspace(str(tmp_path))
     assert add == 1
+    enqueue.assert_called_once_with(["Dev"])
     
     # Sync again should have nothing new
     add, upd, rm, dup = sync_workspace(str(tmp_path))
     assert add == 0
     assert upd == 0
+
+def test_sync_paths_reconciles_only_given_folders(tmp_path, mocker):
+    import shutil
+    from app.core import sync_mgr
+    from app.core.sync_mgr import sync_paths, sync_company
+    from app.core.database import get_applications, add_application
+    
+    full_sync = mocker.spy(sync_mgr, "sync_workspace")
+    (tmp_path / "Apple" / "Dev").mkdir(parents=True)
+    (tmp_path / "Apple" / "QA").mkdir(parents=True)
+    (tmp_path / "Untouched" / "PM").mkdir(parents=True)
+    add_application("Apple", "Gone", str(tmp_path / "Apple" / "Gone"))
+    
+    # One role folder
+    assert sync_paths([str(tmp_path / "Apple" / "Dev")], str(tmp_path)) == (1, 0, 0)
+    
+    # A whole company: adds QA, keeps Dev, drops the record whose folder is gone
+    assert sync_company(str(tmp_path / "Apple")) == (1, 0, 1)
+    
+    # A deleted role folder removes its record
+    shutil.rmtree(tmp_path / "Apple" / "QA")
+    assert sync_paths([str(tmp_path / "Apple" / "QA")], str(tmp_path)) == (0, 0, 1)
+    
+    # Nothing outside the given paths was touched, and no full rescan happened
+    assert [app['role_name'] for app in get_applications()] == ["Dev"]
+    full_sync.assert_not_called()
+
+    # Without an active root nothing is synced (not even relative to the cwd)
+    mocker.patch("app.core.sync_mgr.get_active_root", return_value=None)
+    (tmp_path / "Apple" / "New").mkdir()
+    assert sync_paths([str(tmp_path / "Apple" / "New")]) == (0, 0, 0)
+
+def test_renamed_folder_already_recorded_elsewhere_is_merged(tmp_path):
+    import os
+    from app.core.sync_mgr import rename_folder
+    from app.core.file_ops import write_jalm_id
+    from app.core.database import add_application, add_interview, get_applications, get_interviews
+
+    old = tmp_path / "Google" / "Engineer"
+    old.mkdir(parents=True)
+    app_id = add_application("Google", "Engineer", str(old))
+    write_jalm_id(str(old), app_id)
+    add_interview(app_id, "Phone screen")
+
+    # The folder is renamed, and the watcher / .NET service records the new
+    # path before the rename is applied
+    new = tmp_path / "Alphabet" / "Engineer"
+    new.parent.mkdir()
+    os.rename(old, new)
+    duplicate = add_application("Alphabet", "Engineer", str(new))
+    add_interview(duplicate, "Onsite")
+
+    sync_workspace(str(tmp_path))  # Must not fail on UNIQUE(folder_path)
+    apps = get_applications()
+    assert [(a['id'], a['folder_path']) for a in apps] == [(app_id, str(new))]
+    assert len(get_interviews(app_id)) == 2
+
+    # Same for a company rename applied by prefix
+    renamed = tmp_path / "Alpha"
+    os.rename(tmp_path / "Alphabet", renamed)
+    add_application("Alpha", "Engineer", str(renamed / "Engineer"))
+    assert rename_folder(str(tmp_path / "Alphabet"), str(renamed)) == 1
+    apps = get_applications()
+    assert [(a['id'], a['folder_path']) for a in apps] == [(app_id, str(renamed / "Engineer"))]
+    assert len(get_interviews(app_id)) == 2
@@ -0,0 +1,48 @@
+import csv
+import json
+import pytest
+from app.core.database import add_application
+from app.core.table_export import export_applications, iter_application_batches, is_parquet_available
+
+def _seed():
+    add_application("Google", "Engineer", "/g/eng", "2024-01-01 09:00:00")
+    add_application("Apple", "Designer, UX", "/a/ux", "2024-02-01 09:00:00")
+    add_application("Netflix", "Engineer", "/n/eng", "2024-03-01 09:00:00")
+
+def test_csv_export_matches_dashboard_filter_and_sort(tmp_path):
+    _seed()
+    out = tmp_path / "apps.csv"
+    
+    count = export_applications(str(out), search_query="Engineer", sort_by="Company", sort_order="ASC", batch_size=1)
+    
+    assert count == 2
+    with open(out, newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["Company", "Role", "Status", "Date Applied", "Path"]
+    assert [r[0] for r in rows[1:]] == ["Google", "Netflix"]
+    assert not (tmp_path / "apps.csv.part").exists()
+
+def test_jsonl_export_streams_in_batches(tmp_path):
+    _seed()
+    batches = list(iter_application_batches(sort_by="Date", sort_order="ASC", batch_size=2))
+    assert [len(b) for b in batches] == [2, 1]
+    
+    out = tmp_path / "apps.jsonl"
+    assert export_applications(str(out), columns=["id", "role_name"], created_after="2024-01-15 00:00:00") == 2
+    records = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert {r["role_name"] for r in records} == {"Designer, UX", "Engineer"}
+    assert set(records[0]) == {"id", "role_name"}
+
+def test_export_rejects_unknown_format_and_columns(tmp_path):
+    with pytest.raises(ValueError):
+        export_applications(str(tmp_path / "a.csv"), fmt="xlsx")
+    with pytest.raises(ValueError):
+        export_applications(str(tmp_path / "a.csv"), columns=["id; DROP TABLE applications"])
+
+@pytest.mark.skipif(not is_parquet_available(), reason="pyarrow not installed")
+def test_parquet_export(tmp_path):
+    import pyarrow.parquet as pq
+    _seed()
+    out = tmp_path / "apps.parquet"
+    assert export_applications(str(out), batch_size=2) == 3
+    assert pq.read_table(str(out)).num_rows == 3
@@ -87,6 +87,10 @@ def test_all_gui_components_headless(mocker):
     
     exp = ExportDialog(mock_master, [{"id": 1, "company_name": "A"}])
     exp.start_export()
+    exp.on_close()
+    exp.after = MagicMock()
+    exp._post(print, "late")  # A worker finishing after the dialog was closed
+    exp.after.assert_not_called()
     
     im = InterviewManager(mock_master, 1, "Google", "Dev")
     im.save_note()